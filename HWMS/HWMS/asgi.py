@@ -5,6 +5,8 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+운영 실행: gunicorn -c gunicorn.conf.py HWMS.asgi:application (uvicorn 워커)
 """
 
 import os
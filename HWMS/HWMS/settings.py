@@ -1,5 +1,6 @@
 # HWMS/settings.py
 
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -28,6 +29,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'main.metrics.MetricsMiddleware',
 ]
 
 if DEBUG:
@@ -54,13 +56,113 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'HWMS.wsgi.application'
 
-DATABASES = {
+# 데이터베이스 (환경 변수로 선택)
+#   HWMS_DB_ENGINE=sqlite (기본값): BASE_DIR/db.sqlite3, WAL 모드라 수집 중에도 조회가 막히지 않음
+#   HWMS_DB_ENGINE=postgresql: HWMS_DB_NAME / USER / PASSWORD / HOST / PORT 로 접속
+#     HWMS_DB_POOL=1 이면 psycopg 연결 풀 사용 (psycopg[pool] 필요),
+#     아니면 HWMS_DB_CONN_MAX_AGE 초 동안 연결을 재사용
+#   로컬 확인용: docker run -d -p 5432:5432 -e POSTGRES_DB=hwms -e POSTGRES_PASSWORD=hwms postgres:16
+DB_ENGINE = os.environ.get('HWMS_DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DB_POOL = os.environ.get('HWMS_DB_POOL', '0') == '1'
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('HWMS_DB_NAME', 'hwms'),
+            'USER': os.environ.get('HWMS_DB_USER', 'postgres'),
+            'PASSWORD': os.environ.get('HWMS_DB_PASSWORD', ''),
+            'HOST': os.environ.get('HWMS_DB_HOST', 'localhost'),
+            'PORT': os.environ.get('HWMS_DB_PORT', '5432'),
+            # 연결 풀은 영구 연결(CONN_MAX_AGE)과 함께 쓸 수 없음
+            'CONN_MAX_AGE': 0 if DB_POOL else int(os.environ.get('HWMS_DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.environ.get('HWMS_DB_POOL_MIN', '2')),
+                    'max_size': int(os.environ.get('HWMS_DB_POOL_MAX', '10')),
+                    'timeout': 10,
+                },
+            } if DB_POOL else {},
+        }
+    }
+elif DB_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('HWMS_DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # 쓰기 잠금을 기다리는 최대 시간 (초)
+                'timeout': 20,
+                # 읽기 트랜잭션이 쓰기로 올라가다 잠금 오류가 나지 않도록 처음부터 쓰기 잠금을 잡음
+                'transaction_mode': 'IMMEDIATE',
+                # WAL: 수집이 쓰는 동안에도 지도 조회는 마지막 커밋 시점을 그대로 읽음
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    'PRAGMA busy_timeout=20000;'
+                    'PRAGMA temp_store=MEMORY;'
+                    'PRAGMA cache_size=-64000;'
+                    'PRAGMA mmap_size=268435456;'
+                ),
+            },
+        }
+    }
+else:
+    raise ValueError(f'지원하지 않는 HWMS_DB_ENGINE: {DB_ENGINE}')
+
+# 화재 조회 응답 캐시와 데이터 버전 카운터
+# 수집(관리 명령, 워커)과 웹 프로세스가 버전을 공유해야 하므로 파일 캐시를 기본으로 사용
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'django_cache',
+        'OPTIONS': {'MAX_ENTRIES': 1000},
     }
 }
 
+# 수집 작업 실행 방식
+#   'thread': 웹 프로세스 안의 백그라운드 스레드에서 바로 실행 (개발용 기본값)
+#   'worker': 큐에만 넣고 `python manage.py ingest_worker` 프로세스가 실행
+INGEST_JOB_RUNNER = 'thread'
+
+# FIRMS 원본 응답 디스크 캐시 (main/firms_cache.py)
+#   'on': 캐시 사용, 'replay': 캐시만 사용 (네트워크 없음), 'off': 사용 안 함
+FIRMS_CACHE_MODE = 'on'
+FIRMS_CACHE_DIR = BASE_DIR / 'firms_cache'
+FIRMS_CACHE_MAX_BYTES = 500 * 1024 * 1024
+
+# 열 지도 타일 디스크 캐시 (main/tiles.py)
+TILE_CACHE_DIR = BASE_DIR / 'tile_cache'
+TILE_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# 오래된 화재 보관 (main/archive.py, `python manage.py archive_fires`)
+# 최근 FIRE_HOT_WINDOW_DAYS 일만 DB 에 두고 그 전 날짜는 날짜별 Parquet 파일로 옮김
+FIRE_ARCHIVE_DIR = BASE_DIR / 'fire_archive'
+FIRE_HOT_WINDOW_DAYS = 90
+
+# 다른 위성이 같은 화재를 관측한 것으로 보고 하나의 이벤트로 묶는 거리와 시간 차 (main/fusion.py)
+FIRE_FUSION_DISTANCE_KM = 1.0
+FIRE_FUSION_WINDOW_MINUTES = 90
+
+# 여러 위성 통과에 걸쳐 같은 화재로 이어 추적하는 거리와 최대 관측 간격 (main/tracking.py)
+FIRE_TRACK_DISTANCE_KM = 2.0
+FIRE_TRACK_GAP_HOURS = 48
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'plain': {'format': '%(asctime)s %(levelname)s %(name)s %(message)s'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'plain'},
+    },
+    'loggers': {
+        'main': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 LANGUAGE_CODE = 'ko-kr'
 TIME_ZONE = 'Asia/Seoul'
 USE_I18N = True
@@ -0,0 +1,26 @@
+# gunicorn.conf.py
+# ASGI 배포 설정: gunicorn -c gunicorn.conf.py HWMS.asgi:application
+# (requirements.txt 의 gunicorn, uvicorn, uvicorn-worker 필요. 개발 중에는 uvicorn HWMS.asgi:application --reload 로도 실행 가능)
+#
+# 조회 API 와 수집 작업 등록/상태 API 는 비동기 뷰라서 워커 하나가 DB 를 기다리는 동안
+# 다른 지도 요청을 계속 처리합니다. 수집 자체는 워커 안의 백그라운드 스레드
+# (INGEST_JOB_RUNNER='thread') 나 별도 ingest_worker 프로세스에서 실행됩니다.
+import multiprocessing
+import os
+
+bind = os.environ.get('HWMS_BIND', '0.0.0.0:8000')
+# uvicorn 0.30 부터 uvicorn.workers 는 폐기 예정이라 별도 패키지(uvicorn-worker)의 워커를 사용
+worker_class = 'uvicorn_worker.UvicornWorker'
+workers = int(os.environ.get('HWMS_WORKERS', min(4, multiprocessing.cpu_count())))
+
+# 스트리밍 응답(stream=1, ndjson)이 길어질 수 있으므로 넉넉하게
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
+
+# 메모리 누수에 대비해 일정 요청마다 워커 교체 (동시에 교체되지 않도록 흔들기)
+max_requests = 2000
+max_requests_jitter = 200
+
+accesslog = '-'
+errorlog = '-'
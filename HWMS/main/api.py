@@ -1,188 +1,384 @@
 # main/api.py
+import logging
+
 import pandas as pd
-import requests
 from datetime import datetime, timedelta
+from io import StringIO
 from .models import FireDetection
+from . import metrics
+from .caching import bump_data_version
+from .regions import assign_regions
+from .stats import refresh_daily_stats
+from .fusion import refresh_fused_events
+from .tracking import track_new_detections
+from .bulkload import copy_supported, copy_upsert
+from .archive import restore_days
+from .firms import (
+    MAP_KEY, SOUTH_KOREA_BBOX, FIRMS_SOURCES,
+    split_windows, fetch_windows,
+)
+
+logger = logging.getLogger(__name__)
+
+# MODIS CSV는 컬럼 이름과 신뢰도 표기가 VIIRS와 다름
+MODIS_COLUMNS = {'brightness': 'bright_ti4', 'bright_t31': 'bright_ti5'}
+
+FLOAT_COLUMNS = ['latitude', 'longitude', 'bright_ti4', 'scan', 'track', 'bright_ti5', 'frp']
+STRING_COLUMNS = ['acq_time', 'satellite', 'instrument', 'confidence', 'version', 'daynight']
+# FireDetection 필드 선언 순서 (id 제외) - 위치 인자로 인스턴스를 만들 때 사용
+FIRE_COLUMNS = [
+    'latitude', 'longitude', 'bright_ti4', 'scan', 'track', 'acq_date', 'acq_time',
+    'satellite', 'instrument', 'confidence', 'version', 'bright_ti5', 'frp', 'daynight',
+]
+
+# read_csv 단계에서 바로 원하는 타입으로 읽음 (MODIS 원래 컬럼 이름 포함)
+CSV_DTYPES = {
+    **{column: str for column in STRING_COLUMNS},
+    **{column: 'float64' for column in FLOAT_COLUMNS + list(MODIS_COLUMNS)},
+}
+
+
+def read_firms_csv(content):
+    """FIRMS CSV 문자열을 DataFrame 으로 읽음 (숫자 컬럼에 잘못된 값이 있으면 문자열로)"""
+    try:
+        return pd.read_csv(
+            StringIO(content),
+            dtype=CSV_DTYPES,
+            parse_dates=['acq_date'],
+            date_format='%Y-%m-%d',
+        )
+    except ValueError:
+        # 숫자 컬럼에 잘못된 값이 섞여 있으면 문자열로 읽고 clean_firms_frame 에서 걸러냄
+        return pd.read_csv(StringIO(content), dtype=str)
+
+
+def parse_firms_csv(content, start, end, bbox=None):
+    """
+    FIRMS CSV 응답을 컬럼 단위로 한 번에 정리
+
+    타입 변환, 날짜 범위 필터링, acq_time 0 채우기, MODIS 신뢰도 변환을 모두
+    벡터 연산으로 처리하고, 변환할 수 없는 행은 예외 대신 reject 프레임으로 모읍니다.
+
+    Args:
+        content: CSV 문자열
+        start: 시작 날짜 (date)
+        end: 종료 날짜 (date)
+        bbox: 이 범위 (min_lon, min_lat, max_lon, max_lat) 안의 관측만 남김 (None 이면 전체)
+
+    Returns:
+        tuple: (저장할 DataFrame, reason 컬럼이 붙은 reject DataFrame)
+    """
+    return clean_firms_frame(read_firms_csv(content), start, end, bbox)
+
+
+def clean_firms_frame(df, start, end, bbox=None):
+    """read_firms_csv 로 읽은 DataFrame 을 parse_firms_csv 와 같은 규칙으로 정리"""
+    df = df.rename(columns=MODIS_COLUMNS)
+
+    missing = [column for column in FIRE_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"CSV 컬럼 누락: {', '.join(missing)}")
+
+    for column in FLOAT_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors='coerce').astype('float64')
+    df['acq_date'] = pd.to_datetime(df['acq_date'], format='%Y-%m-%d', errors='coerce')
+
+    acq_time = df['acq_time'].str.strip()
+    df['acq_time'] = acq_time.str.zfill(4)
+
+    # MODIS 신뢰도(0~100)를 VIIRS 표기(l/n/h)로 변환
+    numeric_confidence = pd.to_numeric(df['confidence'], errors='coerce')
+    is_numeric = numeric_confidence.notna()
+    if is_numeric.any():
+        df.loc[is_numeric, 'confidence'] = pd.cut(
+            numeric_confidence[is_numeric],
+            bins=[-float('inf'), 30, 80, float('inf')],
+            labels=['l', 'n', 'h'],
+            right=False,
+        ).astype(str)
+
+    reasons = pd.Series(None, index=df.index, dtype=object)
+    reasons[df['confidence'].isna()] = 'confidence'
+    reasons[~acq_time.str.fullmatch(r'\d{1,4}', na=False)] = 'acq_time'
+    reasons[df['acq_date'].isna()] = 'acq_date'
+    reasons[~df['latitude'].between(-90, 90) | ~df['longitude'].between(-180, 180)] = 'coordinates'
+    reasons[df[FLOAT_COLUMNS].isna().any(axis=1)] = 'numeric'
+
+    invalid = reasons.notna()
+    rejects = df[invalid].assign(reason=reasons[invalid])
+
+    # 요청한 날짜 범위 내의 데이터만 필터링
+    df = df[~invalid]
+    df = df[df['acq_date'].between(pd.Timestamp(start), pd.Timestamp(end))]
+    if bbox is not None:
+        min_lon, min_lat, max_lon, max_lat = bbox
+        df = df[df['latitude'].between(min_lat, max_lat) & df['longitude'].between(min_lon, max_lon)]
+
+    df = df[FIRE_COLUMNS].copy()
+    df['acq_date'] = df['acq_date'].dt.date
+    for column in STRING_COLUMNS:
+        df[column] = df[column].astype(str)
+
+    return df, rejects
+
+
+# FireDetection 필드 선언 순서 (id 제외) - CSV 컬럼 뒤에 구역 id
+MODEL_COLUMNS = FIRE_COLUMNS + ['region_id']
+
+
+def _nullable_regions(df):
+    """region_id 0 (구역 없음) 을 None 으로 바꾼 DataFrame"""
+    return df.assign(region_id=df['region_id'].astype(object).where(df['region_id'] > 0, None))
+
+
+def to_fire_objects(df):
+    """parse_firms_csv 결과를 FireDetection 인스턴스 목록으로 변환 (region_id 0 은 구역 없음)"""
+    if 'region_id' in df:
+        df = _nullable_regions(df)
+        columns = MODEL_COLUMNS
+    else:
+        columns = FIRE_COLUMNS
+
+    # 키워드 인자보다 위치 인자 생성이 두 배 가까이 빠름
+    return [
+        FireDetection(None, *row)
+        for row in df[columns].itertuples(index=False, name=None)
+    ]
+
+
+# 자연 키와 갱신 대상 컬럼
+NATURAL_KEY = ['latitude', 'longitude', 'acq_date', 'acq_time', 'satellite']
+VALUE_COLUMNS = [column for column in MODEL_COLUMNS if column not in NATURAL_KEY]
+
+
+def _write_changed_rows(df):
+    """
+    기존 행과 값을 비교해 새 행과 바뀐 행만 bulk_create(update_conflicts=True) 로 씀
+
+    Returns:
+        tuple: (inserted / updated / unchanged 개수 dict, 쓴 행의 날짜 목록)
+    """
+    existing = pd.DataFrame.from_records(
+        FireDetection.objects.filter(
+            acq_date__gte=df['acq_date'].min(),
+            acq_date__lte=df['acq_date'].max(),
+            satellite__in=df['satellite'].unique().tolist(),
+        ).values_list(*MODEL_COLUMNS),
+        columns=MODEL_COLUMNS,
+    )
+    existing['region_id'] = existing['region_id'].astype('float64').fillna(0).astype('int64')
+
+    merged = df.merge(
+        existing, on=NATURAL_KEY, how='left',
+        suffixes=('', '_db'), indicator=True,
+    )
+    is_new = (merged['_merge'] == 'left_only').to_numpy()
+    is_changed = ~is_new & (
+        merged[VALUE_COLUMNS].to_numpy() != merged[[f'{c}_db' for c in VALUE_COLUMNS]].to_numpy()
+    ).any(axis=1)
+
+    to_write = df[is_new | is_changed]
+    if not to_write.empty:
+        FireDetection.objects.bulk_create(
+            to_fire_objects(to_write),
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=NATURAL_KEY,
+            update_fields=VALUE_COLUMNS,
+        )
+
+    counts = {
+        'inserted': int(is_new.sum()),
+        'updated': int(is_changed.sum()),
+        'unchanged': int(len(df) - is_new.sum() - is_changed.sum()),
+    }
+    return counts, to_write['acq_date'].unique()
+
 
-MAP_KEY = '5872ff30914a691ad9aa8eaf6e5410a7'
-# BBOX 형식: min_lon,min_lat,max_lon,max_lat
-# 한국: 경도 124~130°E, 위도 33~38.5°N
-SOUTH_KOREA_BBOX = '124,33,130,38.5'
+def _copy_changed_rows(df):
+    """
+    PostgreSQL: COPY 로 임시 테이블에 올린 뒤 한 번에 병합 (값 비교도 DB 에서 처리)
+
+    Returns:
+        tuple: (inserted / updated / unchanged 개수 dict, 쓴 행의 날짜 목록)
+    """
+    written = copy_upsert(
+        FireDetection, _nullable_regions(df), NATURAL_KEY, VALUE_COLUMNS, returning=['acq_date'],
+    )
+    inserted = sum(1 for is_new, _ in written if is_new)
+    counts = {
+        'inserted': inserted,
+        'updated': len(written) - inserted,
+        'unchanged': len(df) - len(written),
+    }
+    return counts, sorted({acq_date for _, acq_date in written})
+
+
+def write_fire_detections(df):
+    """
+    parse_firms_csv 결과를 자연 키 기준으로 DB에 씀 (집계와 이벤트는 갱신하지 않음)
+
+    이미 같은 값으로 저장된 행은 건너뛰고 새 행과 값이 바뀐 행만 씁니다.
+    PostgreSQL(psycopg 3) 에서는 COPY 스트림과 INSERT ... ON CONFLICT 한 번으로,
+    그 밖의 DB 에서는 bulk_create(update_conflicts=True) 로 씁니다. 각 행에는 좌표로
+    찾은 행정구역 id 를 붙입니다. 아카이브로 옮긴 날짜의 행이 들어오면 그 날짜를
+    먼저 DB 로 되돌립니다.
+
+    Returns:
+        tuple: (inserted / updated / unchanged 개수 dict, 쓴 행의 날짜 목록)
+    """
+    df = df.drop_duplicates(subset=NATURAL_KEY, keep='last')
+    # 아카이브로 옮긴 날짜를 다시 수집하면 먼저 DB 로 되돌려 같은 기준으로 비교
+    restore_days(df['acq_date'].unique())
+    df = df.assign(region_id=assign_regions(df['longitude'].to_numpy(), df['latitude'].to_numpy()))
+
+    if copy_supported():
+        return _copy_changed_rows(df)
+    return _write_changed_rows(df)
 
-def save_fire_data_by_date_range(start_date, end_date, satellite='VIIRS_NOAA20_NRT'):
+
+def refresh_derived_data(dates, days_per_batch=30):
+    """
+    관측을 쓴 날짜의 일별 집계(fire_daily_stat)와 위성 간 중복을 묶은 이벤트(fused_detection)를
+    다시 계산하고, 새 관측을 여러 통과에 걸쳐 이어지는 화재(fire_event)에 연결
+
+    창마다 부르면 같은 날짜를 여러 번 다시 계산하므로 수집 한 번에 쓴 날짜를 모아 끝에 한 번 부릅니다.
+    """
+    dates = sorted(set(dates))
+    with metrics.timer('ingest_refresh_seconds'):
+        for i in range(0, len(dates), days_per_batch):
+            refresh_daily_stats(dates[i:i + days_per_batch])
+            refresh_fused_events(dates[i:i + days_per_batch])
+        track_new_detections()
+    bump_data_version()
+
+
+def upsert_fire_detections(df):
+    """
+    parse_firms_csv 결과를 DB에 반영하고 (write_fire_detections) 쓴 행이 있는 날짜의
+    집계, 이벤트, 화재 추적을 갱신 (refresh_derived_data)
+
+    Args:
+        df: FIRE_COLUMNS 컬럼을 가진 DataFrame
+
+    Returns:
+        dict: inserted / updated / unchanged 개수
+    """
+    counts, dates = write_fire_detections(df)
+    if len(dates):
+        refresh_derived_data(dates)
+    return counts
+
+
+def _ingest_response(result, start, end, stats, dates):
+    """
+    창 하나의 FIRMS 응답을 파싱해 저장하고 stats 에 개수를 더함
+
+    집계, 이벤트, 화재 추적은 갱신하지 않고 쓴 날짜를 dates 에 모으므로, 호출한 쪽에서
+    모든 창을 처리한 뒤 refresh_derived_data(dates) 를 한 번 불러야 합니다.
+
+    Returns:
+        DataFrame: 저장한 화재 행 (실패했거나 데이터가 없으면 None)
+    """
+    window = result.window
+    window_end = window.start + timedelta(days=window.days - 1)
+    label = f"source={window.source} window={window.start}~{window_end}"
+
+    if result.error is not None:
+        stats['failed'] += 1
+        metrics.inc('ingest_windows_total', result='fetch_failed')
+        logger.warning("FIRMS 요청 실패 %s error=%s", label, result.error)
+        return None
+
+    try:
+        with metrics.timer('ingest_parse_seconds', source=window.source):
+            fires, rejects = parse_firms_csv(result.text, start, end)
+    except pd.errors.EmptyDataError:
+        metrics.inc('ingest_windows_total', result='empty')
+        logger.info("빈 CSV %s", label)
+        return None
+    except Exception:
+        stats['failed'] += 1
+        metrics.inc('ingest_windows_total', result='parse_failed')
+        logger.exception("CSV 처리 실패 %s", label)
+        return None
+
+    if len(rejects):
+        stats['rejected'] += len(rejects)
+        metrics.inc('ingest_rows_total', len(rejects), result='rejected')
+        logger.warning("잘못된 행 제외 %s rejected=%d reasons=%s",
+                       label, len(rejects), rejects['reason'].value_counts().to_dict())
+
+    if fires.empty:
+        metrics.inc('ingest_windows_total', result='empty')
+        logger.info("데이터 없음 %s", label)
+        return None
+
+    with metrics.timer('ingest_db_write_seconds', source=window.source):
+        counts, written = write_fire_detections(fires)
+    dates.update(written)
+    for key, value in counts.items():
+        stats[key] += value
+        metrics.inc('ingest_rows_total', value, result=key)
+    metrics.inc('ingest_windows_total', result='ok')
+    logger.info("창 저장 완료 %s inserted=%d updated=%d unchanged=%d",
+                label, counts['inserted'], counts['updated'], counts['unchanged'])
+    return fires
+
+
+def save_fire_data_by_date_range(start_date, end_date, satellite='VIIRS_NOAA20_NRT', progress=None):
     """
     특정 날짜 범위의 FIRMS 데이터를 가져와 DB에 저장
-    
+
+    10일 단위 창과 여러 위성 소스를 동시에 내려받고, 먼저 도착한 응답부터
+    파싱해 저장하므로 다운로드와 DB 쓰기가 겹쳐서 진행됩니다. 기존 데이터는
+    지우지 않고 자연 키 기준으로 새 행과 바뀐 행만 씁니다. 집계, 이벤트, 화재 추적은
+    모든 창을 저장한 뒤 쓴 날짜 전체에 대해 한 번 갱신합니다.
+
     Args:
         start_date: 시작 날짜 (YYYY-MM-DD 문자열)
         end_date: 종료 날짜 (YYYY-MM-DD 문자열)
-        satellite: 위성 종류 (VIIRS_NOAA20_NRT, VIIRS_SNPP_NRT, MODIS_NRT)
-    
+        satellite: 위성 종류 또는 그 목록 (VIIRS_NOAA20_NRT, VIIRS_SNPP_NRT, MODIS_NRT)
+        progress: 창 하나를 처리할 때마다 (완료 수, 전체 수) 로 호출할 함수
+
     Returns:
-        int: 저장된 데이터 개수
+        dict: inserted / updated / unchanged / rejected 행 수와 실패한 창 수(failed),
+              처리 중 예외가 나면 error 메시지
     """
+    stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'rejected': 0, 'failed': 0}
+
     try:
         start = datetime.strptime(start_date, '%Y-%m-%d').date()
         end = datetime.strptime(end_date, '%Y-%m-%d').date()
-        days_diff = (end - start).days + 1
-        
-        print(f"\n{'='*60}")
-        print(f"📡 FIRMS API 데이터 수집 시작")
-        print(f"📅 기간: {start_date} ~ {end_date} ({days_diff}일)")
-        print(f"🛰️ 위성: {satellite}")
-        print(f"🔑 API 키: {MAP_KEY}")
-        print(f"📍 영역: {SOUTH_KOREA_BBOX}")
-        print(f"{'='*60}\n")
-        
-        all_fires = []
-        
-        # FIRMS API는 최대 10일씩만 조회 가능
-        current_date = start
-        batch_count = 0
-        
-        while current_date <= end:
-            batch_count += 1
-            # 현재 날짜부터 10일 또는 종료일까지
-            batch_end = min(current_date + timedelta(days=9), end)
-            batch_days = (batch_end - current_date).days + 1
-            
-            print(f"🔄 배치 {batch_count}: {current_date} ~ {batch_end} ({batch_days}일)")
-            
-            # Area API URL 구성
-            # FIRMS API 형식: /api/area/csv/{MAP_KEY}/{source}/{area}/{dayRange}/{date}
-            area_url = f'https://firms.modaps.eosdis.nasa.gov/api/area/csv/{MAP_KEY}/{satellite}/{SOUTH_KOREA_BBOX}/{batch_days}/{current_date.strftime("%Y-%m-%d")}'
-            
-            print(f"   📡 API URL: {area_url}")
-            
-            try:
-                # HTTP 요청으로 직접 확인
-                response = requests.get(area_url, timeout=30)
-                print(f"   📊 HTTP 상태: {response.status_code}")
-                
-                if response.status_code != 200:
-                    print(f"   ❌ API 오류: {response.status_code}")
-                    print(f"   📄 응답 내용: {response.text[:500]}")
-                    current_date = batch_end + timedelta(days=1)
-                    continue
-                
-                # 응답 내용 확인
-                content = response.text
-                print(f"   📄 응답 길이: {len(content)} 바이트")
-                print(f"   📄 첫 200자: {content[:200]}")
-                
-                # CSV로 파싱
-                from io import StringIO
-                df_batch = pd.read_csv(StringIO(content))
-                
-                print(f"   📊 컬럼: {list(df_batch.columns)}")
-                print(f"   📊 데이터 행 수: {len(df_batch)}")
-                
-                if not df_batch.empty:
-                    print(f"   ✅ {len(df_batch)}개 데이터 수신")
-                    print(f"   📊 샘플 데이터:")
-                    print(df_batch.head(2))
-                    
-                    for idx, row in df_batch.iterrows():
-                        try:
-                            # 날짜 변환
-                            if isinstance(row['acq_date'], str):
-                                acq_date = datetime.strptime(row['acq_date'], '%Y-%m-%d').date()
-                            else:
-                                acq_date = row['acq_date']
-                            
-                            # 요청한 날짜 범위 내의 데이터만 필터링
-                            if start <= acq_date <= end:
-                                fire_data = {
-                                    'latitude': float(row['latitude']),
-                                    'longitude': float(row['longitude']),
-                                    'bright_ti4': float(row['bright_ti4']),
-                                    'scan': float(row['scan']),
-                                    'track': float(row['track']),
-                                    'acq_date': acq_date,
-                                    'acq_time': str(row['acq_time']).zfill(4),
-                                    'satellite': str(row['satellite']),
-                                    'instrument': str(row['instrument']),
-                                    'confidence': str(row['confidence']),
-                                    'version': str(row['version']),
-                                    'bright_ti5': float(row['bright_ti5']),
-                                    'frp': float(row['frp']),
-                                    'daynight': str(row['daynight'])
-                                }
-                                all_fires.append(fire_data)
-                        except Exception as e:
-                            print(f"   ⚠️  행 {idx} 처리 중 오류: {e}")
-                            print(f"   데이터: {row}")
-                            continue
-                else:
-                    print(f"   ⚠️  데이터 없음")
-                    
-            except requests.exceptions.RequestException as e:
-                print(f"   ❌ HTTP 요청 실패: {e}")
-            except pd.errors.EmptyDataError:
-                print(f"   ⚠️  빈 CSV 데이터")
-            except Exception as e:
-                print(f"   ❌ 배치 처리 실패: {e}")
-                import traceback
-                traceback.print_exc()
-            
-            # 다음 배치로 이동
-            current_date = batch_end + timedelta(days=1)
-        
-        if not all_fires:
-            print(f"\n⚠️  해당 기간에 수집된 화재 데이터가 없습니다.")
-            print(f"   - API 응답이 비어있거나")
-            print(f"   - 해당 날짜에 실제로 화재가 없었을 수 있습니다.\n")
-            return 0
-        
-        print(f"\n{'='*60}")
-        print(f"💾 데이터베이스 저장 시작 (총 {len(all_fires)}개)")
-        print(f"{'='*60}\n")
-        
-        # 해당 기간의 기존 데이터 삭제
-        deleted_count = FireDetection.objects.filter(
-            acq_date__gte=start_date,
-            acq_date__lte=end_date
-        ).delete()[0]
-        
-        if deleted_count > 0:
-            print(f"🗑️  기존 데이터 {deleted_count}개 삭제")
-        
-        # 새 데이터 저장
-        fire_objects = []
-        for fire_data in all_fires:
-            fire_objects.append(FireDetection(**fire_data))
-        
-        print(f"💾 {len(fire_objects)}개 객체 생성 완료")
-        
-        # Bulk Create (배치 저장)
-        created_objects = FireDetection.objects.bulk_create(
-            fire_objects, 
-            batch_size=1000
-        )
-        
-        print(f"✅ {len(created_objects)}개 데이터 저장 완료!\n")
-        
-        # 저장된 데이터 확인
-        saved_count = FireDetection.objects.filter(
-            acq_date__gte=start_date,
-            acq_date__lte=end_date
-        ).count()
-        
-        print(f"{'='*60}")
-        print(f"📊 최종 결과")
-        print(f"{'='*60}")
-        print(f"   총 수집: {len(all_fires)}개")
-        print(f"   DB 저장: {saved_count}개")
-        print(f"   기간: {start_date} ~ {end_date}")
-        print(f"{'='*60}\n")
-        
-        return saved_count
-        
+        sources = [satellite] if isinstance(satellite, str) else list(satellite)
+
+        unknown = [s for s in sources if s not in FIRMS_SOURCES]
+        if unknown:
+            raise ValueError(f"지원하지 않는 위성: {', '.join(unknown)}")
+
+        windows = split_windows(start, end, sources)
+        logger.info("FIRMS 수집 시작 range=%s~%s sources=%s area=%s windows=%d",
+                    start_date, end_date, ','.join(sources), SOUTH_KOREA_BBOX, len(windows))
+
+        dates = set()
+        try:
+            for done, result in enumerate(fetch_windows(windows), start=1):
+                _ingest_response(result, start, end, stats, dates)
+                if progress:
+                    progress(done, len(windows))
+        finally:
+            # 중간에 멈춰도 이미 쓴 날짜는 갱신
+            if dates:
+                refresh_derived_data(dates)
+
+        logger.info("FIRMS 수집 완료 range=%s~%s %s", start_date, end_date,
+                    ' '.join(f'{key}={value}' for key, value in stats.items()))
+        return stats
+
     except Exception as e:
-        print(f"\n❌ 오류 발생: {e}\n")
-        import traceback
-        traceback.print_exc()
-        return 0
+        logger.exception("FIRMS 수집 실패 range=%s~%s", start_date, end_date)
+        stats['error'] = str(e)
+        return stats
 
 def save_fire_data(days=10, satellite='VIIRS_NOAA20_NRT'):
     """
@@ -190,7 +386,7 @@ def save_fire_data(days=10, satellite='VIIRS_NOAA20_NRT'):
     """
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days-1)
-    
+
     return save_fire_data_by_date_range(
         start_date.strftime('%Y-%m-%d'),
         end_date.strftime('%Y-%m-%d'),
@@ -199,4 +395,4 @@ def save_fire_data(days=10, satellite='VIIRS_NOAA20_NRT'):
 
 if __name__ == '__main__':
     # 테스트: 최근 7일 데이터 저장
-    save_fire_data(days=7, satellite='VIIRS_NOAA20_NRT')
\ No newline at end of file
+    save_fire_data(days=7, satellite='VIIRS_NOAA20_NRT')
@@ -0,0 +1,321 @@
+# main/archive.py
+import functools
+import operator
+import os
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import bump_data_version
+from .fusion import refresh_fused_events
+from .models import FireDetection, FireEvent, FusedDetection
+from .queries import CONFIDENCE_LEVELS, FIRE_FIELDS, _parse_date, parse_bbox
+from .regions import region_ids_for
+
+# fire_detection 에 남겨 두는 최근 일 수 (그보다 오래된 날짜는 Parquet 으로 옮김)
+HOT_WINDOW_DAYS = 90
+# 데이터셋 디렉터리 이름: 모델
+ARCHIVE_MODELS = {'detections': FireDetection, 'events': FusedDetection}
+# Django 필드 종류별 Parquet 컬럼 타입
+ARROW_TYPES = {
+    'BigAutoField': 'int64',
+    'ForeignKey': 'int64',
+    'IntegerField': 'int64',
+    'FloatField': 'float64',
+    'DateField': 'date32',
+    'CharField': 'string',
+}
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError('아카이브를 사용하려면 pyarrow가 필요합니다.')
+    return pa, ds, pq
+
+
+def archive_dir():
+    return Path(getattr(settings, 'FIRE_ARCHIVE_DIR', Path(settings.BASE_DIR) / 'fire_archive'))
+
+
+def hot_window_days():
+    return getattr(settings, 'FIRE_HOT_WINDOW_DAYS', HOT_WINDOW_DAYS)
+
+
+def _fields(model):
+    # 관측의 이벤트 연결(fused)은 복원할 때 다시 묶으므로 보관하지 않음
+    # (화재 추적 연결 event 는 fire_event 가 DB 에 계속 남으므로 보관)
+    return [field for field in model._meta.concrete_fields if field.name != 'fused']
+
+
+def _columns(model):
+    return [field.attname for field in _fields(model)]
+
+
+def _schema(model):
+    pa = _pyarrow()[0]
+    return pa.schema([
+        (field.attname, pa.type_for_alias(ARROW_TYPES[field.get_internal_type()]))
+        for field in _fields(model)
+    ])
+
+
+def _day_path(dataset, day):
+    """archive_dir/데이터셋/acq_month=YYYY-MM/YYYY-MM-DD.parquet (월 디렉터리는 hive 파티션)"""
+    return archive_dir() / dataset / f'acq_month={day:%Y-%m}' / f'{day}.parquet'
+
+
+# 이보다 최근에 바뀐 월 디렉터리가 있으면 캐시하지 않음 (같은 시각 틱 안의 변경을 놓치지 않도록)
+ARCHIVED_DATES_SETTLE_NS = 1_000_000_000
+# 데이터셋 디렉터리: (월 디렉터리 서명, 날짜 목록)
+_archived_dates_cache = {}
+_archived_dates_lock = threading.Lock()
+
+
+def _partition_signature(base):
+    """월 디렉터리 이름과 수정 시각 (파일을 넣거나 지우면 그 디렉터리의 수정 시각이 바뀜)"""
+    try:
+        with os.scandir(base) as entries:
+            return tuple(sorted(
+                (entry.name, entry.stat().st_mtime_ns)
+                for entry in entries
+                if entry.name.startswith('acq_month=') and entry.is_dir()
+            ))
+    except FileNotFoundError:
+        return ()
+
+
+def _invalidate_archived_dates():
+    with _archived_dates_lock:
+        _archived_dates_cache.clear()
+
+
+def archived_dates(dataset='detections'):
+    """
+    아카이브에 있는 날짜 목록 (파일 이름으로 판단하므로 파일을 열지 않음)
+
+    조회와 수집마다 불리므로 결과를 캐시하고, 월 디렉터리의 수정 시각만 확인해
+    다른 프로세스(수집 워커)가 파일을 옮긴 경우에도 다시 읽습니다.
+    """
+    base = archive_dir() / dataset
+    signature = _partition_signature(base)
+    with _archived_dates_lock:
+        cached = _archived_dates_cache.get(base)
+    if cached and cached[0] == signature:
+        return list(cached[1])
+
+    dates = sorted(
+        date.fromisoformat(path.stem)
+        for month, _ in signature
+        for path in (base / month).glob('*.parquet')
+    )
+    settled = time.time_ns() - ARCHIVED_DATES_SETTLE_NS
+    if all(mtime < settled for _, mtime in signature):
+        with _archived_dates_lock:
+            _archived_dates_cache[base] = (signature, dates)
+    return list(dates)
+
+
+def _write_day(dataset, day, frame):
+    """하루치 행을 Parquet 파일로 저장 (이미 파일이 있으면 id 기준으로 합침)"""
+    import pandas as pd
+
+    pa, _, pq = _pyarrow()
+    model = ARCHIVE_MODELS[dataset]
+    path = _day_path(dataset, day)
+
+    if path.exists():
+        # 저장 뒤 DB 에서 지우기 전에 중단된 경우 - 같은 id 는 DB 값을 우선
+        old = pd.DataFrame(pq.read_table(path).to_pylist(), columns=_columns(model))
+        frame = pd.concat([old, frame]).drop_duplicates('id', keep='last')
+
+    # 위도 순으로 정렬해 두면 row group 통계로 bbox 조건을 거를 수 있음
+    frame = frame.sort_values(['latitude', 'longitude'])
+    table = pa.Table.from_pandas(frame[_columns(model)], schema=_schema(model), preserve_index=False)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+    pq.write_table(table, tmp_path, compression='zstd')
+    os.replace(tmp_path, path)
+    _invalidate_archived_dates()
+
+
+def archive_day(day):
+    """
+    하루치 관측과 이벤트를 Parquet 으로 옮기고 DB 에서 삭제
+
+    파일을 먼저 쓰고 지우므로 중간에 중단돼도 행이 사라지지 않습니다.
+    일별 집계(fire_daily_stat)는 크기가 작아 그대로 DB 에 남깁니다.
+
+    Returns:
+        int: 옮긴 관측 수
+    """
+    # 보관은 명령이나 수집 쪽에서만 실행하므로 조회 경로가 pandas 를 읽지 않도록 여기서 가져옴
+    import pandas as pd
+
+    frames = {
+        dataset: pd.DataFrame.from_records(
+            list(model.objects.filter(acq_date=day).values_list(*_columns(model))),
+            columns=_columns(model),
+        )
+        for dataset, model in ARCHIVE_MODELS.items()
+    }
+    for dataset, frame in frames.items():
+        if not frame.empty:
+            _write_day(dataset, day, frame)
+
+    with transaction.atomic():
+        FireDetection.objects.filter(acq_date=day).delete()
+        FusedDetection.objects.filter(acq_date=day).delete()
+    return len(frames['detections'])
+
+
+def archive_old_detections(hot_days=None, today=None):
+    """
+    핫 윈도보다 오래된 날짜를 모두 아카이브로 옮김
+
+    Args:
+        hot_days: DB 에 남길 최근 일 수 (기본값은 설정 FIRE_HOT_WINDOW_DAYS)
+        today: 기준 날짜 (기본값은 오늘)
+
+    Returns:
+        tuple: (옮긴 날짜 수, 옮긴 관측 수)
+    """
+    hot_days = hot_window_days() if hot_days is None else hot_days
+    cutoff = (today or timezone.now().date()) - timedelta(days=hot_days)
+    days = sorted(
+        FireDetection.objects.filter(acq_date__lt=cutoff)
+        .order_by().values_list('acq_date', flat=True).distinct()
+    )
+
+    rows = sum(archive_day(day) for day in days)
+    if days:
+        bump_data_version()
+    return len(days), rows
+
+
+def _resolve_events(rows):
+    """
+    보관한 뒤 합쳐진 화재는 합친 화재로, 다시 추적하면서 지워진 화재는 None 으로 바꿈
+
+    None 이 된 관측은 다음 track_new_detections 때 다시 추적됩니다.
+    """
+    event_ids = {row['event_id'] for row in rows if row.get('event_id') is not None}
+    events = dict(FireEvent.objects.filter(id__in=event_ids).values_list('id', 'merged_into_id'))
+    for row in rows:
+        event_id = row.get('event_id')
+        if event_id is not None:
+            row['event_id'] = (events[event_id] or event_id) if event_id in events else None
+
+
+def restore_days(dates):
+    """
+    아카이브에 있는 날짜를 DB 로 되돌림 (오래된 날짜를 다시 수집하기 전에 호출)
+
+    되돌린 날짜는 이벤트를 다시 묶고, 다음 archive_old_detections 때 다시 옮겨집니다.
+
+    Returns:
+        list: 되돌린 날짜
+    """
+    dates = sorted(set(dates) & set(archived_dates()))
+    if not dates:
+        return []
+    pq = _pyarrow()[2]
+
+    with transaction.atomic():
+        for day in dates:
+            rows = pq.read_table(_day_path('detections', day)).to_pylist()
+            _resolve_events(rows)
+            FireDetection.objects.bulk_create(
+                [FireDetection(**row) for row in rows], batch_size=1000, ignore_conflicts=True,
+            )
+        refresh_fused_events(dates)
+
+    # DB 에 들어간 뒤에 파일을 지움 (중간에 멈추면 다음 보관 때 id 기준으로 합쳐짐)
+    for day in dates:
+        for dataset in ARCHIVE_MODELS:
+            _day_path(dataset, day).unlink(missing_ok=True)
+    _invalidate_archived_dates()
+    bump_data_version()
+    return dates
+
+
+def overlaps(params):
+    """요청 기간(start_date ~ end_date, 없으면 전체)에 아카이브된 날짜가 있는지"""
+    dates = archived_dates()
+    if not dates:
+        return False
+    start = _parse_date(params['start_date'], 'start_date') if params.get('start_date') else date.min
+    end = _parse_date(params['end_date'], 'end_date') if params.get('end_date') else date.max
+    return any(start <= day <= end for day in dates)
+
+
+def query_archive(params, fused=False, columns=FIRE_FIELDS):
+    """
+    filter_fires 와 같은 파라미터로 아카이브를 조회
+
+    조건은 pyarrow dataset 필터로 넘겨, 월 파티션 디렉터리와 파일의 row group 통계로
+    읽을 필요가 없는 부분을 건너뜁니다 (predicate pushdown).
+
+    Args:
+        params: filter_fires 와 같은 요청 파라미터 (이미 검증된 값)
+        fused: True 면 이벤트, False 면 원본 관측
+        columns: 돌려받을 컬럼
+
+    Returns:
+        list: columns 순서의 튜플 목록 (정렬되지 않음)
+    """
+    _, ds, _ = _pyarrow()
+    base = archive_dir() / ('events' if fused else 'detections')
+    if not base.exists():
+        return []
+
+    field = ds.field
+    filters = []
+    if params.get('start_date'):
+        start = _parse_date(params['start_date'], 'start_date')
+        filters += [field('acq_month') >= f'{start:%Y-%m}', field('acq_date') >= start]
+    if params.get('end_date'):
+        end = _parse_date(params['end_date'], 'end_date')
+        filters += [field('acq_month') <= f'{end:%Y-%m}', field('acq_date') <= end]
+    if params.get('bbox'):
+        min_lon, min_lat, max_lon, max_lat = parse_bbox(params['bbox'])
+        filters += [
+            (field('latitude') >= min_lat) & (field('latitude') <= max_lat),
+            (field('longitude') >= min_lon) & (field('longitude') <= max_lon),
+        ]
+    if params.get('min_confidence'):
+        levels = CONFIDENCE_LEVELS[CONFIDENCE_LEVELS.index(params['min_confidence']):]
+        filters.append(field('confidence').isin(levels))
+    if params.get('min_frp'):
+        filters.append(field('frp') >= float(params['min_frp']))
+    if params.get('region'):
+        region_ids = region_ids_for([r for r in params['region'].split(',') if r])
+        filters.append(field('region_id').isin(region_ids))
+
+    satellites = {s for s in (params.get('satellite') or '').split(',') if s}
+    read_columns = list(columns)
+    if satellites and not fused:
+        filters.append(field('satellite').isin(sorted(satellites)))
+    elif satellites and 'satellite' not in read_columns:
+        read_columns.append('satellite')
+
+    dataset = ds.dataset(base, format='parquet', partitioning='hive')
+    table = dataset.to_table(
+        columns=read_columns,
+        filter=functools.reduce(operator.and_, filters) if filters else None,
+    )
+    rows = table.to_pylist()
+
+    if satellites and fused:
+        # 이벤트의 satellite 는 쉼표로 이은 목록이라 파이썬에서 구성 위성을 비교
+        rows = [row for row in rows if satellites & set(row['satellite'].split(','))]
+    return [tuple(row[column] for column in columns) for row in rows]
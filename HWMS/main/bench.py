@@ -0,0 +1,384 @@
+# main/bench.py
+import os
+import platform
+import re
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from asgiref.sync import async_to_sync
+import django
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings, setup_databases, teardown_databases
+
+from . import firms
+from .api import parse_firms_csv, to_fire_objects, save_fire_data_by_date_range
+from .models import FireDetection
+
+BENCH_SCALES = (10_000, 100_000, 1_000_000)
+# 한 단계에서 수집하는 기간 (10일 창 3개)
+INGEST_DAYS = 30
+INGEST_START = date(2025, 1, 1)
+
+# fire_data_api 측정에 쓰는 대표 요청
+API_QUERIES = {
+    'date_range_3d': {'start_date': '2025-01-10', 'end_date': '2025-01-12'},
+    'bbox_date_range': {
+        'start_date': '2025-01-01', 'end_date': '2025-01-30', 'bbox': '126.5,36,127.5,37',
+    },
+    'page_1000': {'limit': '1000'},
+    'grid_zoom5': {'zoom': '5'},
+    'columnar_3d': {'start_date': '2025-01-10', 'end_date': '2025-01-12', 'format': 'columnar'},
+    'ndjson_all': {'format': 'ndjson'},
+}
+
+FIRMS_CSV_HEADER = (
+    'latitude,longitude,bright_ti4,scan,track,acq_date,acq_time,satellite,'
+    'instrument,confidence,version,bright_ti5,frp,daynight'
+)
+
+
+def make_firms_csv(rows, start_date, days=10, seed=0):
+    """
+    FIRMS VIIRS area API 와 같은 형식의 합성 CSV 생성
+
+    Args:
+        rows: 행 수
+        start_date: 첫 관측 날짜 (date)
+        days: 관측 날짜가 퍼질 일 수
+        seed: 난수 시드 (같은 시드면 같은 CSV)
+
+    Returns:
+        str: CSV 문자열
+    """
+    rng = np.random.default_rng(seed)
+    dates = [
+        (start_date + timedelta(days=int(d))).strftime('%Y-%m-%d')
+        for d in rng.integers(0, days, rows)
+    ]
+
+    df = pd.DataFrame({
+        'latitude': rng.uniform(33, 38.5, rows).round(5),
+        'longitude': rng.uniform(124, 130, rows).round(5),
+        'bright_ti4': rng.uniform(295, 367, rows).round(2),
+        'scan': rng.uniform(0.32, 0.8, rows).round(2),
+        'track': rng.uniform(0.36, 0.78, rows).round(2),
+        'acq_date': dates,
+        # FIRMS 는 앞의 0을 빼고 보내므로 정수로 기록
+        'acq_time': rng.integers(0, 24, rows) * 100 + rng.integers(0, 60, rows),
+        'satellite': 'N20',
+        'instrument': 'VIIRS',
+        'confidence': rng.choice(['l', 'n', 'h'], rows, p=[0.1, 0.8, 0.1]),
+        'version': '2.0NRT',
+        'bright_ti5': rng.uniform(260, 310, rows).round(2),
+        'frp': rng.gamma(1.2, 3.0, rows).round(2),
+        'daynight': rng.choice(['D', 'N'], rows),
+    })
+    return df.to_csv(index=False)
+
+
+def legacy_parse(content, start, end):
+    """비교용: 예전 iterrows() 행 단위 변환 루프"""
+    from io import StringIO
+    df_batch = pd.read_csv(StringIO(content))
+    objects = []
+    for idx, row in df_batch.iterrows():
+        try:
+            if isinstance(row['acq_date'], str):
+                acq_date = datetime.strptime(row['acq_date'], '%Y-%m-%d').date()
+            else:
+                acq_date = row['acq_date']
+
+            if start <= acq_date <= end:
+                objects.append(FireDetection(
+                    latitude=float(row['latitude']),
+                    longitude=float(row['longitude']),
+                    bright_ti4=float(row['bright_ti4']),
+                    scan=float(row['scan']),
+                    track=float(row['track']),
+                    acq_date=acq_date,
+                    acq_time=str(row['acq_time']).zfill(4),
+                    satellite=str(row['satellite']),
+                    instrument=str(row['instrument']),
+                    confidence=str(row['confidence']),
+                    version=str(row['version']),
+                    bright_ti5=float(row['bright_ti5']),
+                    frp=float(row['frp']),
+                    daynight=str(row['daynight'])
+                ))
+        except Exception:
+            continue
+    return objects
+
+
+def vectorized_parse(content, start, end):
+    fires, rejects = parse_firms_csv(content, start, end)
+    return to_fire_objects(fires)
+
+
+def bench_parse(rows=100_000, repeat=3):
+    """
+    합성 CSV 로 예전 행 단위 루프와 컬럼 단위 파이프라인의 처리량 비교
+
+    Returns:
+        dict: 방식별 최고 기록 (초, rows/sec)
+    """
+    start = datetime(2025, 3, 1).date()
+    end = start + timedelta(days=9)
+    content = make_firms_csv(rows, start)
+
+    results = {'rows': rows}
+    for name, parse in (('legacy', legacy_parse), ('vectorized', vectorized_parse)):
+        best = None
+        for _ in range(repeat):
+            began = time.perf_counter()
+            objects = parse(content, start, end)
+            elapsed = time.perf_counter() - began
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = {
+            'seconds': round(best, 4),
+            'rows_per_sec': round(len(objects) / best),
+        }
+
+    results['speedup'] = round(results['legacy']['seconds'] / results['vectorized']['seconds'], 1)
+    return results
+
+
+class _FirmsStubHandler(BaseHTTPRequestHandler):
+    """FIRMS area API 대신 합성 CSV 를 돌려주는 핸들러"""
+
+    path_pattern = re.compile(r'/api/area/csv/[^/]+/(?P<source>[^/]+)/[^/]+/(?P<days>\d+)/(?P<date>[\d-]+)$')
+
+    def do_GET(self):
+        match = self.path_pattern.match(self.path)
+        if not match:
+            self.send_error(404)
+            return
+
+        start = date.fromisoformat(match['date'])
+        seed = zlib.crc32(f"{self.server.seed}|{match['source']}|{start}".encode())
+        body = make_firms_csv(
+            self.server.rows_per_window, start, days=int(match['days']), seed=seed
+        ).encode()
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/csv')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def firms_stub_server(rows_per_window, seed=0):
+    """
+    로컬 스텁 서버를 띄우고 firms 모듈이 그 서버로 요청하도록 바꾸는 컨텍스트
+
+    창마다 rows_per_window 행의 합성 CSV 를 돌려주며, 같은 seed 와 창이면 항상
+    같은 내용입니다. 디스크 캐시는 끈 상태로 측정합니다.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _FirmsStubHandler)
+    server.rows_per_window = rows_per_window
+    server.seed = seed
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    original_url = firms.FIRMS_AREA_URL
+    host, port = server.server_address
+    firms.FIRMS_AREA_URL = (
+        f'http://{host}:{port}/api/area/csv/{{key}}/{{source}}/{{area}}/{{days}}/{{date}}'
+    )
+    try:
+        with override_settings(FIRMS_CACHE_MODE='off'):
+            yield server
+    finally:
+        firms.FIRMS_AREA_URL = original_url
+        server.shutdown()
+        server.server_close()
+
+
+def bench_ingest(rows, seed=0):
+    """
+    스텁 서버에서 rows 행을 받아 save_fire_data_by_date_range 로 저장하는 처리량 측정
+
+    Returns:
+        dict: 걸린 시간, 저장한 행 수, rows/sec
+    """
+    windows = -(-INGEST_DAYS // firms.MAX_DAY_RANGE)
+    end = INGEST_START + timedelta(days=INGEST_DAYS - 1)
+
+    with firms_stub_server(-(-rows // windows), seed=seed):
+        began = time.perf_counter()
+        stats = save_fire_data_by_date_range(str(INGEST_START), str(end))
+        elapsed = time.perf_counter() - began
+
+    saved = stats['inserted'] + stats['updated'] + stats['unchanged']
+    return {
+        'seconds': round(elapsed, 3),
+        'rows': saved,
+        'failed_windows': stats['failed'],
+        'rows_per_sec': round(saved / elapsed) if elapsed else None,
+    }
+
+
+async def _astream_size(stream):
+    return sum([len(chunk) async for chunk in stream])
+
+
+def _response_size(response):
+    if not response.streaming:
+        return len(response.content)
+    # 비동기 뷰의 스트리밍 응답은 비동기 이터레이터라 async for 로 읽어야 함
+    if response.is_async:
+        return async_to_sync(_astream_size)(response.streaming_content)
+    return sum(len(chunk) for chunk in response.streaming_content)
+
+
+def bench_api(requests=10, queries=API_QUERIES):
+    """
+    fire_data_api 요청별 지연 시간(p50/p95)과 응답 크기 측정
+
+    응답 캐시는 끈 상태로 측정하므로 매 요청이 실제로 DB 를 조회합니다.
+    스트리밍 응답은 본문을 끝까지 읽은 시간까지 포함합니다.
+    """
+    client = Client()
+    results = {}
+
+    with override_settings(
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+        ALLOWED_HOSTS=['testserver'],
+    ):
+        for name, params in queries.items():
+            timings, size = [], None
+            for _ in range(requests):
+                began = time.perf_counter()
+                response = client.get('/api/fire-data/', params)
+                size = _response_size(response)
+                timings.append(time.perf_counter() - began)
+
+            results[name] = {
+                'status': response.status_code,
+                'p50_ms': round(float(np.percentile(timings, 50)) * 1000, 2),
+                'p95_ms': round(float(np.percentile(timings, 95)) * 1000, 2),
+                'bytes': size,
+            }
+    return results
+
+
+# 웹 워커(HWMS.asgi + URLconf)가 시작할 때 읽으면 안 되는 무거운 모듈
+STARTUP_FORBIDDEN = ('pandas', 'pyarrow', 'requests')
+# 시작 비용 예산 (-X importtime 누적 시간, 최대 RSS) - 기계마다 달라 테스트가 아닌 벤치에서만 비교
+STARTUP_MAX_IMPORT_SECONDS = 1.5
+STARTUP_MAX_RSS_MB = 100
+
+# ru_maxrss 는 fork 한 부모의 최댓값을 물려받으므로 이 프로세스의 VmHWM(KB)을 읽음
+# (/proc 가 없는 Windows, macOS 에서는 빈 줄을 출력하고 최대 RSS 는 측정하지 않음)
+STARTUP_SCRIPT = (
+    'import os, re, HWMS.asgi, HWMS.urls; '
+    "status = '/proc/self/status'; "
+    "print(re.search(r'VmHWM:\\s*(\\d+)', open(status).read())[1] if os.path.exists(status) else '')"
+)
+IMPORTTIME_LINE = re.compile(r'^import time:\s*(\d+) \|\s*(\d+) \| (\s*)(\S+)$')
+
+
+def bench_startup():
+    """
+    새 파이썬 프로세스에서 웹 워커가 읽는 모듈(HWMS.asgi, HWMS.urls)을 불러와 시작 비용을 측정
+
+    python -X importtime 출력에서 최상위 import 의 누적 시간을 더하고,
+    무거운 모듈(STARTUP_FORBIDDEN)이 함께 불려 왔는지 확인합니다.
+
+    Returns:
+        dict: import_s, max_rss_mb(/proc 가 없으면 None), forbidden(불려 온 무거운 모듈),
+            over_budget(예산을 넘은 항목), slowest(누적 시간 상위 모듈)
+    """
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'HWMS.settings')}
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+
+    total_us, top, loaded = 0, [], set()
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match[2]), match[3], match[4]
+        loaded.add(name.split('.')[0])
+        if not indent:
+            total_us += cumulative
+            top.append((cumulative, name))
+
+    import_s = round(total_us / 1e6, 3)
+    output = proc.stdout.split()
+    max_rss_mb = round(int(output[-1]) / 1024, 1) if output else None
+    budgets = {'import_s': (import_s, STARTUP_MAX_IMPORT_SECONDS), 'max_rss_mb': (max_rss_mb, STARTUP_MAX_RSS_MB)}
+    return {
+        'import_s': import_s,
+        'max_rss_mb': max_rss_mb,
+        'forbidden': sorted(loaded & set(STARTUP_FORBIDDEN)),
+        'over_budget': [
+            name for name, (value, budget) in budgets.items() if value is not None and value >= budget
+        ],
+        'slowest': [
+            {'module': name, 'ms': round(us / 1000, 1)} for us, name in sorted(top, reverse=True)[:10]
+        ],
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(scales=BENCH_SCALES, requests=10, parse_rows=100_000, repeat=3, verbosity=0):
+    """
+    테스트 DB 를 새로 만들어 fire_detection 을 scales 크기까지 키워 가며 측정
+
+    각 단계에서는 앞 단계와 겹치지 않는 행만 스텁 서버로 수집한 뒤 API 를 측정하므로
+    단계별 수집 처리량과 테이블 크기에 따른 조회 지연을 함께 볼 수 있습니다.
+
+    Returns:
+        dict: JSON 으로 저장할 측정 결과
+    """
+    results = {
+        'commit': _git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'startup': bench_startup(),
+        'parse': bench_parse(rows=parse_rows, repeat=repeat) if parse_rows else None,
+        'scales': [],
+    }
+
+    old_config = setup_databases(verbosity=verbosity, interactive=False)
+    try:
+        current = 0
+        for step, scale in enumerate(sorted(scales)):
+            ingest = bench_ingest(scale - current, seed=step + 1)
+            current = FireDetection.objects.count()
+            results['scales'].append({
+                'rows': current,
+                'ingest': ingest,
+                'api': bench_api(requests=requests),
+            })
+    finally:
+        teardown_databases(old_config, verbosity=verbosity)
+    return results
@@ -0,0 +1,323 @@
+# main/bulkio.py
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+
+import django
+import pandas as pd
+from django.db import connections, transaction
+
+from . import archive
+from .api import (
+    FIRE_COLUMNS, FLOAT_COLUMNS, NATURAL_KEY, STRING_COLUMNS,
+    clean_firms_frame, read_firms_csv, refresh_derived_data, write_fire_detections,
+)
+from .firms import SOUTH_KOREA_BBOX
+from .models import FireDetection
+from .queries import parse_bbox
+
+logger = logging.getLogger(__name__)
+
+# CSV 를 이 크기(바이트)씩 줄 단위로 잘라 작업 프로세스에 넘김
+IMPORT_CHUNK_BYTES = 32 * 1024 * 1024
+# FIRMS 자료가 시작되는 날짜 (MODIS Terra)
+FIRMS_START_DATE = date(2000, 11, 1)
+# 내보내기에서 한 번에 읽는 일 수
+EXPORT_DAYS_PER_CHUNK = 30
+PARQUET_TYPES = {
+    **{column: 'float64' for column in FLOAT_COLUMNS},
+    **{column: 'string' for column in STRING_COLUMNS},
+    'acq_date': 'date32',
+}
+
+
+def _is_parquet(path):
+    return path.suffix == '.parquet'
+
+
+def _open(path, mode):
+    """.gz 로 끝나면 gzip 으로 열기"""
+    return gzip.open(path, mode) if path.suffix == '.gz' else open(path, mode)
+
+
+def _csv_chunks(path, offset, chunk_bytes):
+    """
+    CSV 를 줄이 끊기지 않게 chunk_bytes 씩 잘라 (헤더 + 블록, 블록 끝 위치) 로 돌려줌
+
+    위치는 (압축을 푼) 파일 안의 바이트 위치라 체크포인트에서 바로 seek 할 수 있습니다.
+    FIRMS CSV 에는 따옴표 안 줄바꿈이 없으므로 줄 단위로 잘라도 됩니다.
+    """
+    with _open(path, 'rb') as f:
+        header = f.readline()
+        if offset:
+            f.seek(offset)
+        else:
+            offset = f.tell()
+
+        rest = b''
+        while True:
+            data = f.read(chunk_bytes)
+            if not data:
+                if rest.strip():
+                    yield header + rest, offset + len(rest)
+                return
+            data = rest + data
+            cut = data.rfind(b'\n') + 1
+            rest = data[cut:]
+            if cut:
+                offset += cut
+                yield header + data[:cut], offset
+
+
+def _parquet_chunks(path, offset, chunk_bytes=None):
+    """Parquet 파일을 row group 단위로 (DataFrame, 다음 row group 번호) 로 돌려줌"""
+    pq = archive._pyarrow()[2]
+    parquet = pq.ParquetFile(path)
+    for i in range(offset, parquet.num_row_groups):
+        yield parquet.read_row_group(i).to_pandas(), i + 1
+
+
+def _parse_chunk(chunk, start, end, bbox):
+    """
+    작업 프로세스에서 청크 하나를 파싱하고 bbox 와 기간으로 거름
+
+    Returns:
+        tuple: (저장할 DataFrame, 읽은 행 수, 제외한 잘못된 행 수)
+    """
+    if isinstance(chunk, pd.DataFrame):
+        # export_firms 로 만든 Parquet: 날짜와 문자열 컬럼을 CSV 로 읽은 것과 같은 형태로 맞춤
+        df = chunk.astype({column: 'string' for column in ['acq_date', *STRING_COLUMNS] if column in chunk})
+    else:
+        df = read_firms_csv(chunk.decode('utf-8'))
+    fires, rejects = clean_firms_frame(df, start, end, bbox)
+    return fires, len(df), len(rejects)
+
+
+def _parse_in_order(chunks, workers, *args):
+    """
+    청크를 workers 개 프로세스에서 파싱하고 넣은 순서대로 (결과, 위치) 를 돌려줌
+
+    작업 프로세스마다 두 청크까지만 미리 넣어 두므로 메모리는 청크 크기에 비례합니다.
+    workers 가 1 이하면 현재 프로세스에서 차례로 파싱합니다.
+    """
+    if workers <= 1:
+        for chunk, position in chunks:
+            yield _parse_chunk(chunk, *args), position
+        return
+
+    # 작업 프로세스가 부모의 DB 연결을 물려받지 않도록 먼저 닫음
+    connections.close_all()
+    with ProcessPoolExecutor(workers, initializer=django.setup) as pool:
+        pending = deque()
+        for chunk, position in chunks:
+            pending.append((pool.submit(_parse_chunk, chunk, *args), position))
+            if len(pending) >= workers * 2:
+                future, done = pending.popleft()
+                yield future.result(), done
+        while pending:
+            future, done = pending.popleft()
+            yield future.result(), done
+
+
+def _load_checkpoint(path, source):
+    """원본 파일 크기와 수정 시각이 같을 때만 이전 진행 상태를 돌려줌"""
+    try:
+        state = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    if state.get('source') != source:
+        logger.warning("원본 파일이 바뀌어 체크포인트를 무시 checkpoint=%s", path)
+        return None
+    return state
+
+
+def _save_checkpoint(path, state):
+    tmp_path = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+    tmp_path.write_text(json.dumps(state))
+    os.replace(tmp_path, path)
+
+
+def import_firms_file(path, start=None, end=None, bbox=SOUTH_KOREA_BBOX, workers=None,
+                      chunk_bytes=IMPORT_CHUNK_BYTES, checkpoint=None, restart=False, progress=None):
+    """
+    FIRMS 아카이브 CSV(.csv, .csv.gz) 나 export_firms 로 만든 Parquet 을 청크 단위로 DB 에 저장
+
+    부모 프로세스는 파일을 줄 단위 블록으로 잘라 넘기기만 하고, 토큰화·타입 변환·bbox
+    필터링은 작업 프로세스들이 나눠 합니다. 파싱한 청크는 원래 순서대로 write_fire_detections
+    (PostgreSQL 은 COPY, 그 밖에는 bulk_create) 로 쓰고, 청크마다 읽은 위치를 체크포인트에
+    남겨 중단된 뒤 다시 실행하면 그 위치부터 이어갑니다. 집계, 이벤트, 화재 추적은
+    청크마다가 아니라 끝에 쓴 날짜 전체에 대해 한 번 갱신합니다.
+
+    Args:
+        path: 가져올 파일 경로
+        start, end: 이 기간의 관측만 저장 (date, 기본값은 FIRMS 시작일 ~ 오늘)
+        bbox: 'min_lon,min_lat,max_lon,max_lat' 범위 안의 관측만 저장 (빈 값이면 전체)
+        workers: 파싱 프로세스 수 (기본값은 CPU 수)
+        chunk_bytes: CSV 청크 크기 (바이트)
+        checkpoint: 체크포인트 파일 경로 (기본값은 원본 경로 + '.checkpoint.json')
+        restart: 체크포인트를 무시하고 처음부터
+        progress: 청크를 쓸 때마다 진행 상태 dict 로 호출할 함수
+
+    Returns:
+        dict: read / inserted / updated / unchanged / rejected 행 수
+
+    Raises:
+        ValueError: 파일이나 파라미터가 잘못된 경우
+    """
+    path = Path(path)
+    if not path.is_file():
+        raise ValueError(f'파일이 없습니다: {path}')
+    bbox = parse_bbox(bbox) if bbox else None
+    start = start or FIRMS_START_DATE
+    end = end or date.today()
+    workers = workers or os.cpu_count() or 1
+    checkpoint = Path(checkpoint) if checkpoint else path.with_name(f'{path.name}.checkpoint.json')
+
+    stat = path.stat()
+    source = {'path': str(path.resolve()), 'size': stat.st_size, 'mtime': stat.st_mtime}
+    state = None if restart else _load_checkpoint(checkpoint, source)
+    if state is None:
+        state = {
+            'source': source,
+            'position': 0,
+            'stats': {'read': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0, 'rejected': 0},
+            'dates': [],
+        }
+    elif state['position']:
+        logger.info("체크포인트부터 이어서 가져옴 path=%s position=%d", path, state['position'])
+
+    stats = state['stats']
+    dates = {date.fromisoformat(d) for d in state['dates']}
+    if _is_parquet(path):
+        chunks = _parquet_chunks(path, state['position'])
+        total = archive._pyarrow()[2].ParquetFile(path).num_row_groups
+    else:
+        chunks = _csv_chunks(path, state['position'], chunk_bytes)
+        # gzip 은 위치가 압축을 푼 기준이라 파일 크기와 비교할 수 없음
+        total = None if path.suffix == '.gz' else stat.st_size
+    started = time.monotonic()
+    read_at_start = stats['read']
+
+    for (fires, read, rejected), position in _parse_in_order(chunks, workers, start, end, bbox):
+        if not fires.empty:
+            with transaction.atomic():
+                counts, written = write_fire_detections(fires)
+            for key, value in counts.items():
+                stats[key] += value
+            dates.update(written)
+        stats['read'] += read
+        stats['rejected'] += rejected
+
+        state['position'] = position
+        state['dates'] = sorted(d.isoformat() for d in dates)
+        _save_checkpoint(checkpoint, state)
+
+        if progress:
+            elapsed = time.monotonic() - started
+            progress({
+                **stats,
+                'position': position,
+                'percent': position / total * 100 if total else None,
+                'rows_per_second': (stats['read'] - read_at_start) / elapsed if elapsed else 0,
+            })
+
+    if dates:
+        refresh_derived_data(dates)
+    checkpoint.unlink(missing_ok=True)
+    logger.info("FIRMS 파일 가져오기 완료 path=%s %s", path,
+                ' '.join(f'{key}={value}' for key, value in stats.items()))
+    return stats
+
+
+def _export_frame(days, archived, satellites):
+    """days 날짜의 관측을 DB 와 아카이브에서 읽어 시각 순 DataFrame 으로"""
+    frames = []
+    db_days = [day for day in days if day not in archived]
+    if db_days:
+        fires = FireDetection.objects.filter(acq_date__in=db_days)
+        if satellites:
+            fires = fires.filter(satellite__in=satellites)
+        frames.append(pd.DataFrame.from_records(
+            list(fires.order_by('acq_date', 'acq_time', 'id').values_list(*FIRE_COLUMNS)),
+            columns=FIRE_COLUMNS,
+        ))
+
+    pq = archive._pyarrow()[2] if archived else None
+    for day in days:
+        if day in archived:
+            df = pq.read_table(archive._day_path('detections', day), columns=FIRE_COLUMNS).to_pandas()
+            frames.append(df[df['satellite'].isin(satellites)] if satellites else df)
+
+    if not frames:
+        return pd.DataFrame(columns=FIRE_COLUMNS)
+    df = pd.concat(frames, ignore_index=True)
+    # 보관 도중 중단돼 DB 와 아카이브에 같은 날짜가 있어도 한 번만 내보냄
+    df = df.drop_duplicates(subset=NATURAL_KEY)
+    return df.sort_values(['acq_date', 'acq_time'], kind='stable')
+
+
+def export_firms_file(path, start=None, end=None, satellites=None,
+                      days_per_chunk=EXPORT_DAYS_PER_CHUNK, progress=None):
+    """
+    저장된 관측(아카이브 포함)을 FIRMS CSV 형식(.csv, .csv.gz) 이나 Parquet 으로 내보냄
+
+    days_per_chunk 일씩 읽으면서 앞 청크는 별도 스레드에서 파일에 쓰므로 DB 읽기와
+    파일 쓰기가 겹쳐 진행됩니다. 컬럼은 FIRMS CSV 와 같아 import_firms 로 다시 가져올 수 있습니다.
+
+    Args:
+        path: 저장할 파일 경로 (확장자로 형식 결정)
+        start, end: 내보낼 기간 (date, 없으면 전체)
+        satellites: 내보낼 위성 값 목록 (없으면 전체)
+        days_per_chunk: 한 번에 읽는 일 수
+        progress: 청크를 쓸 때마다 (쓴 행 수, 처리한 일 수, 전체 일 수) 로 호출할 함수
+
+    Returns:
+        int: 내보낸 행 수
+    """
+    path = Path(path)
+    days = set(FireDetection.objects.order_by().values_list('acq_date', flat=True).distinct())
+    archived = set(archive.archived_dates())
+    days = sorted(
+        day for day in days | archived
+        if (start is None or day >= start) and (end is None or day <= end)
+    )
+
+    if _is_parquet(path):
+        pa, _, pq = archive._pyarrow()
+        schema = pa.schema([(column, pa.type_for_alias(PARQUET_TYPES[column])) for column in FIRE_COLUMNS])
+        writer = pq.ParquetWriter(path, schema, compression='zstd')
+
+        def write(df):
+            writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+    else:
+        writer = _open(path, 'wt')
+        writer.write(','.join(FIRE_COLUMNS) + '\n')
+
+        def write(df):
+            df.to_csv(writer, header=False, index=False, lineterminator='\n')
+
+    rows = 0
+    pending = None
+    try:
+        with ThreadPoolExecutor(1) as pool:
+            for i in range(0, len(days), days_per_chunk):
+                df = _export_frame(days[i:i + days_per_chunk], archived, satellites)
+                # 앞 청크 쓰기가 끝나야 다음 청크를 넘겨 메모리에는 두 청크까지만 둠
+                if pending is not None:
+                    pending.result()
+                pending = pool.submit(write, df) if not df.empty else None
+                rows += len(df)
+                if progress:
+                    progress(rows, min(i + days_per_chunk, len(days)), len(days))
+            if pending is not None:
+                pending.result()
+    finally:
+        writer.close()
+    return rows
@@ -0,0 +1,86 @@
+# main/bulkload.py
+from django.db import connection, transaction
+
+
+def copy_supported():
+    """COPY FROM STDIN 경로를 쓸 수 있는지 (PostgreSQL + psycopg 3)"""
+    if connection.vendor != 'postgresql':
+        return False
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+    return is_psycopg3
+
+
+def copy_upsert(model, df, unique_fields, update_fields, returning=()):
+    """
+    DataFrame 을 COPY 로 임시 테이블에 흘려 넣은 뒤 INSERT ... ON CONFLICT 한 번으로 병합
+
+    행마다 INSERT 문을 만드는 bulk_create 와 달리 데이터는 COPY 스트림 하나로 전송되고,
+    값이 같은 기존 행은 ON CONFLICT 의 WHERE 조건에서 걸러져 다시 쓰지 않습니다.
+
+    Args:
+        model: 대상 모델
+        df: unique_fields + update_fields 컬럼을 가진 DataFrame (None 은 NULL)
+        unique_fields: 충돌 판정에 쓰는 유니크 제약 컬럼
+        update_fields: 충돌 시 갱신할 컬럼
+        returning: 실제로 쓴 행에서 함께 돌려받을 컬럼
+
+    Returns:
+        list: 쓴 행마다 (새 행 여부, *returning 값) 튜플
+    """
+    qn = connection.ops.quote_name
+    table = qn(model._meta.db_table)
+    stage = qn(f'{model._meta.db_table}_stage')
+    columns = list(unique_fields) + list(update_fields)
+    column_list = ', '.join(qn(c) for c in columns)
+    target = ', '.join(f'{table}.{qn(c)}' for c in update_fields)
+    excluded = ', '.join(f'EXCLUDED.{qn(c)}' for c in update_fields)
+
+    # object 로 바꿔야 numpy 정수가 psycopg 가 아는 int 로 넘어감
+    rows = df[columns].astype(object).itertuples(index=False, name=None)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        # 제약 없이 컬럼 구조만 복사한 임시 테이블 (트랜잭션이 끝나면 삭제)
+        # 바깥 트랜잭션 안에서 여러 번 불리면 이전 임시 테이블이 남아 있으므로 먼저 지움
+        cursor.execute(f'DROP TABLE IF EXISTS pg_temp.{stage}')
+        cursor.execute(
+            f'CREATE TEMP TABLE {stage} ON COMMIT DROP AS '
+            f'SELECT {column_list} FROM {table} WITH NO DATA'
+        )
+        with cursor.copy(f'COPY {stage} ({column_list}) FROM STDIN') as copy:
+            for row in rows:
+                copy.write_row(row)
+
+        cursor.execute(
+            f'INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {stage} '
+            f"ON CONFLICT ({', '.join(qn(c) for c in unique_fields)}) DO UPDATE SET "
+            + ', '.join(f'{qn(c)} = EXCLUDED.{qn(c)}' for c in update_fields)
+            + f' WHERE ({target}) IS DISTINCT FROM ({excluded}) '
+            # xmax 가 0 이면 이번 INSERT 로 새로 만든 행
+            + 'RETURNING (xmax = 0)'
+            + ''.join(f', {qn(c)}' for c in returning)
+        )
+        return cursor.fetchall()
+
+
+def update_rows(model, objs, fields):
+    """
+    objs 의 fields 값을 행마다 UPDATE ... WHERE id = ? 로 executemany
+
+    bulk_update 는 행마다 CASE WHEN 식을 만들어 수천 행이면 SQL 을 만드는 데 더 오래 걸리므로,
+    같은 문장을 파라미터만 바꿔 실행합니다.
+    """
+    if not objs:
+        return
+    qn = connection.ops.quote_name
+    fields = [model._meta.get_field(name) for name in fields]
+    sql = (
+        f'UPDATE {qn(model._meta.db_table)} SET '
+        + ', '.join(f'{qn(field.column)} = %s' for field in fields)
+        + f' WHERE {qn(model._meta.pk.column)} = %s'
+    )
+    params = [
+        [field.get_db_prep_save(getattr(obj, field.attname), connection) for field in fields] + [obj.pk]
+        for obj in objs
+    ]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(sql, params)
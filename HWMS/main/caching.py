@@ -0,0 +1,125 @@
+# main/caching.py
+import hashlib
+import time
+from datetime import datetime, timezone
+from functools import wraps
+from urllib.parse import urlencode
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.cache import cache
+from django.views.decorators.http import condition
+
+DATA_VERSION_KEY = 'fire_data_version'
+DAY_VERSION_KEY = 'fire_day_version:{}'
+RESPONSE_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_data_version():
+    """
+    현재 데이터 버전 (마지막으로 데이터가 바뀐 시각, 밀리초)
+
+    캐시에 값이 없으면 지금 시각으로 새로 정하므로, 캐시가 비워져도 이전 응답이
+    잘못 재사용되는 일은 없습니다.
+    """
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        now = int(time.time() * 1000)
+        cache.add(DATA_VERSION_KEY, now, None)
+        # DummyCache 처럼 값을 저장하지 않는 백엔드에서는 매번 새 버전이 됨
+        version = cache.get(DATA_VERSION_KEY) or now
+    return version
+
+
+def bump_data_version():
+    """데이터가 바뀌었을 때 호출 - 이전 버전으로 캐시된 응답과 ETag 가 모두 무효가 됨"""
+    version = max(int(time.time() * 1000), (cache.get(DATA_VERSION_KEY) or 0) + 1)
+    cache.set(DATA_VERSION_KEY, version, None)
+    return version
+
+
+def get_day_versions(dates):
+    """
+    날짜별 데이터 버전 {date: 버전}
+
+    캐시에 없는 날짜는 현재 전체 데이터 버전으로 정해 저장합니다.
+    """
+    keys = {DAY_VERSION_KEY.format(d): d for d in dates}
+    found = cache.get_many(list(keys))
+    versions = {keys[key]: version for key, version in found.items()}
+
+    missing = [key for key in keys if key not in found]
+    if missing:
+        version = get_data_version()
+        cache.set_many({key: version for key in missing}, None)
+        versions.update({keys[key]: version for key in missing})
+    return versions
+
+
+def bump_day_versions(dates):
+    """해당 날짜의 화재가 바뀌었을 때 호출 - 그 날짜를 포함한 타일이 모두 무효가 됨"""
+    version = int(time.time() * 1000)
+    cache.set_many({DAY_VERSION_KEY.format(d): version for d in dates}, None)
+
+
+def _accepted_encodings(request):
+    """응답 본문을 바꾸는 압축 방식만 골라냄 (캐시 키와 ETag 구분용)"""
+    header = request.headers.get('Accept-Encoding', '')
+    accepted = {part.split(';')[0].strip() for part in header.split(',')}
+    return ','.join(sorted(accepted & {'br', 'gzip'}))
+
+
+def _request_fingerprint(request):
+    """경로 + 정렬된 쿼리 파라미터(빈 값 제외) + 압축 방식"""
+    params = sorted((k, v) for k, v in request.GET.items() if v != '')
+    raw = f'{request.path}?{urlencode(params)}|{_accepted_encodings(request)}'
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def _etag(request, *args, **kwargs):
+    return f'{_request_fingerprint(request)}-{get_data_version()}'
+
+
+def _last_modified(request, *args, **kwargs):
+    return datetime.fromtimestamp(get_data_version() / 1000, tz=timezone.utc)
+
+
+def _response_cache_key(request):
+    return f'fire_response:{_request_fingerprint(request)}:{get_data_version()}'
+
+
+def cached_fire_response(view):
+    """
+    화재 조회 뷰의 응답을 데이터 버전별로 캐시하고 ETag / Last-Modified 를 붙이는 데코레이터
+
+    브라우저가 If-None-Match / If-Modified-Since 를 보내고 그 사이 수집이 없었다면
+    뷰를 실행하지 않고 304 를 돌려줍니다. 스트리밍 응답과 오류 응답은 캐시하지 않습니다.
+    동기 뷰와 비동기 뷰 모두에 쓸 수 있습니다.
+    """
+    if iscoroutinefunction(view):
+        @condition(etag_func=_etag, last_modified_func=_last_modified)
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            key = await sync_to_async(_response_cache_key)(request)
+
+            response = await cache.aget(key)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+                if response.status_code == 200 and not response.streaming:
+                    await cache.aset(key, response, RESPONSE_CACHE_TIMEOUT)
+            return response
+
+        return async_wrapper
+
+    @condition(etag_func=_etag, last_modified_func=_last_modified)
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = _response_cache_key(request)
+
+        response = cache.get(key)
+        if response is None:
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                cache.set(key, response, RESPONSE_CACHE_TIMEOUT)
+        return response
+
+    return wrapper
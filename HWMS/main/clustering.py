@@ -0,0 +1,114 @@
+# main/clustering.py
+import math
+from collections import defaultdict
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+# haversine_km 과 같은 구 기준 위도 1도 거리 (약 111.195km)
+KM_PER_DEG_LAT = EARTH_RADIUS_KM * math.pi / 180
+# 같은 위도 차에서 대권 거리는 위선을 따른 거리보다 조금 짧으므로 경도 칸을 여유 있게 넓힘
+CELL_MARGIN = 1.01
+CONFIDENCE_RANK = {'l': 1, 'n': 2, 'h': 3}
+
+
+def haversine_km(lat, lon, lats, lons):
+    """
+    한 점(lat, lon)과 여러 점(lats, lons) 사이의 거리(km)를 한 번에 계산
+
+    Args:
+        lat, lon: 기준 점 (도)
+        lats, lons: 비교할 점들의 NumPy 배열 (도)
+
+    Returns:
+        np.ndarray: 각 점까지의 거리 (km)
+    """
+    lat1 = math.radians(lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlon = np.radians(lons) - math.radians(lon)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def cluster_fires(fires, radius_km=10):
+    """
+    화재 목록을 radius_km 반경으로 클러스터링
+
+    fire_map.html 의 clusterFires() 와 같은 규칙(앞에서부터 처리되지 않은 화재를
+    기준점으로 잡고 반경 안의 나머지 화재를 흡수)을 따르지만, 격자 버킷으로 후보를
+    좁힌 뒤 NumPy 로 거리를 한 번에 계산하므로 O(n²) 비교가 필요 없습니다.
+
+    Args:
+        fires: fire_data_api 와 같은 키를 가진 dict 목록 (정렬 순서 유지)
+        radius_km: 클러스터 반경 (km)
+
+    Returns:
+        list: 클러스터 dict 목록
+    """
+    n = len(fires)
+    if n == 0:
+        return []
+
+    lats = np.fromiter((f['latitude'] for f in fires), dtype=np.float64, count=n)
+    lons = np.fromiter((f['longitude'] for f in fires), dtype=np.float64, count=n)
+
+    # 격자 한 칸이 반경보다 작지 않도록 잡으면 주변 3x3 칸만 보면 됨
+    # (거리 계산과 같은 지구 반지름으로 잡아야 경계 근처 점을 놓치지 않음)
+    cell_lat = radius_km / KM_PER_DEG_LAT * CELL_MARGIN
+    max_abs_lat = min(float(np.abs(lats).max()), 89.0)
+    cell_lon = radius_km / (KM_PER_DEG_LAT * math.cos(math.radians(max_abs_lat))) * CELL_MARGIN
+
+    rows = np.floor(lats / cell_lat).astype(np.int64)
+    cols = np.floor(lons / cell_lon).astype(np.int64)
+
+    buckets = defaultdict(list)
+    for i, key in enumerate(zip(rows.tolist(), cols.tolist())):
+        buckets[key].append(i)
+    buckets = {key: np.array(idx, dtype=np.int64) for key, idx in buckets.items()}
+
+    processed = np.zeros(n, dtype=bool)
+    clusters = []
+
+    for i in range(n):
+        if processed[i]:
+            continue
+
+        r, c = int(rows[i]), int(cols[i])
+        neighbours = [
+            buckets[key]
+            for key in ((r + dr, c + dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1))
+            if key in buckets
+        ]
+        candidates = np.concatenate(neighbours)
+        candidates = candidates[~processed[candidates]]
+
+        distances = haversine_km(lats[i], lons[i], lats[candidates], lons[candidates])
+        members = np.sort(candidates[distances <= radius_km])
+        processed[members] = True
+
+        clusters.append(_summarize([fires[j] for j in members], lats[members], lons[members]))
+
+    return clusters
+
+
+def _summarize(members, lats, lons):
+    """클러스터 구성원으로부터 중심, 개수, 최대 신뢰도, FRP, 최신 시각 계산"""
+    frps = [m['frp'] for m in members]
+    latest = max(members, key=lambda m: (str(m['acq_date']), str(m['acq_time']).zfill(4)))
+    max_confidence = max(
+        (m['confidence'] for m in members),
+        key=lambda c: CONFIDENCE_RANK.get(c, 0)
+    )
+
+    return {
+        'center_lat': float(lats.mean()),
+        'center_lng': float(lons.mean()),
+        'count': len(members),
+        'max_confidence': max_confidence,
+        'mean_frp': sum(frps) / len(frps),
+        'max_frp': max(frps),
+        'latest_date': str(latest['acq_date']),
+        'latest_time': str(latest['acq_time']).zfill(4),
+        'fire_ids': [m['id'] for m in members],
+    }
@@ -0,0 +1,255 @@
+# main/encoders.py
+import gzip
+import json
+import struct
+from datetime import date
+
+import numpy as np
+from django.db.models import CharField
+from django.db.models.functions import Cast
+
+from .queries import FIRE_FIELDS
+
+STREAM_CHUNK_SIZE = 2000
+
+
+def _row_chunks(rows, chunk_size):
+    """FIRE_FIELDS 순서 행 목록(아카이브와 합친 결과)을 chunk_size 행씩 dict 목록으로"""
+    date_index = FIRE_FIELDS.index('acq_date')
+    for i in range(0, len(rows), chunk_size):
+        yield [
+            {**dict(zip(FIRE_FIELDS, row)), 'acq_date': str(row[date_index])}
+            for row in rows[i:i + chunk_size]
+        ]
+
+
+# 모델 필드와 같은 이름으로는 annotate 할 수 없어 날짜 문자열은 다른 키로 받음
+_VALUE_KEYS = ['acq_date_text' if field == 'acq_date' else field for field in FIRE_FIELDS]
+
+
+def _text_date_values(fires):
+    """acq_date 를 DB 에서 바로 문자열로 바꿔 읽는 values() 쿼리셋"""
+    # values_list().aiterator() 는 첫 조회를 이벤트 루프에서 실행하므로 values() 를 사용
+    return fires.values(
+        *(key for key in _VALUE_KEYS if key != 'acq_date_text'),
+        acq_date_text=Cast('acq_date', output_field=CharField()),
+    )
+
+
+def _fire_dict(row):
+    return {field: row[key] for field, key in zip(FIRE_FIELDS, _VALUE_KEYS)}
+
+
+def iter_fire_chunks(fires, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    화재 쿼리셋을 chunk_size 행씩 dict 목록으로 읽어 돌려주는 제너레이터
+
+    acq_date 는 DB 에서 바로 문자열로 변환해 가져오므로 파이썬에서 날짜를 다시
+    문자열로 바꾸는 반복이 없고, iterator() 로 읽어 전체 결과를 메모리에 올리지 않습니다.
+
+    fires 로 FIRE_FIELDS 순서의 행 목록(아카이브와 합친 결과)을 넘겨도 됩니다.
+    """
+    if isinstance(fires, list):
+        yield from _row_chunks(fires, chunk_size)
+        return
+
+    chunk = []
+    for row in _text_date_values(fires).iterator(chunk_size=chunk_size):
+        chunk.append(_fire_dict(row))
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def aiter_fire_chunks(fires, chunk_size=STREAM_CHUNK_SIZE):
+    """iter_fire_chunks 의 비동기 버전 (DB 를 기다리는 동안 이벤트 루프를 막지 않음)"""
+    if isinstance(fires, list):
+        for chunk in _row_chunks(fires, chunk_size):
+            yield chunk
+        return
+
+    chunk = []
+    async for row in _text_date_values(fires).aiterator(chunk_size=chunk_size):
+        chunk.append(_fire_dict(row))
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _json_array_part(chunk, first):
+    body = json.dumps(chunk, ensure_ascii=False, separators=(',', ':'))[1:-1]
+    return (body if first else ',' + body).encode()
+
+
+def _ndjson_part(chunk):
+    return ''.join(
+        json.dumps(fire, ensure_ascii=False, separators=(',', ':')) + '\n'
+        for fire in chunk
+    ).encode()
+
+
+def stream_json_array(fires, chunk_size=STREAM_CHUNK_SIZE):
+    """JSON 배열을 조각 단위로 내보냄 (결과는 JsonResponse 와 같은 형식)"""
+    yield b'['
+    for i, chunk in enumerate(iter_fire_chunks(fires, chunk_size)):
+        yield _json_array_part(chunk, i == 0)
+    yield b']'
+
+
+def stream_ndjson(fires, chunk_size=STREAM_CHUNK_SIZE):
+    """한 줄에 화재 하나씩인 NDJSON 으로 내보냄"""
+    for chunk in iter_fire_chunks(fires, chunk_size):
+        yield _ndjson_part(chunk)
+
+
+async def astream_json_array(fires, chunk_size=STREAM_CHUNK_SIZE):
+    """stream_json_array 의 비동기 버전 (ASGI 서버용)"""
+    yield b'['
+    first = True
+    async for chunk in aiter_fire_chunks(fires, chunk_size):
+        yield _json_array_part(chunk, first)
+        first = False
+    yield b']'
+
+
+async def astream_ndjson(fires, chunk_size=STREAM_CHUNK_SIZE):
+    """stream_ndjson 의 비동기 버전 (ASGI 서버용)"""
+    async for chunk in aiter_fire_chunks(fires, chunk_size):
+        yield _ndjson_part(chunk)
+
+
+# 컬럼형 바이너리 형식에 들어가는 컬럼과 타입 (모두 little-endian)
+COLUMNAR_COLUMNS = (
+    ('id', '<u8'),           # BigAutoField 라 32비트를 넘을 수 있음
+    ('latitude', '<f4'),
+    ('longitude', '<f4'),
+    ('frp', '<f4'),
+    ('bright_ti4', '<f4'),
+    ('acq_date', '<i4'),     # 1970-01-01 부터 지난 일 수
+    ('acq_time', '<u2'),     # HHMM 정수
+    ('satellite', '<u2'),    # dictionaries['satellite'] 의 인덱스 (이벤트는 위성 조합이라 종류가 늘 수 있음)
+    ('confidence', '<u2'),   # dictionaries['confidence'] 의 인덱스
+)
+DICTIONARY_COLUMNS = ('satellite', 'confidence')
+EPOCH = date(1970, 1, 1)
+
+
+def _fire_columns(fires):
+    """쿼리셋 (또는 FIRE_FIELDS 순서의 행 목록) 을 컬럼별 NumPy 배열과 사전 인코딩 값 목록으로 변환"""
+    rows = fires if isinstance(fires, list) else list(fires.values_list(*FIRE_FIELDS))
+    values = dict(zip(FIRE_FIELDS, zip(*rows))) if rows else {f: () for f in FIRE_FIELDS}
+
+    columns, dictionaries = {}, {}
+    for name, dtype in COLUMNAR_COLUMNS:
+        column = values[name]
+        if name in DICTIONARY_COLUMNS:
+            dictionary, codes = np.unique(np.array(column, dtype=str), return_inverse=True)
+            dictionaries[name] = dictionary.tolist()
+            columns[name] = codes.astype(dtype)
+        elif name == 'acq_date':
+            columns[name] = np.array([(d - EPOCH).days for d in column], dtype=dtype)
+        elif name == 'acq_time':
+            columns[name] = np.array([int(t) for t in column], dtype=dtype)
+        else:
+            columns[name] = np.array(column, dtype=dtype)
+    return columns, dictionaries
+
+
+def encode_columnar(fires):
+    """
+    화재 쿼리셋을 컬럼형 바이너리로 인코딩
+
+    형식:
+        [uint32 헤더 길이 N][N 바이트 JSON 헤더][컬럼 버퍼들]
+
+        헤더는 {"count", "columns": [{"name", "type", "offset"}], "dictionaries"} 이고,
+        offset 은 전체 바이트 기준이며 모든 버퍼는 8바이트 경계에 정렬되어 있어
+        브라우저에서 복사 없이 Float32Array 등으로 바로 읽을 수 있습니다.
+    """
+    columns, dictionaries = _fire_columns(fires)
+    count = len(columns['id'])
+
+    layout, offset = [], 0
+    for name, dtype in COLUMNAR_COLUMNS:
+        layout.append({'name': name, 'type': dtype, 'offset': offset})
+        offset += -(-columns[name].nbytes // 8) * 8
+
+    def header_bytes(base):
+        header = {
+            'count': count,
+            'columns': [{**c, 'offset': c['offset'] + base} for c in layout],
+            'dictionaries': dictionaries,
+        }
+        return json.dumps(header, separators=(',', ':')).encode()
+
+    # 헤더 길이에 따라 버퍼 시작 위치가 바뀌므로 정렬이 맞을 때까지 공백으로 채움
+    base = 8
+    header = header_bytes(base)
+    while 4 + len(header) > base:
+        base = -(-(4 + len(header)) // 8) * 8
+        header = header_bytes(base)
+    header = header.ljust(base - 4)
+
+    parts = [struct.pack('<I', len(header)), header]
+    for name, dtype in COLUMNAR_COLUMNS:
+        buffer = columns[name].tobytes()
+        parts.append(buffer.ljust(-(-len(buffer) // 8) * 8, b'\0'))
+    return b''.join(parts)
+
+
+def encode_arrow(fires):
+    """
+    화재 쿼리셋을 Apache Arrow IPC 스트림으로 인코딩 (pyarrow 필요)
+
+    Raises:
+        ValueError: pyarrow 가 설치되어 있지 않은 경우
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ValueError('format=arrow를 사용하려면 pyarrow가 필요합니다.')
+
+    columns, dictionaries = _fire_columns(fires)
+    arrays = {}
+    for name, dtype in COLUMNAR_COLUMNS:
+        if name in DICTIONARY_COLUMNS:
+            # Arrow 사전 인덱스는 부호 있는 정수여야 함 (int8 은 128가지를 넘으면 넘침)
+            arrays[name] = pa.DictionaryArray.from_arrays(
+                pa.array(columns[name].astype('int32')),
+                pa.array(dictionaries[name], type=pa.string())
+            )
+        elif name == 'acq_date':
+            arrays[name] = pa.array(columns[name], type=pa.date32())
+        else:
+            arrays[name] = pa.array(columns[name])
+
+    table = pa.table(arrays)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def compress(body, accept_encoding):
+    """
+    Accept-Encoding 에 맞춰 brotli(requirements 에 포함, 없으면 건너뜀) 또는 gzip 으로 압축
+
+    Returns:
+        tuple: (본문, Content-Encoding 값 또는 None)
+    """
+    accepted = {part.split(';')[0].strip() for part in accept_encoding.split(',')}
+
+    if 'br' in accepted:
+        try:
+            import brotli
+        except ImportError:
+            pass
+        else:
+            return brotli.compress(body, quality=5), 'br'
+    if 'gzip' in accepted:
+        return gzip.compress(body, compresslevel=6), 'gzip'
+    return body, None
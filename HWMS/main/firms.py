@@ -0,0 +1,197 @@
+# main/firms.py
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from . import firms_cache, metrics
+
+MAP_KEY = '5872ff30914a691ad9aa8eaf6e5410a7'
+# BBOX 형식: min_lon,min_lat,max_lon,max_lat
+# 한국: 경도 124~130°E, 위도 33~38.5°N
+SOUTH_KOREA_BBOX = '124,33,130,38.5'
+
+# FIRMS API 형식: /api/area/csv/{MAP_KEY}/{source}/{area}/{dayRange}/{date}
+FIRMS_AREA_URL = 'https://firms.modaps.eosdis.nasa.gov/api/area/csv/{key}/{source}/{area}/{days}/{date}'
+FIRMS_SOURCES = ('VIIRS_NOAA20_NRT', 'VIIRS_SNPP_NRT', 'MODIS_NRT')
+
+# FIRMS API는 최대 10일씩만 조회 가능
+MAX_DAY_RANGE = 10
+MAX_WORKERS = 4
+REQUEST_TIMEOUT = 30
+MAX_RETRIES = 3
+RETRY_BACKOFF = 1.0
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# MAP_KEY 당 10분에 5000 트랜잭션 제한
+RATE_LIMIT_CALLS = 5000
+RATE_LIMIT_PERIOD = 600
+
+# FIRMS 는 잘못된 키나 호출 한도 초과도 HTTP 200 과 안내 문장으로 돌려주므로 CSV 헤더로 구분
+CSV_REQUIRED_COLUMNS = {'latitude', 'longitude', 'acq_date', 'acq_time'}
+
+FirmsWindow = namedtuple('FirmsWindow', ['source', 'start', 'days'])
+FirmsResponse = namedtuple('FirmsResponse', ['window', 'status', 'text', 'error'])
+
+
+class RateLimiter:
+    """period 초 동안 calls 번까지만 허용하는 스레드 안전 슬라이딩 윈도우 제한기"""
+
+    def __init__(self, calls, period):
+        self.calls = calls
+        self.period = period
+        self._stamps = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._stamps and now - self._stamps[0] >= self.period:
+                    self._stamps.popleft()
+                if len(self._stamps) < self.calls:
+                    self._stamps.append(now)
+                    return
+                wait = self.period - (now - self._stamps[0])
+            time.sleep(wait)
+
+
+rate_limiter = RateLimiter(RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """커넥션을 재사용하는 공용 requests.Session"""
+    global _session
+    # 웹 워커는 FIRMS_SOURCES 만 쓰므로 requests 는 내려받을 때 가져옴
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+    return _session
+
+
+def split_windows(start, end, sources):
+    """
+    날짜 범위를 소스별 10일 단위 창으로 분할
+
+    Args:
+        start, end: 시작/종료 날짜 (date)
+        sources: FIRMS 소스 이름 목록
+
+    Returns:
+        list: FirmsWindow 목록
+    """
+    windows = []
+    for source in sources:
+        current = start
+        while current <= end:
+            window_end = min(current + timedelta(days=MAX_DAY_RANGE - 1), end)
+            windows.append(FirmsWindow(source, current, (window_end - current).days + 1))
+            current = window_end + timedelta(days=1)
+    return windows
+
+
+def is_firms_csv(text):
+    """FIRMS CSV 응답인지 (관측이 없는 날의 빈 본문이나 헤더만 있는 본문도 포함)"""
+    header = text.lstrip('\ufeff').split('\n', 1)[0].strip()
+    return not header or CSV_REQUIRED_COLUMNS <= set(header.split(','))
+
+
+def window_url(window, area=SOUTH_KOREA_BBOX):
+    return FIRMS_AREA_URL.format(
+        key=MAP_KEY,
+        source=window.source,
+        area=area,
+        days=window.days,
+        date=window.start.strftime('%Y-%m-%d'),
+    )
+
+
+def fetch_window(window, session=None, refresh=False):
+    """
+    한 창의 CSV를 가져옴. 일시적인 오류는 지수 백오프로 재시도
+
+    디스크 캐시(firms_cache)에 유효한 응답이 있으면 요청하지 않고 그대로 쓰며,
+    replay 모드에서는 캐시에 없는 창을 실패로 돌려줍니다.
+    refresh=True 면 FIRMS 에서 아직 갱신 중인 최근 창은 캐시를 읽지 않고 새로 받습니다
+    (받은 응답은 캐시에 다시 저장).
+
+    Returns:
+        FirmsResponse: 실패해도 예외 대신 error 필드에 담아 반환
+    """
+    mode = firms_cache.cache_mode()
+    cache_args = (window.source, SOUTH_KOREA_BBOX, window.days, window.start)
+    if mode == 'on' and refresh and firms_cache.is_updating(window.start, window.days):
+        metrics.inc('firms_cache_total', result='bypass')
+    elif mode != 'off':
+        text = firms_cache.load(*cache_args, ignore_ttl=mode == 'replay')
+        metrics.inc('firms_cache_total', result='miss' if text is None else 'hit')
+        if text is not None:
+            return FirmsResponse(window, 200, text, None)
+        if mode == 'replay':
+            return FirmsResponse(window, None, None, 'replay 모드: 캐시에 없는 창')
+
+    import requests
+
+    session = session or get_session()
+    url = window_url(window)
+    status, error = None, None
+
+    for attempt in range(MAX_RETRIES + 1):
+        if attempt:
+            time.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+
+        rate_limiter.acquire()
+        try:
+            with metrics.timer('firms_fetch_seconds', source=window.source):
+                response = session.get(url, timeout=REQUEST_TIMEOUT)
+        except requests.exceptions.RequestException as e:
+            metrics.inc('firms_requests_total', status='error')
+            status, error = None, e
+            continue
+
+        status = response.status_code
+        metrics.inc('firms_requests_total', status=status)
+        metrics.inc('firms_fetch_bytes_total', len(response.content), source=window.source)
+        if status == 200 and not is_firms_csv(response.text):
+            # 다시 요청해도 같은 안내가 오므로 재시도하지 않고, 캐시에도 남기지 않음
+            error = f'CSV 가 아닌 응답: {response.text[:200]}'
+            break
+        if status == 200:
+            if mode != 'off':
+                firms_cache.store(*cache_args, response.text)
+            return FirmsResponse(window, status, response.text, None)
+
+        error = f'HTTP {status}: {response.text[:200]}'
+        if status not in RETRY_STATUS:
+            break
+
+        retry_after = response.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            time.sleep(int(retry_after))
+
+    return FirmsResponse(window, status, None, error)
+
+
+def fetch_windows(windows, max_workers=MAX_WORKERS, refresh=False):
+    """
+    여러 창을 동시에 내려받아 끝나는 순서대로 돌려주는 제너레이터
+
+    호출한 쪽이 응답을 파싱하고 저장하는 동안에도 나머지 다운로드가 계속 진행됩니다.
+    refresh 는 fetch_window 에 그대로 넘깁니다.
+    """
+    session = get_session()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(fetch_window, window, session, refresh) for window in windows]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,159 @@
+# main/firms_cache.py
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from django.conf import settings
+
+# 캐시 동작 방식
+#   'on': 캐시에 있으면 재사용하고 없으면 내려받아 저장
+#   'replay': 캐시만 사용 (네트워크 요청 없음, TTL 무시)
+#   'off': 캐시를 사용하지 않음
+CACHE_MODES = ('on', 'replay', 'off')
+
+# 종료일이 최근 NRT_UPDATE_DAYS 일 안에 있는 창은 FIRMS 에서 계속 갱신되므로 TTL 적용
+NRT_UPDATE_DAYS = 2
+NRT_TTL = 15 * 60
+MAX_CACHE_BYTES = 500 * 1024 * 1024
+# 응답을 이만큼 저장할 때마다 한 번씩 용량을 확인
+EVICT_EVERY = 50
+
+_evict_lock = threading.Lock()
+_writes = 0
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def cache_mode():
+    return _setting('FIRMS_CACHE_MODE', 'on')
+
+
+def cache_dir():
+    return Path(_setting('FIRMS_CACHE_DIR', Path(settings.BASE_DIR) / 'firms_cache'))
+
+
+def cache_key(source, area, days, start):
+    """(소스, 영역, 일 수, 시작일) 로 만든 캐시 키"""
+    raw = f'{source}|{area}|{days}|{start}'
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _paths(key):
+    base = cache_dir() / key[:2] / key
+    return base.with_suffix('.csv.gz'), base.with_suffix('.json')
+
+
+def is_updating(start, days, today=None):
+    """종료일이 최근 NRT_UPDATE_DAYS 일 안에 있어 FIRMS 에서 아직 갱신되는 창인지 (today 는 UTC)"""
+    today = today or datetime.now(timezone.utc).date()
+    return start + timedelta(days=days - 1) >= today - timedelta(days=NRT_UPDATE_DAYS)
+
+
+def _is_fresh(meta, fetched_at, now):
+    """이미 확정된 과거 창은 만료되지 않고, 최근 창만 NRT_TTL 뒤에 만료"""
+    fetched_day = datetime.fromtimestamp(fetched_at, tz=timezone.utc).date()
+    if not is_updating(date.fromisoformat(meta['start']), meta['days'], fetched_day):
+        return True
+    return now - fetched_at < _setting('FIRMS_CACHE_NRT_TTL', NRT_TTL)
+
+
+def load(source, area, days, start, ignore_ttl=False):
+    """
+    캐시된 CSV 본문을 읽음
+
+    Returns:
+        str: CSV 본문 (없거나 만료되었으면 None)
+    """
+    data_path, meta_path = _paths(cache_key(source, area, days, start))
+    try:
+        meta = json.loads(meta_path.read_text())
+        if not ignore_ttl and not _is_fresh(meta, meta['fetched_at'], time.time()):
+            return None
+        with gzip.open(data_path, 'rt', encoding='utf-8') as f:
+            text = f.read()
+        # LRU 정리를 위해 마지막 사용 시각을 atime 에 기록
+        # (그 사이 다른 스레드의 evict 가 파일을 지웠으면 캐시에 없던 것으로 봄)
+        os.utime(data_path, (time.time(), data_path.stat().st_mtime))
+    except (OSError, ValueError, KeyError):
+        return None
+    return text
+
+
+def store(source, area, days, start, text):
+    """CSV 본문을 gzip 으로 저장 (EVICT_EVERY 번 저장할 때마다 용량 제한을 확인)"""
+    global _writes
+
+    data_path, meta_path = _paths(cache_key(source, area, days, start))
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # 다른 스레드가 읽는 중에 덮어쓰지 않도록 임시 파일에 쓰고 교체
+    tmp_path = data_path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+    with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+        f.write(text)
+    os.replace(tmp_path, data_path)
+
+    meta = {
+        'source': source,
+        'area': area,
+        'days': days,
+        'start': str(start),
+        'fetched_at': time.time(),
+    }
+    meta_path.write_text(json.dumps(meta))
+
+    # 수집 스레드 여럿이 동시에 저장하므로 횟수는 정리와 같은 잠금 안에서 셈
+    with _evict_lock:
+        _writes += 1
+        if _writes % EVICT_EVERY == 0:
+            _evict()
+
+
+def entries():
+    """캐시에 저장된 창의 메타데이터 목록 (시작일 순)"""
+    result = []
+    for meta_path in cache_dir().glob('*/*.json'):
+        try:
+            result.append(json.loads(meta_path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return sorted(result, key=lambda meta: (meta['start'], meta['source']))
+
+
+def _evict(max_bytes=None):
+    """evict 본체 (_evict_lock 을 잡은 상태에서 호출)"""
+    max_bytes = max_bytes or _setting('FIRMS_CACHE_MAX_BYTES', MAX_CACHE_BYTES)
+    files = []
+    for data_path in cache_dir().glob('*/*.csv.gz'):
+        try:
+            stat = data_path.stat()
+        except OSError:
+            continue
+        files.append((stat.st_atime, stat.st_size, data_path))
+
+    total = sum(size for _, size, _ in files)
+    for _, size, data_path in sorted(files):
+        if total <= max_bytes:
+            break
+        for path in (data_path, data_path.with_suffix('').with_suffix('.json')):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        total -= size
+
+
+def evict(max_bytes=None):
+    """전체 크기가 max_bytes 를 넘으면 마지막 사용 시각이 오래된 항목부터 삭제 (이미 정리 중이면 건너뜀)"""
+    if not _evict_lock.acquire(blocking=False):
+        return
+    try:
+        _evict(max_bytes)
+    finally:
+        _evict_lock.release()
@@ -0,0 +1,296 @@
+# main/fusion.py
+import math
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from .bulkload import update_rows
+from .caching import bump_data_version
+from .clustering import CONFIDENCE_RANK
+from .models import FireDetection, FusedDetection
+
+FUSION_DISTANCE_KM = 1.0
+FUSION_WINDOW_MINUTES = 90
+KM_PER_DEG_LAT = 111.32
+
+# 이벤트 하나를 만드는 데 필요한 관측 컬럼 (values_list 순서)
+_DETECTION_COLUMNS = (
+    'id', 'acq_date', 'acq_time', 'latitude', 'longitude',
+    'satellite', 'confidence', 'frp', 'bright_ti4', 'region_id',
+)
+
+
+def _minutes(acq_times):
+    """'HHMM' 문자열 배열을 자정부터의 분으로 변환"""
+    hhmm = np.array([int(t or 0) for t in acq_times], dtype='int64')
+    return hhmm // 100 * 60 + hhmm % 100
+
+
+def _neighbor_pairs(rows, cols):
+    """
+    공간 해시에서 같은 칸이나 바로 옆 칸(3x3)에 있는 점 쌍 (i < j)
+
+    칸을 키로 정렬한 뒤 이웃 칸마다 searchsorted 로 범위를 찾아 한 번에 펼칩니다.
+    """
+    keys = rows * (1 << 32) + cols
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    firsts, seconds = [], []
+    for dr in (-1, 0, 1):
+        for dc in (-1, 0, 1):
+            target = (rows + dr) * (1 << 32) + (cols + dc)
+            lo = np.searchsorted(sorted_keys, target, side='left')
+            hi = np.searchsorted(sorted_keys, target, side='right')
+            counts = hi - lo
+            if not counts.any():
+                continue
+            first = np.repeat(np.arange(len(keys)), counts)
+            # 각 점의 범위 [lo, hi) 를 이어 붙인 위치
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            second = order[np.repeat(lo, counts) + offsets]
+            keep = first < second
+            firsts.append(first[keep])
+            seconds.append(second[keep])
+
+    if not firsts:
+        return np.empty(0, dtype='int64'), np.empty(0, dtype='int64')
+    return np.concatenate(firsts), np.concatenate(seconds)
+
+
+def close_pairs(lats, lons, distance_km):
+    """
+    distance_km 안에 있는 점 쌍 (i < j)
+
+    칸 한 변이 distance_km 보다 작지 않은 공간 해시에서 3x3 이웃 칸 후보만 만든 뒤
+    1km 안팎에서는 충분히 정확한 등장방형 근사로 거리를 잽니다.
+    """
+    cell_lat = distance_km / KM_PER_DEG_LAT
+    max_abs_lat = min(float(np.abs(lats).max()), 89.0)
+    cell_lon = distance_km / (KM_PER_DEG_LAT * math.cos(math.radians(max_abs_lat)))
+    first, second = _neighbor_pairs(
+        np.floor(lats / cell_lat).astype('int64'),
+        np.floor(lons / cell_lon).astype('int64'),
+    )
+
+    dy = (lats[first] - lats[second]) * KM_PER_DEG_LAT
+    dx = (lons[first] - lons[second]) * KM_PER_DEG_LAT * np.cos(np.radians(lats[first]))
+    close = dx * dx + dy * dy <= distance_km * distance_km
+    return first[close], second[close]
+
+
+def connected_components(n, first, second):
+    """
+    이어진 쌍(first[k], second[k])으로 n 개 점의 연결 요소 번호를 매김
+
+    이어진 쌍끼리 더 작은 번호를 퍼뜨리고 포인터 점프로 대표 번호를 당겨옵니다.
+
+    Returns:
+        ndarray: 점마다 요소 번호 (0 부터 연속)
+    """
+    labels = np.arange(n)
+    while True:
+        smaller = np.minimum(labels[first], labels[second])
+        updated = labels.copy()
+        np.minimum.at(updated, first, smaller)
+        np.minimum.at(updated, second, smaller)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+
+    return np.unique(labels, return_inverse=True)[1]
+
+
+def link_detections(lats, lons, minutes, satellites, distance_km=None, window_minutes=None):
+    """
+    다른 위성의 관측 중 distance_km, window_minutes 안에 있는 것끼리 이어 이벤트 번호를 매김
+
+    같은 위성의 이웃 화소는 서로 다른 화재일 수 있으므로 직접 잇지 않습니다.
+
+    Args:
+        lats, lons: 위도, 경도 배열 (도)
+        minutes: 자정부터의 관측 시각 (분) - 같은 날 관측만 넘겨야 함
+        satellites: 위성 값 배열
+        distance_km: 묶을 최대 거리 (기본값은 설정 FIRE_FUSION_DISTANCE_KM)
+        window_minutes: 묶을 최대 시간 차 (기본값은 설정 FIRE_FUSION_WINDOW_MINUTES)
+
+    Returns:
+        ndarray: 점마다 이벤트 번호 (0 부터 연속, 같은 번호끼리 한 이벤트)
+    """
+    if distance_km is None:
+        distance_km = getattr(settings, 'FIRE_FUSION_DISTANCE_KM', FUSION_DISTANCE_KM)
+    if window_minutes is None:
+        window_minutes = getattr(settings, 'FIRE_FUSION_WINDOW_MINUTES', FUSION_WINDOW_MINUTES)
+
+    lats = np.asarray(lats, dtype='float64')
+    lons = np.asarray(lons, dtype='float64')
+    n = len(lats)
+    if n == 0:
+        return np.empty(0, dtype='int64')
+
+    first, second = close_pairs(lats, lons, distance_km)
+    satellites = np.asarray(satellites)
+    minutes = np.asarray(minutes)
+    linked = (
+        (satellites[first] != satellites[second])
+        & (np.abs(minutes[first] - minutes[second]) <= window_minutes)
+    )
+    return connected_components(n, first[linked], second[linked])
+
+
+def _build_events(rows):
+    """
+    같은 날 관측 행 목록을 이벤트로 묶음
+
+    Returns:
+        tuple: (FusedDetection 목록, 관측마다 이벤트 목록의 위치 배열)
+    """
+    ids, dates, times, lats, lons, sats, confs, frps, brights, regions = zip(*rows)
+    lats = np.array(lats, dtype='float64')
+    lons = np.array(lons, dtype='float64')
+    frps = np.array(frps, dtype='float64')
+    labels = link_detections(lats, lons, _minutes(times), np.array(sats))
+    count = labels.max() + 1
+
+    # FRP 가중 평균 위치 (FRP 가 모두 0 인 이벤트는 단순 평균)
+    weights = np.maximum(frps, 0) + 1e-6
+    weight_sum = np.bincount(labels, weights, count)
+    center_lat = np.bincount(labels, weights * lats, count) / weight_sum
+    center_lng = np.bincount(labels, weights * lons, count) / weight_sum
+    member_count = np.bincount(labels, minlength=count)
+
+    events = [None] * count
+    for i in np.argsort(labels, kind='stable'):
+        label = labels[i]
+        event = events[label]
+        if event is None:
+            events[label] = FusedDetection(
+                latitude=float(center_lat[label]),
+                longitude=float(center_lng[label]),
+                acq_date=dates[i],
+                acq_time=times[i],
+                satellite=sats[i],
+                confidence=confs[i],
+                frp=frps[i],
+                bright_ti4=brights[i],
+                member_count=int(member_count[label]),
+                region_id=regions[i],
+            )
+            continue
+
+        event.acq_time = min(event.acq_time, times[i])
+        if sats[i] not in event.satellite.split(','):
+            event.satellite = ','.join(sorted(event.satellite.split(',') + [sats[i]]))
+        if CONFIDENCE_RANK.get(confs[i], 0) > CONFIDENCE_RANK.get(event.confidence, 0):
+            event.confidence = confs[i]
+        event.bright_ti4 = max(event.bright_ti4, brights[i])
+        # 구역은 가장 강한 관측을 따름
+        if frps[i] > event.frp:
+            event.frp = frps[i]
+            event.region_id = regions[i]
+
+    return events, labels
+
+
+# 다시 묶은 결과와 저장된 이벤트를 비교할 필드 (바뀐 이벤트만 씀)
+_EVENT_FIELDS = (
+    'latitude', 'longitude', 'acq_time', 'satellite', 'confidence',
+    'frp', 'bright_ti4', 'member_count', 'region',
+)
+
+
+def _fuse_day(day):
+    """
+    하루치 관측을 묶어 저장된 이벤트와 비교하고 바뀐 부분만 씀
+
+    묶음마다 구성 관측이 이미 속해 있던 이벤트 id 를 이어받으므로(가장 먼저 저장된
+    관측의 이벤트), 새 관측이 붙지 않은 이벤트는 id 도 값도 그대로이고 쓰지 않습니다.
+    새 관측이 두 이벤트를 이으면 한쪽으로 합치고 빈 이벤트는 지웁니다.
+
+    Returns:
+        int: 그날의 이벤트 수
+    """
+    # 같은 날짜를 동시에 묶는 다른 갱신은 관측 행 잠금이 풀린 뒤 바뀐 연결을 보고 진행
+    # (SQLite 는 IMMEDIATE 트랜잭션이라 쓰기 트랜잭션이 한 번에 하나씩 실행됨)
+    rows = list(
+        FireDetection.objects.select_for_update().filter(acq_date=day)
+        .order_by('id').values_list(*_DETECTION_COLUMNS, 'fused_id')
+    )
+    existing = FusedDetection.objects.filter(acq_date=day).in_bulk()
+    if not rows:
+        FusedDetection.objects.filter(id__in=existing).delete()
+        return 0
+
+    events, labels = _build_events([row[:-1] for row in rows])
+    unclaimed = dict(existing)
+    for row, label in zip(rows, labels):
+        fused_id = row[-1]
+        if events[label].id is None and fused_id in unclaimed:
+            events[label].id = fused_id
+            # 한 이벤트가 둘로 갈라지면 (묶는 기준을 바꾼 경우) 뒤쪽은 새 이벤트가 됨
+            del unclaimed[fused_id]
+
+    attnames = [FusedDetection._meta.get_field(name).attname for name in _EVENT_FIELDS]
+    created = [event for event in events if event.id is None]
+    changed = [
+        event for event in events
+        if event.id is not None
+        and any(getattr(event, name) != getattr(existing[event.id], name) for name in attnames)
+    ]
+    FusedDetection.objects.bulk_create(created, batch_size=1000)
+    update_rows(FusedDetection, changed, _EVENT_FIELDS)
+
+    members = [
+        FireDetection(id=row[0], fused_id=events[label].id)
+        for row, label in zip(rows, labels)
+        if row[-1] != events[label].id
+    ]
+    update_rows(FireDetection, members, ['fused'])
+    # 남은 이벤트는 구성 관측이 모두 다른 이벤트로 옮겨감
+    FusedDetection.objects.filter(id__in=unclaimed).delete()
+    return len(events)
+
+
+def refresh_fused_events(dates):
+    """
+    주어진 날짜의 관측을 다시 묶어 바뀐 이벤트와 연결만 갱신
+
+    이벤트는 UTC 날짜 안에서만 묶습니다. 한국 상공 위성 통과 시각은 UTC 자정
+    (한국 시간 오전 9시) 근처에 없으므로 날짜 경계에서 갈라지는 이벤트는 사실상 없습니다.
+    앞선 갱신이 중단돼 아직 묶이지 않은 관측이 남은 날짜도 함께 처리합니다.
+
+    Args:
+        dates: 다시 묶을 날짜 목록 (date)
+
+    Returns:
+        int: 해당 날짜의 이벤트 수
+    """
+    dates = set(dates) | set(
+        FireDetection.objects.filter(fused__isnull=True)
+        .order_by().values_list('acq_date', flat=True).distinct()
+    )
+
+    total = 0
+    for day in sorted(dates):
+        with transaction.atomic():
+            total += _fuse_day(day)
+    return total
+
+
+def rebuild_fused_events(days_per_batch=30):
+    """
+    fire_detection 전체로 이벤트를 다시 묶음 (묶는 기준을 바꾼 뒤나 기존 DB 에 처음 적용할 때)
+
+    Returns:
+        tuple: (날짜 수, 이벤트 수)
+    """
+    dates = sorted(FireDetection.objects.order_by().values_list('acq_date', flat=True).distinct())
+    FusedDetection.objects.exclude(acq_date__in=dates).delete()
+
+    total = 0
+    for i in range(0, len(dates), days_per_batch):
+        total += refresh_fused_events(dates[i:i + days_per_batch])
+    bump_data_version()
+    return len(dates), total
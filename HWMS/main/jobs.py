@@ -0,0 +1,170 @@
+# main/jobs.py
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .models import IngestJob
+
+logger = logging.getLogger(__name__)
+
+# 이 시간 동안 진행 상황이 갱신되지 않은 대기/실행 중 작업은 죽은 것으로 보고 중복 검사에서 제외
+STALE_AFTER = timedelta(minutes=30)
+STALE_ERROR = '작업이 오랫동안 진행되지 않아 중단된 것으로 처리했습니다.'
+
+# 웹 프로세스 안에서 작업을 실행하는 스레드 (FIRMS 호출 제한 때문에 한 번에 하나씩)
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ingest')
+# 이 프로세스가 남아 있던 대기 작업을 실행 스레드에 다시 넣었는지
+_requeued = False
+
+
+def _active_jobs():
+    stale_before = timezone.now() - STALE_AFTER
+    return IngestJob.objects.filter(
+        status__in=[IngestJob.QUEUED, IngestJob.RUNNING], updated_at__gte=stale_before
+    )
+
+
+def recover_jobs():
+    """
+    워커가 재시작되면서 남은 작업 정리
+
+    STALE_AFTER 동안 진행 상황이 갱신되지 않은 대기/실행 중 작업은 실패로 표시합니다.
+    'thread' 실행 방식의 대기열은 프로세스 메모리에만 있으므로, 프로세스마다 처음 한 번은
+    남아 있는 대기 작업을 이 프로세스의 실행 스레드에 다시 넣습니다. 다른 프로세스가 먼저
+    가져간 작업이면 run_job 이 아무 일도 하지 않으므로 여러 워커가 함께 넣어도 한 번만 실행됩니다.
+
+    Returns:
+        int: 실패로 표시한 작업 수
+    """
+    global _requeued
+
+    now = timezone.now()
+    failed = IngestJob.objects.filter(
+        status__in=[IngestJob.QUEUED, IngestJob.RUNNING], updated_at__lt=now - STALE_AFTER
+    ).update(status=IngestJob.FAILED, error=STALE_ERROR, finished_at=now, updated_at=now)
+    if failed:
+        logger.warning("진행되지 않는 수집 작업 %d개를 실패로 표시", failed)
+
+    if getattr(settings, 'INGEST_JOB_RUNNER', 'thread') == 'thread' and not _requeued:
+        _requeued = True
+        queued = IngestJob.objects.filter(status=IngestJob.QUEUED).order_by('created_at')
+        for job_id in queued.values_list('id', flat=True):
+            _executor.submit(_run_in_thread, job_id)
+    return failed
+
+
+def enqueue_ingest(start, end, sources):
+    """
+    수집 작업을 큐에 넣고 바로 반환
+
+    같은 소스로 대기/실행 중인 작업이 요청 범위를 이미 덮고 있으면 그 작업을 그대로
+    돌려주고, 앞이나 뒤만 겹치면 겹치지 않는 나머지 날짜만 새 작업으로 만듭니다.
+
+    Args:
+        start, end: 시작/종료 날짜 (date)
+        sources: FIRMS 소스 이름 목록
+
+    Returns:
+        tuple: (IngestJob, 새로 만들었는지 여부)
+    """
+    sources_key = ','.join(sorted(sources))
+    recover_jobs()
+
+    with transaction.atomic():
+        overlapping = (
+            _active_jobs()
+            .select_for_update()
+            .filter(sources=sources_key, start_date__lte=end, end_date__gte=start)
+            .order_by('start_date')
+        )
+
+        for job in overlapping:
+            if job.start_date <= start and job.end_date >= end:
+                return job, False
+            if job.start_date <= start <= job.end_date:
+                start = job.end_date + timedelta(days=1)
+            elif job.start_date <= end <= job.end_date:
+                end = job.start_date - timedelta(days=1)
+            if start > end:
+                return job, False
+
+        job = IngestJob.objects.create(start_date=start, end_date=end, sources=sources_key)
+
+        if getattr(settings, 'INGEST_JOB_RUNNER', 'thread') == 'thread':
+            transaction.on_commit(lambda: _executor.submit(_run_in_thread, job.id))
+
+    return job, True
+
+
+def run_job(job_id):
+    """
+    대기 중인 작업 하나를 실행. 다른 워커가 먼저 가져간 작업이면 아무 일도 하지 않음
+
+    Returns:
+        bool: 이 호출에서 작업을 실행했는지 여부
+    """
+    claimed = IngestJob.objects.filter(id=job_id, status=IngestJob.QUEUED).update(
+        status=IngestJob.RUNNING, started_at=timezone.now(), updated_at=timezone.now()
+    )
+    if not claimed:
+        return False
+
+    job = IngestJob.objects.get(id=job_id)
+
+    def progress(done, total):
+        IngestJob.objects.filter(id=job_id).update(
+            done_windows=done, total_windows=total, updated_at=timezone.now()
+        )
+
+    # 수집 모듈은 pandas 를 불러오므로 작업을 실행할 때만 가져옴 (웹 워커는 읽지 않음)
+    from .api import save_fire_data_by_date_range
+
+    try:
+        stats = save_fire_data_by_date_range(
+            job.start_date.strftime('%Y-%m-%d'),
+            job.end_date.strftime('%Y-%m-%d'),
+            job.sources.split(','),
+            progress=progress,
+        )
+        error = stats.pop('error', '')
+    except Exception as e:
+        logger.exception("수집 작업 실패 job_id=%s", job_id)
+        stats, error = None, str(e)
+
+    IngestJob.objects.filter(id=job_id).update(
+        status=IngestJob.FAILED if error else IngestJob.SUCCEEDED,
+        result=stats,
+        error=error,
+        finished_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+    return True
+
+
+def _run_in_thread(job_id):
+    try:
+        run_job(job_id)
+    finally:
+        # 스레드마다 열린 DB 연결은 직접 닫아야 함
+        connections.close_all()
+
+
+def job_to_dict(job):
+    return {
+        'job_id': job.id,
+        'status': job.status,
+        'start_date': str(job.start_date),
+        'end_date': str(job.end_date),
+        'sources': job.sources.split(','),
+        'done_windows': job.done_windows,
+        'total_windows': job.total_windows,
+        'result': job.result,
+        'error': job.error,
+        'created_at': job.created_at.isoformat(),
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    }
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from main.archive import archive_dir, archive_old_detections, archived_dates, hot_window_days
+
+
+class Command(BaseCommand):
+    help = '최근 핫 윈도보다 오래된 화재를 fire_detection 에서 날짜별 Parquet 아카이브로 옮김'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hot-days', type=int, default=None,
+            help='DB 에 남길 최근 일 수 (기본값: 설정 FIRE_HOT_WINDOW_DAYS)'
+        )
+        parser.add_argument('--list', action='store_true', help='옮기지 않고 아카이브 현황만 출력')
+
+    def handle(self, *args, **options):
+        if options['list']:
+            dates = archived_dates()
+            if dates:
+                self.stdout.write(f'{archive_dir()}: {len(dates)}일 ({dates[0]} ~ {dates[-1]})')
+            else:
+                self.stdout.write(f'{archive_dir()}: 비어 있음')
+            return
+
+        hot_days = hot_window_days() if options['hot_days'] is None else options['hot_days']
+        if hot_days < 1:
+            raise CommandError('--hot-days는 1 이상이어야 합니다.')
+        try:
+            days, rows = archive_old_detections(hot_days=hot_days)
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(f'{days}일, 화재 {rows}개를 아카이브로 옮김 (최근 {hot_days}일 유지)')
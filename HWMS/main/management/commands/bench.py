@@ -0,0 +1,45 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from main.bench import BENCH_SCALES, bench_parse, run_suite
+
+
+class Command(BaseCommand):
+    help = '합성 FIRMS 데이터로 수집 처리량과 fire_data_api 지연 시간 측정 (결과는 JSON)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scales', default=','.join(str(s) for s in BENCH_SCALES),
+            help='측정할 fire_detection 행 수 (쉼표 구분)'
+        )
+        parser.add_argument('--requests', type=int, default=10, help='API 요청별 반복 횟수')
+        parser.add_argument('--rows', type=int, default=100_000, help='파싱 비교용 합성 CSV 행 수 (0이면 생략)')
+        parser.add_argument('--repeat', type=int, default=3, help='파싱 비교 반복 횟수 (최고 기록 사용)')
+        parser.add_argument('--parse-only', action='store_true', help='파싱 비교만 실행')
+        parser.add_argument('--output', help='결과 JSON 을 저장할 파일 경로')
+
+    def handle(self, *args, **options):
+        if options['parse_only']:
+            results = bench_parse(rows=options['rows'], repeat=options['repeat'])
+        else:
+            results = run_suite(
+                scales=[int(s) for s in options['scales'].split(',') if s],
+                requests=options['requests'],
+                parse_rows=options['rows'],
+                repeat=options['repeat'],
+                verbosity=options['verbosity'] - 1,
+            )
+
+        output = json.dumps(results, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+        self.stdout.write(output)
+
+        startup = results.get('startup')
+        if startup and (startup['forbidden'] or startup['over_budget']):
+            self.stderr.write(self.style.WARNING(
+                f"웹 워커 시작 비용 확인 필요: 불려 온 무거운 모듈 {startup['forbidden']}, "
+                f"예산 초과 {startup['over_budget']}"
+            ))
@@ -0,0 +1,35 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.bulkio import EXPORT_DAYS_PER_CHUNK, export_firms_file
+
+
+class Command(BaseCommand):
+    help = '저장된 관측(아카이브 포함)을 FIRMS CSV(.csv, .csv.gz) 나 Parquet 으로 내보냄'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='저장할 파일 경로 (확장자로 형식 결정)')
+        parser.add_argument('--start', help='이 날짜 이후 관측만 (YYYY-MM-DD)')
+        parser.add_argument('--end', help='이 날짜 이전 관측만 (YYYY-MM-DD)')
+        parser.add_argument('--satellite', default='', help='쉼표로 구분한 위성 값 (기본값: 전체)')
+        parser.add_argument(
+            '--days-per-chunk', type=int, default=EXPORT_DAYS_PER_CHUNK, help='한 번에 읽는 일 수'
+        )
+
+    def progress(self, rows, done, total):
+        self.stdout.write(f'{done}/{total}일, {rows}행')
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options['start']) if options['start'] else None
+            end = date.fromisoformat(options['end']) if options['end'] else None
+            rows = export_firms_file(
+                options['path'], start=start, end=end,
+                satellites=[s for s in options['satellite'].split(',') if s],
+                days_per_chunk=options['days_per_chunk'],
+                progress=self.progress if options['verbosity'] > 0 else None,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(f"{options['path']}: {rows}행 저장")
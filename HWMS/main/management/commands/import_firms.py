@@ -0,0 +1,51 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.bulkio import IMPORT_CHUNK_BYTES, import_firms_file
+from main.firms import SOUTH_KOREA_BBOX
+
+
+class Command(BaseCommand):
+    help = 'FIRMS 아카이브 CSV(.csv, .csv.gz) 나 Parquet 파일을 청크 단위로 병렬 파싱해 저장 (중단 시 이어서 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='가져올 파일 경로')
+        parser.add_argument('--start', help='이 날짜 이후 관측만 저장 (YYYY-MM-DD)')
+        parser.add_argument('--end', help='이 날짜 이전 관측만 저장 (YYYY-MM-DD)')
+        parser.add_argument(
+            '--bbox', default=SOUTH_KOREA_BBOX,
+            help="저장할 범위 'min_lon,min_lat,max_lon,max_lat' (빈 값이면 전체, 기본값: 한국)"
+        )
+        parser.add_argument('--workers', type=int, help='파싱 프로세스 수 (기본값: CPU 수)')
+        parser.add_argument(
+            '--chunk-mb', type=int, default=IMPORT_CHUNK_BYTES // (1024 * 1024),
+            help='CSV 청크 크기 (MB)'
+        )
+        parser.add_argument('--checkpoint', help="체크포인트 파일 (기본값: 원본 경로 + '.checkpoint.json')")
+        parser.add_argument('--restart', action='store_true', help='체크포인트를 무시하고 처음부터')
+
+    def progress(self, state):
+        percent = f"{state['percent']:5.1f}% " if state['percent'] is not None else ''
+        self.stdout.write(
+            f"{percent}읽음 {state['read']}, 신규 {state['inserted']}, 변경 {state['updated']}, "
+            f"제외 {state['rejected']} ({state['rows_per_second']:,.0f}행/초)"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options['start']) if options['start'] else None
+            end = date.fromisoformat(options['end']) if options['end'] else None
+            stats = import_firms_file(
+                options['path'], start=start, end=end, bbox=options['bbox'],
+                workers=options['workers'], chunk_bytes=options['chunk_mb'] * 1024 * 1024,
+                checkpoint=options['checkpoint'], restart=options['restart'],
+                progress=self.progress if options['verbosity'] > 0 else None,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            f"완료: 읽음 {stats['read']}, 신규 {stats['inserted']}, 변경 {stats['updated']}, "
+            f"동일 {stats['unchanged']}, 제외 {stats['rejected']}"
+        )
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from main.jobs import recover_jobs, run_job
+from main.models import IngestJob
+
+
+class Command(BaseCommand):
+    help = '대기 중인 FIRMS 수집 작업을 순서대로 실행 (INGEST_JOB_RUNNER = "worker" 일 때 사용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=5, help='큐 확인 간격 (초)')
+        parser.add_argument('--once', action='store_true', help='대기 중인 작업을 모두 처리하면 종료')
+
+    def handle(self, *args, **options):
+        recover_jobs()
+        while True:
+            queued = list(
+                IngestJob.objects.filter(status=IngestJob.QUEUED)
+                .order_by('created_at')
+                .values_list('id', flat=True)
+            )
+
+            for job_id in queued:
+                if run_job(job_id):
+                    job = IngestJob.objects.get(id=job_id)
+                    self.stdout.write(f'{job} {job.result or job.error}')
+
+            if options['once'] and not queued:
+                return
+            if not queued:
+                time.sleep(options['interval'])
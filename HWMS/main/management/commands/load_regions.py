@@ -0,0 +1,77 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from main.fusion import rebuild_fused_events
+from main.models import Region
+from main.regions import geometry_bounds, restamp_regions
+from main.stats import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'GeoJSON 행정구역 경계를 region 테이블로 불러오고 저장된 화재의 구역을 다시 계산 '
+        '(shapefile 은 ogr2ogr -f GeoJSON 으로 변환해서 사용)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='GeoJSON FeatureCollection 파일 경로 (WGS84 경도/위도)')
+        parser.add_argument('--level', choices=[Region.SIDO, Region.SIGUNGU], default=Region.SIGUNGU)
+        parser.add_argument('--code-field', default='code', help='구역 코드가 든 속성 이름')
+        parser.add_argument('--name-field', default='name', help='구역 이름이 든 속성 이름')
+        parser.add_argument(
+            '--parent-prefix', type=int, default=0,
+            help='코드 앞 N자리가 상위 구역 코드일 때 N (예: 시군구 코드 11110 -> 시도 11 이면 2)'
+        )
+        parser.add_argument('--no-restamp', action='store_true', help='저장된 화재의 구역을 다시 계산하지 않음')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], encoding='utf-8') as f:
+                features = json.load(f)['features']
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f'GeoJSON 을 읽을 수 없습니다: {e}')
+
+        parents = {}
+        if options['parent_prefix']:
+            parents = dict(Region.objects.values_list('code', 'id'))
+
+        loaded = 0
+        with transaction.atomic():
+            for feature in features:
+                properties = feature.get('properties') or {}
+                geometry = feature.get('geometry')
+                code = str(properties.get(options['code_field'], '')).strip()
+                if not code or not geometry:
+                    continue
+
+                try:
+                    min_lon, min_lat, max_lon, max_lat = geometry_bounds(geometry)
+                except ValueError as e:
+                    self.stderr.write(f'{code} 건너뜀: {e}')
+                    continue
+
+                Region.objects.update_or_create(
+                    code=code,
+                    defaults={
+                        'name': str(properties.get(options['name_field'], code)),
+                        'level': options['level'],
+                        'parent_id': parents.get(code[:options['parent_prefix']]) if options['parent_prefix'] else None,
+                        'geometry': geometry,
+                        'min_lon': min_lon,
+                        'min_lat': min_lat,
+                        'max_lon': max_lon,
+                        'max_lat': max_lat,
+                    },
+                )
+                loaded += 1
+        self.stdout.write(f'구역 {loaded}개 저장')
+
+        if options['no_restamp']:
+            return
+
+        changed = restamp_regions()
+        days, _ = rebuild_daily_stats()
+        rebuild_fused_events()
+        self.stdout.write(f'화재 {changed}개의 구역 갱신, 일별 집계 {days}일 다시 계산')
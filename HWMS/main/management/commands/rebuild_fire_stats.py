@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from main.stats import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = 'fire_detection 전체로 일별 집계(fire_daily_stat)를 다시 계산'
+
+    def handle(self, *args, **options):
+        days, rows = rebuild_daily_stats()
+        self.stdout.write(f'{days}일, 집계 {rows}행 저장')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from main.fusion import rebuild_fused_events
+
+
+class Command(BaseCommand):
+    help = 'fire_detection 전체로 위성 간 중복 관측을 다시 묶어 이벤트(fused_detection)를 저장'
+
+    def handle(self, *args, **options):
+        days, events = rebuild_fused_events()
+        self.stdout.write(f'{days}일, 이벤트 {events}개 저장')
@@ -0,0 +1,52 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main import firms_cache
+from main.api import _ingest_response, refresh_derived_data
+from main.firms import FirmsResponse, FirmsWindow
+
+
+class Command(BaseCommand):
+    help = '디스크에 캐시된 FIRMS 응답만으로 다시 수집 (네트워크 요청 없음)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sources', default='', help='쉼표로 구분한 FIRMS 소스 (기본값: 전체)')
+        parser.add_argument('--start', help='이 날짜 이후 관측만 저장 (YYYY-MM-DD)')
+        parser.add_argument('--end', help='이 날짜 이전 관측만 저장 (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        sources = {s for s in options['sources'].split(',') if s}
+        try:
+            start = date.fromisoformat(options['start']) if options['start'] else date.min
+            end = date.fromisoformat(options['end']) if options['end'] else date.max
+        except ValueError as e:
+            raise CommandError(f'날짜 형식이 올바르지 않습니다: {e}')
+
+        stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'rejected': 0, 'failed': 0}
+        replayed = 0
+        dates = set()
+
+        for meta in firms_cache.entries():
+            if sources and meta['source'] not in sources:
+                continue
+            window = FirmsWindow(meta['source'], date.fromisoformat(meta['start']), meta['days'])
+            window_end = window.start + timedelta(days=window.days - 1)
+            if window_end < start or window.start > end:
+                continue
+
+            text = firms_cache.load(meta['source'], meta['area'], meta['days'], window.start, ignore_ttl=True)
+            if text is None:
+                continue
+            _ingest_response(
+                FirmsResponse(window, 200, text, None),
+                max(start, window.start), min(end, window_end), stats, dates,
+            )
+            replayed += 1
+        if dates:
+            refresh_derived_data(dates)
+
+        self.stdout.write(
+            f"캐시 {replayed}개 재처리: 신규 {stats['inserted']}, 변경 {stats['updated']}, "
+            f"동일 {stats['unchanged']}, 제외 {stats['rejected']}, 실패 {stats['failed']}"
+        )
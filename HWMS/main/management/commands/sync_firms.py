@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.firms import FIRMS_SOURCES
+from main.sync import INITIAL_SYNC_DAYS, SYNC_INTERVAL, sync_source
+
+
+class Command(BaseCommand):
+    help = 'FIRMS 소스별로 마지막 관측 이후 자료만 주기적으로 받아 저장'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=SYNC_INTERVAL, help='동기화 주기 (초)')
+        parser.add_argument('--once', action='store_true', help='한 번만 동기화하고 종료')
+        parser.add_argument(
+            '--sources', default=','.join(FIRMS_SOURCES),
+            help='쉼표로 구분한 FIRMS 소스 (기본값: 전체)'
+        )
+        parser.add_argument(
+            '--initial-days', type=int, default=INITIAL_SYNC_DAYS,
+            help='처음 동기화하는 소스에서 가져올 일 수'
+        )
+
+    def handle(self, *args, **options):
+        sources = [s for s in options['sources'].split(',') if s]
+        unknown = [s for s in sources if s not in FIRMS_SOURCES]
+        if unknown:
+            raise CommandError(f"지원하지 않는 위성: {', '.join(unknown)}")
+
+        while True:
+            started = time.monotonic()
+            for source in sources:
+                try:
+                    result = sync_source(source, initial_days=options['initial_days'])
+                except Exception as e:
+                    self.stderr.write(f'{source} 동기화 실패: {e}')
+                    continue
+                self.stdout.write(
+                    f"{source} {result['start_date']} ~ {result['end_date']}: "
+                    f"신규 {result['inserted']}, 변경 {result['updated']}, "
+                    f"실패 {result['failed']} (기준 {result['high_water_mark'] or '-'})"
+                )
+
+            if options['once']:
+                return
+            time.sleep(max(0, options['interval'] - (time.monotonic() - started)))
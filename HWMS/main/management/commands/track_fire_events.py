@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from main.tracking import rebuild_fire_events, track_new_detections
+
+
+class Command(BaseCommand):
+    help = '아직 추적하지 않은 관측을 화재(fire_event)에 연결 (--rebuild 면 처음부터 다시 추적)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help='기존 추적 결과를 지우고 fire_detection 전체로 다시 추적',
+        )
+
+    def handle(self, *args, **options):
+        totals = rebuild_fire_events() if options['rebuild'] else track_new_detections()
+        self.stdout.write(
+            f"관측 {totals['tracked']}개 연결, 새 화재 {totals['created']}개, 합쳐진 화재 {totals['merged']}개"
+        )
@@ -0,0 +1,187 @@
+# main/metrics.py
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+# 지표는 프로세스 메모리에 쌓이므로 값은 프로세스별입니다. gunicorn 워커가 여럿이면
+# /metrics 를 긁을 때마다 요청을 받은 워커 하나의 값만 보이고, 워커가 재시작되면 0 부터 다시 셉니다.
+
+# 이름: (종류, 설명). 여기 없는 이름으로 기록하면 KeyError
+METRICS = {
+    'firms_fetch_seconds': ('histogram', 'FIRMS 창 하나를 내려받는 데 걸린 시간'),
+    'firms_fetch_bytes_total': ('counter', 'FIRMS 에서 받은 CSV 바이트 수'),
+    'firms_requests_total': ('counter', 'FIRMS HTTP 요청 수 (status 별)'),
+    'firms_cache_total': ('counter', 'FIRMS 디스크 캐시 조회 결과 (hit/miss)'),
+    'ingest_parse_seconds': ('histogram', 'FIRMS CSV 파싱 시간'),
+    'ingest_db_write_seconds': ('histogram', '화재 데이터 upsert 시간'),
+    'ingest_refresh_seconds': ('histogram', '수집 후 집계·이벤트·화재 추적 갱신 시간'),
+    'ingest_rows_total': ('counter', '수집한 행 수 (inserted/updated/unchanged/rejected)'),
+    'ingest_windows_total': ('counter', '처리한 FIRMS 창 수 (result 별)'),
+    'http_request_seconds': ('histogram', '뷰별 요청 처리 시간'),
+    'http_request_queries': ('histogram', '뷰별 요청당 DB 쿼리 수'),
+}
+
+# 시간(초)과 쿼리 수에 함께 쓰는 히스토그램 구간
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 100, 1000)
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+
+
+def _key(name, labels):
+    if name not in METRICS:
+        raise KeyError(f'등록되지 않은 지표: {name}')
+    return name, tuple(sorted(labels.items()))
+
+
+def inc(name, value=1, **labels):
+    """카운터 증가"""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, value, **labels):
+    """히스토그램에 값 하나 기록"""
+    key = _key(name, labels)
+    with _lock:
+        buckets, total, count = _histograms.get(key, ([0] * len(BUCKETS), 0.0, 0))
+        buckets = [n + (value <= bound) for n, bound in zip(buckets, BUCKETS)]
+        _histograms[key] = (buckets, total + value, count + 1)
+
+
+@contextmanager
+def timer(name, **labels):
+    """with 블록 실행 시간을 초 단위로 히스토그램에 기록"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, **labels)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def render():
+    """Prometheus 텍스트 형식으로 모든 지표 출력"""
+    with _lock:
+        counters = dict(_counters)
+        histograms = dict(_histograms)
+
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        if kind == 'counter':
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'{name}{_format_labels(labels)} {value}')
+        else:
+            for (metric, labels), (buckets, total, count) in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                for bound, n in zip(BUCKETS, buckets):
+                    lines.append(f'{name}_bucket{_format_labels(labels, [("le", bound)])} {n}')
+                lines.append(f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])} {count}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {total}')
+                lines.append(f'{name}_count{_format_labels(labels)} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+# 지금 요청의 쿼리 수 ([개수]). sync_to_async 로 넘어간 스레드에도 컨텍스트가 복사되므로
+# 비동기 뷰의 DB 쿼리도 같은 목록에 더해짐
+_query_count = contextvars.ContextVar('metrics_query_count', default=None)
+
+
+def _count_query(execute, sql, params, many, context):
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+    return execute(sql, params, many, context)
+
+
+def _install_query_counter(sender=None, connection=connection, **kwargs):
+    """
+    연결에 쿼리 수 집계 래퍼를 붙임
+
+    execute_wrapper() 는 부른 스레드의 연결에만 걸리므로, 비동기 뷰의 쿼리가 실행되는
+    다른 스레드의 연결에도 걸리도록 연결이 만들어질 때마다 붙여 둡니다.
+    """
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+connection_created.connect(_install_query_counter)
+
+
+class MetricsMiddleware:
+    """
+    main 앱 뷰의 처리 시간과 요청당 DB 쿼리 수를 기록하는 미들웨어
+
+    동기/비동기 양쪽에서 동작하므로 ASGI 에서도 비동기 뷰를 스레드로 바꾸지 않습니다.
+    쿼리 수는 컨텍스트 변수로 세므로 sync_to_async 로 실행한 비동기 뷰의 쿼리도 포함됩니다.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        # 미들웨어를 만들기 전에 이미 열린 이 스레드의 연결
+        _install_query_counter()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        counter = [0]
+        token = _query_count.set(counter)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _query_count.reset(token)
+        self._record(request, response, time.perf_counter() - started, counter[0])
+        return response
+
+    async def __acall__(self, request):
+        counter = [0]
+        token = _query_count.set(counter)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _query_count.reset(token)
+        self._record(request, response, time.perf_counter() - started, counter[0])
+        return response
+
+    def _record(self, request, response, elapsed, queries):
+        # 스트리밍 응답은 본문을 보내는 동안 실행되는 쿼리가 빠지므로 참고용
+        match = request.resolver_match
+        if match and match.func.__module__.startswith('main.'):
+            labels = {'view': match.url_name, 'method': request.method, 'status': response.status_code}
+            observe('http_request_seconds', elapsed, **labels)
+            observe('http_request_queries', queries, view=match.url_name)
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-17 12:00
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicates(apps, schema_editor):
+    """유니크 제약을 걸기 전에 자연 키가 겹치는 행은 가장 먼저 저장된 것만 남김"""
+    FireDetection = apps.get_model('main', 'FireDetection')
+    key = ('latitude', 'longitude', 'acq_date', 'acq_time', 'satellite')
+
+    keep_ids = (
+        FireDetection.objects.values(*key)
+        .annotate(keep_id=Min('id'))
+        .values_list('keep_id', flat=True)
+    )
+    FireDetection.objects.exclude(id__in=keep_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='firedetection',
+            constraint=models.UniqueConstraint(fields=('latitude', 'longitude', 'acq_date', 'acq_time', 'satellite'), name='fire_detection_natural_key'),
+        ),
+    ]
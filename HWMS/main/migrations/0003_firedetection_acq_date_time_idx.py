@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0002_firedetection_natural_key'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='firedetection',
+            index=models.Index(fields=['acq_date', 'acq_time'], name='fire_acq_date_time_idx'),
+        ),
+    ]
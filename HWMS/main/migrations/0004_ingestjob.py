@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0003_firedetection_acq_date_time_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('sources', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('queued', '대기'), ('running', '실행 중'), ('succeeded', '완료'), ('failed', '실패')], default='queued', max_length=10)),
+                ('done_windows', models.IntegerField(default=0)),
+                ('total_windows', models.IntegerField(default=0)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'ingest_job',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='ingest_job_status_idx')],
+            },
+        ),
+    ]
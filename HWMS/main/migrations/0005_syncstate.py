@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_ingestjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=30, unique=True)),
+                ('last_acq_date', models.DateField(blank=True, null=True)),
+                ('last_acq_time', models.CharField(blank=True, max_length=4)),
+                ('last_synced_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+            ],
+            options={
+                'db_table': 'sync_state',
+            },
+        ),
+    ]
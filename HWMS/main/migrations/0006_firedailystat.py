@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_syncstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FireDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('satellite', models.CharField(max_length=10)),
+                ('cell_lat', models.IntegerField()),
+                ('cell_lng', models.IntegerField()),
+                ('count', models.IntegerField()),
+                ('frp_sum', models.FloatField()),
+                ('frp_max', models.FloatField()),
+                ('low', models.IntegerField(default=0)),
+                ('nominal', models.IntegerField(default=0)),
+                ('high', models.IntegerField(default=0)),
+                ('day', models.IntegerField(default=0)),
+                ('night', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'fire_daily_stat',
+                'constraints': [models.UniqueConstraint(fields=('date', 'satellite', 'cell_lat', 'cell_lng'), name='fire_daily_stat_key')],
+            },
+        ),
+    ]
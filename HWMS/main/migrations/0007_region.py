@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_firedailystat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Region',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=20, unique=True)),
+                ('name', models.CharField(max_length=50)),
+                ('level', models.CharField(choices=[('sido', '시도'), ('sigungu', '시군구')], max_length=10)),
+                ('geometry', models.JSONField()),
+                ('min_lon', models.FloatField()),
+                ('min_lat', models.FloatField()),
+                ('max_lon', models.FloatField()),
+                ('max_lat', models.FloatField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'region',
+            },
+        ),
+        migrations.RemoveConstraint(
+            model_name='firedailystat',
+            name='fire_daily_stat_key',
+        ),
+        migrations.AddField(
+            model_name='region',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='children', to='main.region'),
+        ),
+        migrations.AddField(
+            model_name='firedailystat',
+            name='region',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='main.region'),
+        ),
+        migrations.AddField(
+            model_name='firedetection',
+            name='region',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='main.region'),
+        ),
+        migrations.AddConstraint(
+            model_name='firedailystat',
+            constraint=models.UniqueConstraint(fields=('date', 'satellite', 'cell_lat', 'cell_lng', 'region'), name='fire_daily_stat_key'),
+        ),
+    ]
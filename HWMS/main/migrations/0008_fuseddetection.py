@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_region'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FusedDetection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('acq_date', models.DateField()),
+                ('acq_time', models.CharField(max_length=4)),
+                ('satellite', models.CharField(max_length=50)),
+                ('confidence', models.CharField(max_length=1)),
+                ('frp', models.FloatField()),
+                ('bright_ti4', models.FloatField()),
+                ('member_count', models.IntegerField()),
+                ('region', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='main.region')),
+            ],
+            options={
+                'db_table': 'fused_detection',
+            },
+        ),
+        migrations.AddField(
+            model_name='firedetection',
+            name='fused',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='members', to='main.fuseddetection'),
+        ),
+        migrations.AddIndex(
+            model_name='fuseddetection',
+            index=models.Index(fields=['acq_date', 'acq_time'], name='fused_acq_date_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fuseddetection',
+            index=models.Index(fields=['latitude', 'longitude'], name='fused_lat_lng_idx'),
+        ),
+    ]
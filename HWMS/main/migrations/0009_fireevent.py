@@ -0,0 +1,64 @@
+# Generated by Django 5.2.8 on 2026-10-17 21:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_fuseddetection'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FireEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_seen', models.DateTimeField()),
+                ('last_seen', models.DateTimeField()),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('detection_count', models.IntegerField()),
+                ('frp_total', models.FloatField()),
+                ('max_frp', models.FloatField()),
+                ('hull', models.JSONField()),
+                ('area_km2', models.FloatField()),
+                ('perimeter_km', models.FloatField()),
+                ('spread_rate_kmh', models.FloatField(default=0)),
+                ('frp_trend', models.FloatField(default=0)),
+                ('merged_into', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='merged', to='main.fireevent')),
+                ('region', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='main.region')),
+            ],
+            options={
+                'db_table': 'fire_event',
+            },
+        ),
+        migrations.AddField(
+            model_name='firedetection',
+            name='event',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='detections', to='main.fireevent'),
+        ),
+        migrations.CreateModel(
+            name='FireEventPass',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('observed_at', models.DateTimeField()),
+                ('detection_count', models.IntegerField()),
+                ('frp_sum', models.FloatField()),
+                ('area_km2', models.FloatField()),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='passes', to='main.fireevent')),
+            ],
+            options={
+                'db_table': 'fire_event_pass',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='fireevent',
+            index=models.Index(fields=['last_seen'], name='fire_event_last_seen_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='fireeventpass',
+            constraint=models.UniqueConstraint(fields=('event', 'observed_at'), name='fire_event_pass_key'),
+        ),
+    ]
@@ -1,6 +1,4 @@
 from django.db import models
-import requests
-import pandas as pd
 
 class FireDetection(models.Model):
     latitude = models.FloatField()
@@ -17,9 +15,227 @@ class FireDetection(models.Model):
     bright_ti5 = models.FloatField()
     frp = models.FloatField()
     daynight = models.CharField(max_length=1)
+    # 수집할 때 좌표로 찾아 붙이는 가장 작은 행정구역 (시군구, 없으면 시도)
+    region = models.ForeignKey('Region', null=True, blank=True, on_delete=models.SET_NULL)
+    # 여러 위성의 중복 관측을 묶은 이벤트 (refresh_fused_events 가 구성 관측을 옮긴 뒤에 빈 이벤트를 지움)
+    fused = models.ForeignKey(
+        'FusedDetection', null=True, blank=True, on_delete=models.DO_NOTHING, related_name='members',
+    )
+    # 여러 위성 통과에 걸쳐 이어지는 화재 (main/tracking.py 가 아직 연결되지 않은 관측만 처리)
+    event = models.ForeignKey(
+        'FireEvent', null=True, blank=True, on_delete=models.DO_NOTHING, related_name='detections',
+    )
     
     class Meta:
         db_table = 'fire_detection'
+        constraints = [
+            # 같은 위성이 같은 위치·시각에 관측한 화재는 하나만 저장
+            models.UniqueConstraint(
+                fields=['latitude', 'longitude', 'acq_date', 'acq_time', 'satellite'],
+                name='fire_detection_natural_key',
+            ),
+        ]
+        indexes = [
+            # 날짜 범위 조회와 최신순 정렬용
+            # (위도·경도 bbox 조회는 위도, 경도로 시작하는 자연 키 인덱스를 사용)
+            models.Index(fields=['acq_date', 'acq_time'], name='fire_acq_date_time_idx'),
+        ]
     
     def __str__(self):
-        return f"Fire at ({self.latitude}, {self.longitude}) on {self.acq_date}"
\ No newline at end of file
+        return f"Fire at ({self.latitude}, {self.longitude}) on {self.acq_date}"
+
+class FusedDetection(models.Model):
+    """
+    여러 위성이 같은 날 가까운 위치·시각에 관측한 화재를 하나로 묶은 이벤트
+
+    조회 API 가 FireDetection 과 같은 필드 이름으로 다룰 수 있도록 값을 대표값으로 저장합니다.
+    """
+
+    latitude = models.FloatField()  # FRP 가중 평균 위치
+    longitude = models.FloatField()
+    acq_date = models.DateField()
+    acq_time = models.CharField(max_length=4)  # 가장 이른 관측 시각
+    satellite = models.CharField(max_length=50)  # 관측한 위성 목록 (쉼표 구분, 정렬됨)
+    confidence = models.CharField(max_length=1)  # 가장 높은 신뢰도
+    frp = models.FloatField()  # 가장 큰 FRP
+    bright_ti4 = models.FloatField()
+    member_count = models.IntegerField()
+    region = models.ForeignKey('Region', null=True, blank=True, on_delete=models.SET_NULL)
+
+    class Meta:
+        db_table = 'fused_detection'
+        indexes = [
+            models.Index(fields=['acq_date', 'acq_time'], name='fused_acq_date_time_idx'),
+            models.Index(fields=['latitude', 'longitude'], name='fused_lat_lng_idx'),
+        ]
+
+    def __str__(self):
+        return f"Fused fire at ({self.latitude}, {self.longitude}) on {self.acq_date} ({self.satellite})"
+
+
+class FireEvent(models.Model):
+    """
+    여러 위성 통과에 걸쳐 가까운 곳에서 이어지는 관측을 하나로 추적한 화재
+
+    값은 새 관측이 이어질 때마다 누적해서 갱신하므로 관측이 아카이브로 옮겨지거나
+    지워져도 그대로 남습니다. 두 화재가 이어지면 먼저 시작한 쪽으로 합치고
+    나머지는 merged_into 로 가리킵니다.
+    """
+
+    first_seen = models.DateTimeField()
+    last_seen = models.DateTimeField()
+    latitude = models.FloatField()  # 관측 평균 위치
+    longitude = models.FloatField()
+    detection_count = models.IntegerField()
+    frp_total = models.FloatField()
+    max_frp = models.FloatField()
+    hull = models.JSONField()  # 관측 위치의 볼록 껍질 꼭짓점 [[경도, 위도], ...]
+    area_km2 = models.FloatField()  # 껍질을 화소 반 폭만큼 넓힌 면적
+    perimeter_km = models.FloatField()
+    spread_rate_kmh = models.FloatField(default=0)  # 등가 반지름이 늘어난 평균 속도
+    frp_trend = models.FloatField(default=0)  # 최근 통과 회차 FRP 합의 기울기 (MW/시간)
+    region = models.ForeignKey('Region', null=True, blank=True, on_delete=models.SET_NULL)  # 가장 강한 관측의 구역
+    merged_into = models.ForeignKey(
+        'self', null=True, blank=True, on_delete=models.CASCADE, related_name='merged',
+    )
+
+    class Meta:
+        db_table = 'fire_event'
+        indexes = [
+            # 진행 중인 화재(최근 관측) 조회와 새 관측을 이을 후보 찾기용
+            models.Index(fields=['last_seen'], name='fire_event_last_seen_idx'),
+        ]
+
+    def __str__(self):
+        return f"FireEvent #{self.id} ({self.latitude:.3f}, {self.longitude:.3f}) {self.first_seen} ~ {self.last_seen}"
+
+
+class FireEventPass(models.Model):
+    """화재 하나의 통과 회차(1시간 단위)별 관측 수, FRP 합, 그때까지의 면적 - 성장 추이용"""
+
+    event = models.ForeignKey(FireEvent, on_delete=models.CASCADE, related_name='passes')
+    observed_at = models.DateTimeField()  # 회차 시작 시각 (UTC, 정시)
+    detection_count = models.IntegerField()
+    frp_sum = models.FloatField()
+    area_km2 = models.FloatField()  # 이 회차까지 관측을 모두 포함한 면적
+
+    class Meta:
+        db_table = 'fire_event_pass'
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'observed_at'], name='fire_event_pass_key'),
+        ]
+
+    def __str__(self):
+        return f"FireEvent #{self.event_id} {self.observed_at}: {self.detection_count}"
+
+
+class IngestJob(models.Model):
+    """백그라운드에서 실행되는 FIRMS 수집 작업"""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, '대기'),
+        (RUNNING, '실행 중'),
+        (SUCCEEDED, '완료'),
+        (FAILED, '실패'),
+    ]
+
+    start_date = models.DateField()
+    end_date = models.DateField()
+    sources = models.CharField(max_length=100)  # 쉼표로 구분한 FIRMS 소스 (정렬됨)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    done_windows = models.IntegerField(default=0)
+    total_windows = models.IntegerField(default=0)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'ingest_job'
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='ingest_job_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"IngestJob #{self.id} {self.start_date} ~ {self.end_date} ({self.status})"
+
+
+class SyncState(models.Model):
+    """FIRMS 소스별 자동 동기화 상태 (지금까지 저장한 가장 최근 관측 시각)"""
+
+    source = models.CharField(max_length=30, unique=True)  # FIRMS 소스 이름
+    last_acq_date = models.DateField(null=True, blank=True)
+    last_acq_time = models.CharField(max_length=4, blank=True)
+    last_synced_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        db_table = 'sync_state'
+
+    def __str__(self):
+        return f"{self.source} ~ {self.last_acq_date} {self.last_acq_time}"
+
+
+class FireDailyStat(models.Model):
+    """날짜 x 격자 칸 x 행정구역 x 위성별 화재 집계 (수집할 때마다 바뀐 날짜만 다시 계산)"""
+
+    date = models.DateField()
+    satellite = models.CharField(max_length=10)
+    # 격자 칸 번호: floor(위도 / STAT_CELL_SIZE), floor(경도 / STAT_CELL_SIZE)
+    cell_lat = models.IntegerField()
+    cell_lng = models.IntegerField()
+    region = models.ForeignKey('Region', null=True, blank=True, on_delete=models.SET_NULL)
+    count = models.IntegerField()
+    frp_sum = models.FloatField()
+    frp_max = models.FloatField()
+    low = models.IntegerField(default=0)
+    nominal = models.IntegerField(default=0)
+    high = models.IntegerField(default=0)
+    day = models.IntegerField(default=0)
+    night = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'fire_daily_stat'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'satellite', 'cell_lat', 'cell_lng', 'region'],
+                name='fire_daily_stat_key',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.satellite} ({self.cell_lat}, {self.cell_lng}): {self.count}"
+
+
+class Region(models.Model):
+    """행정구역 경계 (load_regions 명령으로 GeoJSON 에서 불러옴)"""
+
+    SIDO = 'sido'
+    SIGUNGU = 'sigungu'
+    LEVEL_CHOICES = [
+        (SIDO, '시도'),
+        (SIGUNGU, '시군구'),
+    ]
+
+    code = models.CharField(max_length=20, unique=True)  # 행정구역 코드
+    name = models.CharField(max_length=50)
+    level = models.CharField(max_length=10, choices=LEVEL_CHOICES)
+    parent = models.ForeignKey('self', null=True, blank=True, on_delete=models.CASCADE, related_name='children')
+    geometry = models.JSONField()  # GeoJSON Polygon / MultiPolygon (경도, 위도)
+    min_lon = models.FloatField()
+    min_lat = models.FloatField()
+    max_lon = models.FloatField()
+    max_lat = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'region'
+
+    def __str__(self):
+        return f"{self.name} ({self.code})"
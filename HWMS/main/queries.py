@@ -0,0 +1,290 @@
+# main/queries.py
+import base64
+from datetime import datetime
+
+import numpy as np
+
+from django.db.models import Avg, Count, F, Max, Q
+from django.db.models.functions import Floor
+
+from .models import FireDetection, FusedDetection
+from .regions import region_ids_for
+
+FIRE_FIELDS = (
+    'id',
+    'latitude',
+    'longitude',
+    'frp',
+    'bright_ti4',
+    'acq_date',
+    'acq_time',
+    'satellite',
+    'confidence'
+)
+# 최신순 + id 로 순서를 고정해야 커서 페이지네이션이 겹치거나 빠지지 않음
+FIRE_ORDERING = ('-acq_date', '-acq_time', '-id')
+
+CONFIDENCE_LEVELS = ('l', 'n', 'h')
+MAX_PAGE_SIZE = 5000
+# 이 줌 레벨 미만에서는 개별 화재 대신 격자 집계를 반환
+GRID_ZOOM_THRESHOLD = 7
+
+
+def parse_bbox(value):
+    """
+    'min_lon,min_lat,max_lon,max_lat' 문자열을 숫자 튜플로 변환 (FIRMS BBOX 와 같은 형식)
+
+    Raises:
+        ValueError: 형식이 잘못되었거나 범위가 뒤집힌 경우
+    """
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(v) for v in value.split(','))
+    except ValueError:
+        raise ValueError('bbox는 min_lon,min_lat,max_lon,max_lat 형식이어야 합니다.')
+
+    if min_lon > max_lon or min_lat > max_lat:
+        raise ValueError('bbox의 최솟값이 최댓값보다 클 수 없습니다.')
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def _parse_date(value, name):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f'{name}은(는) YYYY-MM-DD 형식이어야 합니다.')
+
+
+def filter_fires(params, queryset=None):
+    """
+    요청 파라미터로 화재 쿼리셋 필터링
+
+    Args:
+        params: request.GET 같은 dict
+            start_date, end_date: 날짜 범위 (YYYY-MM-DD)
+            bbox: min_lon,min_lat,max_lon,max_lat
+            min_confidence: l / n / h (이 등급 이상)
+            min_frp: 최소 FRP (MW)
+            satellite: 위성 값 목록 (쉼표 구분, 예: N20,N) - 이벤트는 구성 관측 중 하나라도 해당하면 포함
+            region: 행정구역 코드 목록 (쉼표 구분, 시도 코드면 하위 시군구 포함)
+        queryset: 필터를 적용할 기본 쿼리셋 (FireDetection 또는 FusedDetection)
+
+    Raises:
+        ValueError: 파라미터 값이 잘못된 경우
+    """
+    fires = FireDetection.objects.all() if queryset is None else queryset
+
+    start_date = params.get('start_date')
+    end_date = params.get('end_date')
+    if start_date:
+        fires = fires.filter(acq_date__gte=_parse_date(start_date, 'start_date'))
+    if end_date:
+        fires = fires.filter(acq_date__lte=_parse_date(end_date, 'end_date'))
+
+    bbox = params.get('bbox')
+    if bbox:
+        min_lon, min_lat, max_lon, max_lat = parse_bbox(bbox)
+        fires = fires.filter(
+            latitude__range=(min_lat, max_lat),
+            longitude__range=(min_lon, max_lon),
+        )
+
+    min_confidence = params.get('min_confidence')
+    if min_confidence:
+        if min_confidence not in CONFIDENCE_LEVELS:
+            raise ValueError('min_confidence는 l, n, h 중 하나여야 합니다.')
+        levels = CONFIDENCE_LEVELS[CONFIDENCE_LEVELS.index(min_confidence):]
+        fires = fires.filter(confidence__in=levels)
+
+    min_frp = params.get('min_frp')
+    if min_frp:
+        try:
+            fires = fires.filter(frp__gte=float(min_frp))
+        except ValueError:
+            raise ValueError('min_frp는 숫자여야 합니다.')
+
+    satellite = params.get('satellite')
+    if satellite:
+        satellites = [s for s in satellite.split(',') if s]
+        if fires.model is FusedDetection:
+            members = FireDetection.objects.filter(satellite__in=satellites).values('fused_id')
+            fires = fires.filter(id__in=members)
+        else:
+            fires = fires.filter(satellite__in=satellites)
+
+    region = params.get('region')
+    if region:
+        # 코드를 먼저 id 로 바꿔 두면 화재 쪽은 region_id 인덱스만 조회
+        fires = fires.filter(region_id__in=region_ids_for([r for r in region.split(',') if r]))
+
+    return fires
+
+
+def encode_cursor(fire):
+    """마지막 행의 (acq_date, acq_time, id) 를 다음 페이지 커서 문자열로 변환"""
+    raw = f"{fire['acq_date']}|{fire['acq_time']}|{fire['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        acq_date, acq_time, fire_id = base64.urlsafe_b64decode(padded).decode().split('|')
+        return _parse_date(acq_date, 'cursor'), acq_time, int(fire_id)
+    except ValueError:
+        raise ValueError('cursor 값이 올바르지 않습니다.')
+
+
+def _parse_limit(limit):
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise ValueError('limit은 정수여야 합니다.')
+    if not 0 < limit <= MAX_PAGE_SIZE:
+        raise ValueError(f'limit은 1 이상 {MAX_PAGE_SIZE} 이하여야 합니다.')
+    return limit
+
+
+def _keyset_page(fires, limit, cursor):
+    """limit 검사와 커서 조건을 적용한 한 페이지 쿼리셋 (DB 는 아직 조회하지 않음)"""
+    limit = _parse_limit(limit)
+
+    if cursor:
+        acq_date, acq_time, fire_id = decode_cursor(cursor)
+        fires = fires.filter(
+            Q(acq_date__lt=acq_date)
+            | Q(acq_date=acq_date, acq_time__lt=acq_time)
+            | Q(acq_date=acq_date, acq_time=acq_time, id__lt=fire_id)
+        )
+    return fires[:limit], limit
+
+
+def paginate(fires, limit, cursor=None):
+    """
+    (acq_date, acq_time, id) 키셋 기준으로 한 페이지를 잘라냄
+
+    OFFSET 없이 마지막 행 다음부터 인덱스 범위로 이어서 읽으므로 뒤쪽 페이지도
+    첫 페이지와 같은 비용으로 조회됩니다.
+
+    Args:
+        fires: FIRE_ORDERING 으로 정렬된 values() 쿼리셋
+        limit: 페이지 크기
+        cursor: 이전 응답의 다음 페이지 커서
+
+    Returns:
+        tuple: (행 목록, 다음 페이지 커서 또는 None)
+    """
+    page, limit = _keyset_page(fires, limit, cursor)
+    page = list(page)
+    next_cursor = encode_cursor(page[-1]) if len(page) == limit else None
+    return page, next_cursor
+
+
+async def apaginate(fires, limit, cursor=None):
+    """paginate 의 비동기 버전 (비동기 뷰에서 사용)"""
+    page, limit = _keyset_page(fires, limit, cursor)
+    page = [fire async for fire in page]
+    next_cursor = encode_cursor(page[-1]) if len(page) == limit else None
+    return page, next_cursor
+
+
+_SORT_KEY_INDEXES = tuple(FIRE_FIELDS.index(field) for field in ('acq_date', 'acq_time', 'id'))
+
+
+def row_sort_key(row):
+    """FIRE_FIELDS 순서 행의 (acq_date, acq_time, id) - reverse=True 로 정렬하면 FIRE_ORDERING 과 같음"""
+    return tuple(row[i] for i in _SORT_KEY_INDEXES)
+
+
+def paginate_rows(rows, limit, cursor=None):
+    """
+    FIRE_ORDERING 순으로 정렬된 행 목록(FIRE_FIELDS 순서 튜플)에 paginate 와 같은 키셋 규칙 적용
+
+    Returns:
+        tuple: (dict 행 목록, 다음 페이지 커서 또는 None)
+    """
+    limit = _parse_limit(limit)
+    if cursor:
+        after = decode_cursor(cursor)
+        rows = [row for row in rows if row_sort_key(row) < after]
+
+    page = [dict(zip(FIRE_FIELDS, row)) for row in rows[:limit]]
+    next_cursor = encode_cursor(page[-1]) if len(page) == limit else None
+    return page, next_cursor
+
+
+def grid_cells(fires, zoom):
+    """
+    줌 레벨에 맞는 격자 칸별로 화재를 DB에서 집계
+
+    격자 한 칸은 화면에서 약 64px 크기입니다 (줌 z 에서 90 / 2^z 도).
+
+    Returns:
+        list: 칸별 중심, 개수, 신뢰도별 개수, FRP 통계 dict 목록
+    """
+    size = 90 / 2 ** zoom
+
+    cells = (
+        fires.order_by()
+        .annotate(
+            cell_y=Floor(F('latitude') / size),
+            cell_x=Floor(F('longitude') / size),
+        )
+        .values('cell_y', 'cell_x')
+        .annotate(
+            count=Count('id'),
+            center_lat=Avg('latitude'),
+            center_lng=Avg('longitude'),
+            max_frp=Max('frp'),
+            mean_frp=Avg('frp'),
+            high=Count('id', filter=Q(confidence='h')),
+            nominal=Count('id', filter=Q(confidence='n')),
+            low=Count('id', filter=Q(confidence='l')),
+        )
+    )
+
+    return [
+        {key: value for key, value in cell.items() if key not in ('cell_y', 'cell_x')}
+        for cell in cells
+    ]
+
+
+def grid_cells_from_rows(rows, zoom):
+    """grid_cells 와 같은 집계를 FIRE_FIELDS 순서 행 목록(아카이브와 합친 결과)으로 계산"""
+    if not rows:
+        return []
+    size = 90 / 2 ** zoom
+
+    columns = dict(zip(FIRE_FIELDS, zip(*rows)))
+    lats = np.array(columns['latitude'], dtype='float64')
+    lons = np.array(columns['longitude'], dtype='float64')
+    frp = np.array(columns['frp'], dtype='float64')
+    confidence = np.array(columns['confidence'])
+
+    keys = np.stack([np.floor(lats / size), np.floor(lons / size)], axis=1)
+    _, cell, count = np.unique(keys, axis=0, return_inverse=True, return_counts=True)
+    cell = cell.ravel()
+    n = len(count)
+
+    max_frp = np.full(n, -np.inf)
+    np.maximum.at(max_frp, cell, frp)
+    levels = {
+        level: np.bincount(cell, confidence == level, n).astype(int)
+        for level in ('h', 'n', 'l')
+    }
+    center_lat = np.bincount(cell, lats, n) / count
+    center_lng = np.bincount(cell, lons, n) / count
+    mean_frp = np.bincount(cell, frp, n) / count
+
+    return [
+        {
+            'count': int(count[i]),
+            'center_lat': float(center_lat[i]),
+            'center_lng': float(center_lng[i]),
+            'max_frp': float(max_frp[i]),
+            'mean_frp': float(mean_frp[i]),
+            'high': int(levels['h'][i]),
+            'nominal': int(levels['n'][i]),
+            'low': int(levels['l'][i]),
+        }
+        for i in range(n)
+    ]
@@ -0,0 +1,242 @@
+# main/regions.py
+import threading
+
+import numpy as np
+from django.db.models import Count, Max, Q
+
+from .models import FireDetection, Region
+
+# 격자 색인 칸 크기 (도). 0.05도는 한국 위도에서 약 5km
+INDEX_CELL_SIZE = 0.05
+# 점 x 변 비교 행렬이 너무 커지지 않도록 나눠서 계산
+PIP_CHUNK = 2_000_000
+
+# 칸 번호 (행, 열) 를 정수 키 하나로 합칠 때 쓰는 열 범위
+_KEY_STRIDE = 1 << 20
+
+
+def _rings(geometry):
+    """GeoJSON Polygon / MultiPolygon 의 모든 고리(외곽선과 구멍)를 (n, 2) 배열로"""
+    if geometry['type'] == 'Polygon':
+        polygons = [geometry['coordinates']]
+    elif geometry['type'] == 'MultiPolygon':
+        polygons = geometry['coordinates']
+    else:
+        raise ValueError(f"지원하지 않는 geometry 타입: {geometry['type']}")
+    return [np.asarray(ring, dtype='float64')[:, :2] for polygon in polygons for ring in polygon]
+
+
+def geometry_bounds(geometry):
+    """GeoJSON geometry 의 (min_lon, min_lat, max_lon, max_lat)"""
+    points = np.concatenate(_rings(geometry))
+    return (
+        float(points[:, 0].min()), float(points[:, 1].min()),
+        float(points[:, 0].max()), float(points[:, 1].max()),
+    )
+
+
+def _edges(rings):
+    """고리 목록을 변 배열 (x1, y1, x2, y2) 로 변환"""
+    starts = np.concatenate([ring for ring in rings])
+    ends = np.concatenate([np.roll(ring, -1, axis=0) for ring in rings])
+    return starts[:, 0], starts[:, 1], ends[:, 0], ends[:, 1]
+
+
+def points_in_polygon(lons, lats, edges):
+    """
+    짝홀 규칙 광선 투사로 점들이 다각형 안에 있는지 벡터 연산으로 판정
+
+    구멍과 MultiPolygon 도 모든 고리의 변을 한꺼번에 세면 그대로 처리됩니다.
+
+    Returns:
+        ndarray: bool 배열
+    """
+    x1, y1, x2, y2 = edges
+    inside = np.zeros(len(lons), dtype=bool)
+    step = max(1, PIP_CHUNK // max(1, len(x1)))
+
+    for i in range(0, len(lons), step):
+        x = lons[i:i + step, None]
+        y = lats[i:i + step, None]
+        crosses = (y1 > y) != (y2 > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+        inside[i:i + step] = np.count_nonzero(crosses & (x < x_cross), axis=1) % 2 == 1
+    return inside
+
+
+def _cell_keys(lons, lats, size=INDEX_CELL_SIZE):
+    rows = np.floor(np.asarray(lats) / size).astype('int64')
+    cols = np.floor(np.asarray(lons) / size).astype('int64')
+    return rows * _KEY_STRIDE + cols
+
+
+class RegionIndex:
+    """
+    행정구역 다각형에 대한 격자 색인
+
+    만들 때 각 다각형이 걸친 격자 칸을 '경계 칸' (변이 지나감) 과 '내부 칸' (칸 전체가
+    다각형 안) 으로 나눠 둡니다. 조회할 때 내부 칸의 점은 키 검색만으로 구역이 정해지고,
+    경계 칸의 점만 그 칸에 걸친 다각형과 광선 투사로 비교합니다.
+    """
+
+    def __init__(self, regions, cell_size=INDEX_CELL_SIZE):
+        """
+        Args:
+            regions: (region_id, GeoJSON geometry) 목록
+            cell_size: 격자 칸 크기 (도)
+        """
+        self.cell_size = cell_size
+        self.region_ids = []
+        self.edges = []
+        self.boundary_keys = []
+        inside = {}
+
+        for region_id, geometry in regions:
+            rings = _rings(geometry)
+            edges = _edges(rings)
+            boundary = self._boundary_keys(edges)
+
+            # bbox 안에서 경계가 아닌 칸은 칸 중심 하나로 안/밖이 정해짐
+            points = np.concatenate(rings)
+            row0, col0 = np.floor(points[:, 1].min() / cell_size), np.floor(points[:, 0].min() / cell_size)
+            row1, col1 = np.floor(points[:, 1].max() / cell_size), np.floor(points[:, 0].max() / cell_size)
+            rows, cols = np.meshgrid(np.arange(row0, row1 + 1), np.arange(col0, col1 + 1), indexing='ij')
+            keys = rows.ravel().astype('int64') * _KEY_STRIDE + cols.ravel().astype('int64')
+            candidates = ~np.isin(keys, boundary)
+            centers_lat = (rows.ravel()[candidates] + 0.5) * cell_size
+            centers_lon = (cols.ravel()[candidates] + 0.5) * cell_size
+            for key in keys[candidates][points_in_polygon(centers_lon, centers_lat, edges)]:
+                inside[int(key)] = region_id
+
+            self.region_ids.append(region_id)
+            self.edges.append(edges)
+            self.boundary_keys.append(boundary)
+
+        self.inside_keys = np.array(sorted(inside), dtype='int64')
+        self.inside_ids = np.array([inside[key] for key in self.inside_keys], dtype='int64')
+
+    def _boundary_keys(self, edges):
+        """변이 지나가는 격자 칸 키 (변의 bbox 가 걸친 칸, 조금 넉넉하게 잡음)"""
+        x1, y1, x2, y2 = edges
+        size = self.cell_size
+        col0 = np.floor(np.minimum(x1, x2) / size).astype('int64')
+        col1 = np.floor(np.maximum(x1, x2) / size).astype('int64')
+        row0 = np.floor(np.minimum(y1, y2) / size).astype('int64')
+        row1 = np.floor(np.maximum(y1, y2) / size).astype('int64')
+
+        single = (col0 == col1) & (row0 == row1)
+        keys = [row0[single] * _KEY_STRIDE + col0[single]]
+        for r0, r1, c0, c1 in zip(row0[~single], row1[~single], col0[~single], col1[~single]):
+            rows, cols = np.meshgrid(np.arange(r0, r1 + 1), np.arange(c0, c1 + 1), indexing='ij')
+            keys.append((rows * _KEY_STRIDE + cols).ravel())
+        return np.unique(np.concatenate(keys))
+
+    def lookup(self, lons, lats):
+        """
+        좌표 배열을 구역 id 배열로 변환
+
+        Returns:
+            ndarray: int64 구역 id (어느 구역에도 속하지 않으면 0)
+        """
+        lons = np.asarray(lons, dtype='float64')
+        lats = np.asarray(lats, dtype='float64')
+        keys = _cell_keys(lons, lats, self.cell_size)
+        result = np.zeros(len(keys), dtype='int64')
+
+        if len(self.inside_keys):
+            pos = np.searchsorted(self.inside_keys, keys).clip(max=len(self.inside_keys) - 1)
+            hit = self.inside_keys[pos] == keys
+            result[hit] = self.inside_ids[pos[hit]]
+
+        for region_id, edges, boundary in zip(self.region_ids, self.edges, self.boundary_keys):
+            candidates = np.flatnonzero((result == 0) & np.isin(keys, boundary))
+            if len(candidates):
+                inside = points_in_polygon(lons[candidates], lats[candidates], edges)
+                result[candidates[inside]] = region_id
+        return result
+
+
+_index_lock = threading.Lock()
+_index = None
+_index_version = None
+
+
+def get_region_index():
+    """
+    가장 작은 단위 구역(하위 구역이 없는 구역)으로 만든 색인
+
+    구역 테이블이 바뀌면 (개수, 최대 id, 마지막 수정 시각이 달라지면) 다시 만듭니다.
+    구역이 하나도 없으면 None.
+    """
+    global _index, _index_version
+
+    leaves = Region.objects.annotate(child_count=Count('children')).filter(child_count=0)
+    version = leaves.aggregate(count=Count('id'), max_id=Max('id'), updated_at=Max('updated_at'))
+    if not version['count']:
+        return None
+
+    with _index_lock:
+        if _index is None or _index_version != version:
+            _index = RegionIndex(leaves.values_list('id', 'geometry'))
+            _index_version = version
+        return _index
+
+
+def assign_regions(lons, lats):
+    """
+    좌표 배열에 구역 id 를 붙임
+
+    Returns:
+        ndarray: int64 구역 id (구역 테이블이 비었거나 구역 밖이면 0)
+    """
+    index = get_region_index()
+    if index is None:
+        return np.zeros(len(lons), dtype='int64')
+    return index.lookup(lons, lats)
+
+
+def restamp_regions(chunk_size=20_000):
+    """
+    저장된 모든 화재의 구역을 다시 계산 (구역을 새로 불러온 뒤 실행)
+
+    Returns:
+        int: 구역이 바뀐 화재 수
+    """
+    changed = 0
+    last_id = 0
+    while True:
+        rows = list(
+            FireDetection.objects.filter(id__gt=last_id).order_by('id')
+            .values_list('id', 'longitude', 'latitude', 'region_id')[:chunk_size]
+        )
+        if not rows:
+            return changed
+        last_id = rows[-1][0]
+
+        ids, lons, lats, current = (np.array(column) for column in zip(*rows))
+        current = np.array([value or 0 for value in current], dtype='int64')
+        regions = assign_regions(lons.astype('float64'), lats.astype('float64'))
+
+        diff = regions != current
+        for region_id in np.unique(regions[diff]):
+            target = ids[diff & (regions == region_id)].tolist()
+            FireDetection.objects.filter(id__in=target).update(region_id=int(region_id) or None)
+        changed += int(diff.sum())
+
+
+def region_ids_for(codes):
+    """
+    구역 코드 목록을 그 구역과 하위 구역의 id 목록으로 변환 (시도 코드면 시군구 전체 포함)
+
+    Raises:
+        ValueError: 없는 코드가 있는 경우
+    """
+    regions = list(
+        Region.objects.filter(Q(code__in=codes) | Q(parent__code__in=codes))
+        .values_list('id', 'code')
+    )
+    missing = set(codes) - {code for _, code in regions}
+    if missing:
+        raise ValueError(f"알 수 없는 region 코드: {', '.join(sorted(missing))}")
+    return [region_id for region_id, _ in regions]
@@ -0,0 +1,177 @@
+# main/stats.py
+import math
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum
+from django.db.models.functions import Floor
+
+from . import archive
+from .caching import bump_data_version, bump_day_versions
+from .models import FireDailyStat, FireDetection
+from .queries import _parse_date, parse_bbox
+from .regions import region_ids_for
+
+# 집계 격자 칸 크기 (도). 0.1도는 한국 위도에서 약 10km
+STAT_CELL_SIZE = 0.1
+STAT_GROUPS = ('date', 'satellite', 'cell', 'region')
+STAT_FIELDS = ('count', 'frp_sum', 'frp_max', 'low', 'nominal', 'high', 'day', 'night')
+
+
+def refresh_daily_stats(dates):
+    """
+    주어진 날짜의 집계를 fire_detection 에서 다시 계산
+
+    수집은 며칠치씩 들어오므로 바뀐 날짜 전체를 지우고 새로 넣는 편이
+    행 단위로 증감을 맞추는 것보다 단순하고 항상 원본과 일치합니다.
+    다시 계산한 날짜의 타일 캐시 버전도 함께 올립니다.
+
+    Args:
+        dates: 다시 계산할 날짜 목록 (date)
+
+    Returns:
+        int: 저장한 집계 행 수
+    """
+    dates = sorted(set(dates))
+    if not dates:
+        return 0
+
+    rows = (
+        FireDetection.objects.filter(acq_date__in=dates)
+        .order_by()
+        .annotate(
+            cell_lat=Floor(F('latitude') / STAT_CELL_SIZE),
+            cell_lng=Floor(F('longitude') / STAT_CELL_SIZE),
+        )
+        .values('acq_date', 'satellite', 'cell_lat', 'cell_lng', 'region_id')
+        .annotate(
+            count=Count('id'),
+            frp_sum=Sum('frp'),
+            frp_max=Max('frp'),
+            low=Count('id', filter=Q(confidence='l')),
+            nominal=Count('id', filter=Q(confidence='n')),
+            high=Count('id', filter=Q(confidence='h')),
+            day=Count('id', filter=Q(daynight='D')),
+            night=Count('id', filter=Q(daynight='N')),
+        )
+    )
+    stats = [
+        FireDailyStat(
+            date=row['acq_date'],
+            satellite=row['satellite'],
+            cell_lat=int(row['cell_lat']),
+            cell_lng=int(row['cell_lng']),
+            region_id=row['region_id'],
+            **{field: row[field] for field in STAT_FIELDS},
+        )
+        for row in rows
+    ]
+
+    with transaction.atomic():
+        FireDailyStat.objects.filter(date__in=dates).delete()
+        FireDailyStat.objects.bulk_create(stats, batch_size=1000)
+    bump_day_versions(dates)
+    return len(stats)
+
+
+def rebuild_daily_stats(days_per_batch=30):
+    """
+    fire_detection 전체로 일별 집계를 다시 계산 (집계 방식이나 구역이 바뀐 뒤 실행)
+
+    아카이브로 옮긴 날짜는 원본이 DB 에 없으므로 기존 집계를 그대로 둡니다.
+
+    Returns:
+        tuple: (날짜 수, 집계 행 수)
+    """
+    dates = sorted(FireDetection.objects.order_by().values_list('acq_date', flat=True).distinct())
+    keep = set(dates) | set(archive.archived_dates())
+    FireDailyStat.objects.exclude(date__in=keep).delete()
+
+    total = 0
+    for i in range(0, len(dates), days_per_batch):
+        total += refresh_daily_stats(dates[i:i + days_per_batch])
+    bump_data_version()
+    return len(dates), total
+
+
+def filter_stats(params):
+    """
+    요청 파라미터로 집계 쿼리셋 필터링 (start_date, end_date, bbox, satellite, region)
+
+    bbox 는 격자 칸 단위로 적용되므로 경계에 걸친 칸은 통째로 포함됩니다.
+
+    Raises:
+        ValueError: 파라미터 값이 잘못된 경우
+    """
+    stats = FireDailyStat.objects.all()
+
+    if params.get('start_date'):
+        stats = stats.filter(date__gte=_parse_date(params['start_date'], 'start_date'))
+    if params.get('end_date'):
+        stats = stats.filter(date__lte=_parse_date(params['end_date'], 'end_date'))
+
+    if params.get('bbox'):
+        min_lon, min_lat, max_lon, max_lat = parse_bbox(params['bbox'])
+        stats = stats.filter(
+            cell_lat__range=(math.floor(min_lat / STAT_CELL_SIZE), math.floor(max_lat / STAT_CELL_SIZE)),
+            cell_lng__range=(math.floor(min_lon / STAT_CELL_SIZE), math.floor(max_lon / STAT_CELL_SIZE)),
+        )
+
+    satellite = params.get('satellite')
+    if satellite:
+        stats = stats.filter(satellite__in=[s for s in satellite.split(',') if s])
+
+    region = params.get('region')
+    if region:
+        stats = stats.filter(region_id__in=region_ids_for([r for r in region.split(',') if r]))
+
+    return stats
+
+
+def _summary(row):
+    """합계 dict 에 평균 FRP 를 붙이고 빈 값은 0 으로"""
+    summary = {field: row.get(f'sum_{field}') or 0 for field in STAT_FIELDS}
+    summary['mean_frp'] = summary['frp_sum'] / summary['count'] if summary['count'] else 0
+    return summary
+
+
+def summarize_stats(stats, group_by='date'):
+    """
+    집계 행을 다시 묶어 전체 합계와 그룹별 합계를 계산
+
+    Args:
+        stats: filter_stats 결과
+        group_by: date / satellite / cell / region
+
+    Returns:
+        dict: {'total': 합계, 'rows': 그룹별 합계 목록}
+
+    Raises:
+        ValueError: group_by 값이 잘못된 경우
+    """
+    if group_by not in STAT_GROUPS:
+        raise ValueError(f"group_by는 {', '.join(STAT_GROUPS)} 중 하나여야 합니다.")
+
+    # 모델 필드와 같은 이름으로는 annotate 할 수 없어 접두사를 붙임
+    sums = {
+        f'sum_{field}': Max(field) if field == 'frp_max' else Sum(field)
+        for field in STAT_FIELDS
+    }
+    keys = {
+        'cell': ('cell_lat', 'cell_lng'),
+        'region': ('region__code', 'region__name'),
+    }.get(group_by, (group_by,))
+
+    rows = []
+    for row in stats.order_by().values(*keys).annotate(**sums).order_by(*keys):
+        item = _summary(row)
+        if group_by == 'cell':
+            item['center_lat'] = (row['cell_lat'] + 0.5) * STAT_CELL_SIZE
+            item['center_lng'] = (row['cell_lng'] + 0.5) * STAT_CELL_SIZE
+        elif group_by == 'region':
+            item['region'] = row['region__code']
+            item['region_name'] = row['region__name']
+        else:
+            item[group_by] = str(row[group_by])
+        rows.append(item)
+
+    return {'total': _summary(stats.aggregate(**sums)), 'rows': rows}
@@ -0,0 +1,66 @@
+# main/sync.py
+from datetime import datetime, timedelta, timezone
+
+from django.utils import timezone as django_timezone
+
+from .api import _ingest_response, refresh_derived_data
+from .firms import split_windows, fetch_windows
+from .models import SyncState
+
+# 상태가 없는 소스를 처음 동기화할 때 가져올 일 수
+INITIAL_SYNC_DAYS = 7
+# 자동 동기화 주기 (초). FIRMS NRT 자료는 위성 통과 후 수십 분~몇 시간 뒤에 올라옴
+SYNC_INTERVAL = 5 * 60
+
+
+def sync_source(source, today=None, initial_days=INITIAL_SYNC_DAYS):
+    """
+    소스 하나를 마지막으로 저장한 관측일부터 오늘까지만 받아 저장
+
+    FIRMS 는 날짜 단위로만 조회되므로 마지막 관측일을 다시 포함해 요청하고,
+    이미 있는 행은 upsert 에서 '변경 없음' 으로 건너뜁니다. 요청한 창이 하나라도
+    실패하면 빠진 자료를 다음 주기에 다시 받도록 기준 시각을 올리지 않습니다.
+
+    Args:
+        source: FIRMS 소스 이름
+        today: 기준 날짜 (UTC, 기본값은 오늘)
+        initial_days: 상태가 없을 때 가져올 일 수
+
+    Returns:
+        dict: 수집 결과 개수와 요청 범위, 갱신된 기준 시각
+    """
+    # FIRMS 의 acq_date 는 UTC 기준
+    today = today or datetime.now(timezone.utc).date()
+    state, _ = SyncState.objects.get_or_create(source=source)
+
+    start = state.last_acq_date or today - timedelta(days=initial_days - 1)
+    windows = split_windows(start, today, [source])
+    stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'rejected': 0, 'failed': 0}
+
+    latest = (state.last_acq_date, state.last_acq_time) if state.last_acq_date else None
+    dates = set()
+    # 캐시 TTL(NRT_TTL)이 동기화 주기보다 길어 캐시를 읽으면 새 관측을 놓치므로 최근 창은 새로 받음
+    for result in fetch_windows(windows, refresh=True):
+        fires = _ingest_response(result, start, today, stats, dates)
+        if fires is not None:
+            newest = max(zip(fires['acq_date'], fires['acq_time']))
+            latest = max(latest, newest) if latest else newest
+    if dates:
+        refresh_derived_data(dates)
+
+    if stats['failed']:
+        state.last_error = f"{stats['failed']}개 요청 실패"
+    else:
+        state.last_error = ''
+        if latest:
+            state.last_acq_date, state.last_acq_time = latest
+    state.last_synced_at = django_timezone.now()
+    state.save()
+
+    return {
+        **stats,
+        'source': source,
+        'start_date': str(start),
+        'end_date': str(today),
+        'high_water_mark': f"{state.last_acq_date} {state.last_acq_time}".strip(),
+    }
@@ -1,4 +1,1267 @@
-from django.test import TestCase
+import gzip
+import json
+import math
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from datetime import date, timedelta
 
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from . import api, archive, bench, bulkio, firms, firms_cache, jobs, metrics, sync, tiles
+from .api import FIRE_COLUMNS, parse_firms_csv, upsert_fire_detections
+from .caching import bump_data_version
+from .clustering import EARTH_RADIUS_KM, cluster_fires
+from .fusion import refresh_fused_events
+from .models import (
+    FireDailyStat, FireDetection, FireEvent, FusedDetection, IngestJob, Region, SyncState,
+)
+from .queries import FIRE_FIELDS, FIRE_ORDERING, filter_fires
+from .regions import RegionIndex, _edges, _rings, points_in_polygon
+from .stats import rebuild_daily_stats, refresh_daily_stats
+
+
+class ClusterFiresTests(SimpleTestCase):
+    """반경 안의 화재를 앞에서부터 흡수하는 규칙이 fire_map.html 의 clusterFires() 와 같은지 확인"""
+
+    def fire(self, fire_id, latitude, longitude, frp=10.0, confidence='n', acq_time='0418'):
+        return {
+            'id': fire_id, 'latitude': latitude, 'longitude': longitude, 'frp': frp,
+            'bright_ti4': 330.0, 'acq_date': '2025-04-01', 'acq_time': acq_time,
+            'satellite': 'N20', 'confidence': confidence,
+        }
+
+    def test_radius_merges_nearby_fires(self):
+        fires = [
+            self.fire(1, 36.50, 128.50, frp=10.0, acq_time='0418'),
+            self.fire(2, 36.53, 128.50, frp=30.0, confidence='h', acq_time='1630'),
+            # 약 55km 떨어진 다른 화재
+            self.fire(3, 37.00, 128.50),
+        ]
+        clusters = cluster_fires(fires, radius_km=10)
+
+        self.assertEqual([c['fire_ids'] for c in clusters], [[1, 2], [3]])
+        self.assertEqual(clusters[0]['max_confidence'], 'h')
+        self.assertEqual(clusters[0]['mean_frp'], 20.0)
+        self.assertEqual(clusters[0]['latest_time'], '1630')
+        self.assertAlmostEqual(clusters[0]['center_lat'], 36.515)
+        self.assertEqual([c['fire_ids'] for c in cluster_fires(fires, radius_km=1)], [[1], [2], [3]])
+
+    def test_merge_is_not_transitive(self):
+        # 2 는 1 과 3 모두에서 약 8km 이지만 1 과 3 은 약 16km - 1 이 2 를 흡수하면 3 은 따로 남음
+        fires = [self.fire(1, 36.500, 128.5), self.fire(2, 36.572, 128.5), self.fire(3, 36.644, 128.5)]
+
+        self.assertEqual([c['fire_ids'] for c in cluster_fires(fires, radius_km=10)], [[1, 2], [3]])
+        self.assertEqual(cluster_fires([], radius_km=10), [])
+
+    def test_fires_just_inside_radius_are_merged_at_any_cell_offset(self):
+        # 9.999km 떨어진 두 화재를 격자 한 칸(약 0.09도) 이상에 걸쳐 조금씩 옮기며 확인
+        step = 9.999 / (EARTH_RADIUS_KM * math.pi / 180)
+        for k in range(5000):
+            start = 36.5 + k * 0.00002
+            fires = [self.fire(1, start, 128.5), self.fire(2, start + step, 128.5)]
+            self.assertEqual(len(cluster_fires(fires, radius_km=10)), 1, start)
+
+
+VIIRS_CSV_HEADER = (
+    'latitude,longitude,bright_ti4,scan,track,acq_date,acq_time,satellite,'
+    'instrument,confidence,version,bright_ti5,frp,daynight\n'
+)
+
+
+class FakeClock:
+    """time.monotonic / time.sleep 대역 (sleep 하면 시계만 앞으로 감)"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@override_settings(FIRMS_CACHE_MODE='off')
+class FirmsFetchTests(SimpleTestCase):
+    """일시적인 오류는 백오프로 재시도하고, 호출 수 제한을 넘으면 기다리는지 확인"""
+
+    WINDOW = firms.FirmsWindow('VIIRS_NOAA20_NRT', date(2025, 4, 1), 10)
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(firms, 'time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        limiter = mock.patch.object(firms, 'rate_limiter', firms.RateLimiter(1000, 600))
+        limiter.start()
+        self.addCleanup(limiter.stop)
+
+    def session(self, *responses):
+        responses = [
+            SimpleNamespace(status_code=status, text=text, content=text.encode(), headers=headers)
+            for status, text, headers in responses
+        ]
+        return SimpleNamespace(get=mock.Mock(side_effect=responses))
+
+    def test_retries_with_backoff_and_retry_after(self):
+        session = self.session(
+            (503, 'busy', {}),
+            (429, 'slow down', {'Retry-After': '7'}),
+            (200, VIIRS_CSV_HEADER, {}),
+        )
+        result = firms.fetch_window(self.WINDOW, session)
+
+        self.assertEqual((result.status, result.error), (200, None))
+        self.assertEqual(session.get.call_count, 3)
+        # 첫 재시도 전 1초, 429 의 Retry-After 7초, 두 번째 재시도 전 2초
+        self.assertEqual(self.clock.sleeps, [1.0, 7, 2.0])
+
+    def test_error_text_with_status_200_is_not_cached(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        session = self.session((200, 'Invalid MAP_KEY.', {}))
+
+        with override_settings(FIRMS_CACHE_MODE='on', FIRMS_CACHE_DIR=directory.name):
+            result = firms.fetch_window(self.WINDOW, session)
+            self.assertEqual(firms_cache.entries(), [])
+
+        self.assertEqual(session.get.call_count, 1)
+        self.assertIsNone(result.text)
+        self.assertIn('Invalid MAP_KEY', result.error)
+
+    def test_client_error_is_not_retried(self):
+        session = self.session((400, 'Invalid MAP_KEY', {}))
+        result = firms.fetch_window(self.WINDOW, session)
+
+        self.assertEqual(session.get.call_count, 1)
+        self.assertEqual(result.status, 400)
+        self.assertIsNone(result.text)
+        self.assertIn('Invalid MAP_KEY', result.error)
+
+    def test_gives_up_after_max_retries(self):
+        session = self.session(*[(500, 'error', {})] * (firms.MAX_RETRIES + 1))
+        result = firms.fetch_window(self.WINDOW, session)
+
+        self.assertEqual(session.get.call_count, firms.MAX_RETRIES + 1)
+        self.assertEqual(result.error, 'HTTP 500: error')
+
+    def test_refresh_bypasses_cache_for_recent_windows(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        window = firms.FirmsWindow('VIIRS_NOAA20_NRT', date.today() - timedelta(days=1), 2)
+        cache_args = (window.source, firms.SOUTH_KOREA_BBOX, window.days, window.start)
+
+        with override_settings(FIRMS_CACHE_MODE='on', FIRMS_CACHE_DIR=directory.name):
+            firms_cache.store(*cache_args, VIIRS_CSV_HEADER)
+            fresh = VIIRS_CSV_HEADER + '36.5,128.5\n'
+            session = self.session((200, fresh, {}))
+
+            self.assertEqual(firms.fetch_window(window, session).text, VIIRS_CSV_HEADER)
+            self.assertEqual(session.get.call_count, 0)
+            self.assertEqual(firms.fetch_window(window, session, refresh=True).text, fresh)
+            self.assertEqual(firms_cache.load(*cache_args), fresh)
+
+    def test_cache_file_evicted_during_load_is_a_miss(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cache_args = (self.WINDOW.source, firms.SOUTH_KOREA_BBOX, self.WINDOW.days, self.WINDOW.start)
+        fresh = VIIRS_CSV_HEADER + '36.5,128.5\n'
+        session = self.session((200, fresh, {}))
+
+        with override_settings(FIRMS_CACHE_MODE='on', FIRMS_CACHE_DIR=directory.name):
+            firms_cache.store(*cache_args, VIIRS_CSV_HEADER)
+            # 본문을 읽은 직후 다른 스레드의 evict 가 파일을 지운 경우
+            with mock.patch.object(firms_cache.os, 'utime', side_effect=FileNotFoundError):
+                result = firms.fetch_window(self.WINDOW, session)
+
+        self.assertEqual((result.text, result.error), (fresh, None))
+        self.assertEqual(session.get.call_count, 1)
+
+    def test_store_counts_writes_under_lock(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        with override_settings(FIRMS_CACHE_DIR=directory.name), \
+                mock.patch.object(firms_cache, '_writes', 0), \
+                mock.patch.object(firms_cache, '_evict', wraps=firms_cache._evict) as evict:
+            threads = [
+                threading.Thread(
+                    target=firms_cache.store, args=('VIIRS_SNPP_NRT', 'world', 1, date(2025, 4, i % 28 + 1), 'x'),
+                )
+                for i in range(firms_cache.EVICT_EVERY * 2)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(firms_cache._writes, firms_cache.EVICT_EVERY * 2)
+            self.assertEqual(evict.call_count, 2)
+
+    def test_rate_limiter_waits_for_oldest_call_to_expire(self):
+        limiter = firms.RateLimiter(2, 10)
+        limiter.acquire()
+        self.clock.now = 4.0
+        limiter.acquire()
+        limiter.acquire()
+
+        self.assertEqual(self.clock.sleeps, [6.0])
+        self.assertEqual(list(limiter._stamps), [4.0, 10.0])
+
+
+class ParseFirmsCsvTests(SimpleTestCase):
+    """잘못된 행은 예외 대신 이유와 함께 reject 로 모이고, 나머지만 정리되어 남는지 확인"""
+
+    def parse(self, *rows, header=VIIRS_CSV_HEADER):
+        return parse_firms_csv(header + '\n'.join(rows) + '\n', date(2025, 4, 1), date(2025, 4, 2))
+
+    def test_invalid_rows_are_rejected_with_reason(self):
+        fires, rejects = self.parse(
+            '36.5,128.5,330.1,0.4,0.4,2025-04-01,418,N20,VIIRS,n,2.0NRT,290.2,10.5,D',
+            '36.5,128.5,330.1,0.4,0.4,2025-04-31,0418,N20,VIIRS,n,2.0NRT,290.2,10.5,D',
+            '96.5,128.5,330.1,0.4,0.4,2025-04-01,0418,N20,VIIRS,n,2.0NRT,290.2,10.5,D',
+            '36.5,128.5,abc,0.4,0.4,2025-04-01,0418,N20,VIIRS,n,2.0NRT,290.2,10.5,D',
+            '36.5,128.5,330.1,0.4,0.4,2025-04-01,04:18,N20,VIIRS,n,2.0NRT,290.2,10.5,D',
+            '36.5,128.5,330.1,0.4,0.4,2025-04-01,0418,N20,VIIRS,,2.0NRT,290.2,10.5,D',
+            # 형식은 맞지만 요청 기간 밖이라 조용히 제외
+            '36.5,128.5,330.1,0.4,0.4,2025-04-05,0418,N20,VIIRS,n,2.0NRT,290.2,10.5,D',
+        )
+
+        self.assertEqual(len(fires), 1)
+        self.assertEqual(list(fires.columns), FIRE_COLUMNS)
+        self.assertEqual(fires.iloc[0]['acq_time'], '0418')
+        self.assertEqual(fires.iloc[0]['acq_date'], date(2025, 4, 1))
+        self.assertEqual(
+            list(rejects['reason']), ['acq_date', 'coordinates', 'numeric', 'acq_time', 'confidence'],
+        )
+
+    def test_modis_columns_and_confidence_are_converted(self):
+        header = (
+            'latitude,longitude,brightness,scan,track,acq_date,acq_time,satellite,'
+            'instrument,confidence,version,bright_t31,frp,daynight\n'
+        )
+        fires, rejects = self.parse(
+            '36.5,128.5,310.0,1.0,1.0,2025-04-01,0130,Terra,MODIS,29,6.1NRT,290.0,8.0,N',
+            '36.6,128.5,310.0,1.0,1.0,2025-04-01,0130,Terra,MODIS,30,6.1NRT,290.0,8.0,N',
+            '36.7,128.5,310.0,1.0,1.0,2025-04-01,0130,Terra,MODIS,80,6.1NRT,290.0,8.0,N',
+            header=header,
+        )
+
+        self.assertTrue(rejects.empty)
+        self.assertEqual(list(fires['confidence']), ['l', 'n', 'h'])
+        self.assertEqual(list(fires['bright_ti4']), [310.0] * 3)
+
+    def test_missing_column_raises(self):
+        with self.assertRaisesMessage(ValueError, 'frp'):
+            self.parse('1,2', header='latitude,longitude\n')
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN 형식은 SQLite 기준')
+class FireDataQueryPlanTests(TestCase):
+    """fire_detection 이 100만 행일 때도 날짜 범위 조회가 인덱스를 타는지 확인"""
+
+    ROWS = 1_000_000
+
+    @classmethod
+    def setUpTestData(cls):
+        # 2년치 날짜에 고르게 퍼진 합성 데이터를 SQL 안에서 바로 생성
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                WITH RECURSIVE seq(n) AS (
+                    SELECT 0 UNION ALL SELECT n + 1 FROM seq WHERE n < %s
+                )
+                INSERT INTO fire_detection (
+                    latitude, longitude, bright_ti4, scan, track, acq_date, acq_time,
+                    satellite, instrument, confidence, version, bright_ti5, frp, daynight
+                )
+                SELECT
+                    33 + (n % 5500) * 0.001, 124 + (n / 5500 % 6000) * 0.001,
+                    300, 0.5, 0.4,
+                    date('2024-01-01', '+' || (n % 730) || ' days'),
+                    printf('%%04d', n % 2400),
+                    'N20', 'VIIRS', 'n', '2.0NRT', 280, n % 50, 'D'
+                FROM seq
+                """,
+                [cls.ROWS - 1],
+            )
+            cursor.execute('ANALYZE')
+
+    def setUp(self):
+        cache.clear()
+
+    def date_range_queryset(self, start_date, end_date):
+        return filter_fires(
+            {'start_date': start_date, 'end_date': end_date}
+        ).values(*FIRE_FIELDS).order_by(*FIRE_ORDERING)
+
+    def test_date_range_uses_index_without_sort(self):
+        plan = self.date_range_queryset('2025-06-01', '2025-06-07').explain()
+
+        self.assertIn('fire_acq_date_time_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_bbox_uses_natural_key_index(self):
+        plan = FireDetection.objects.filter(
+            latitude__range=(35.0, 35.2), longitude__range=(127.0, 127.2)
+        ).explain()
+
+        # SQLite 는 유니크 제약 인덱스를 sqlite_autoindex_* 이름으로 만듦
+        self.assertRegex(plan, r'USING (COVERING )?INDEX \S+ \(latitude>\? AND latitude<\?\)')
+
+    def test_fire_data_api_single_query(self):
+        params = {'start_date': '2025-06-01', 'end_date': '2025-06-07', 'fused': '0'}
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/fire-data/', params)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            len(response.json()),
+            self.date_range_queryset(params['start_date'], params['end_date']).count()
+        )
+
+
+class FireDataFilterTests(TestCase):
+    """bbox 필터와 키셋 커서로 이어 읽은 페이지가 전체 결과와 같은지 확인"""
+
+    def setUp(self):
+        cache.clear()
+        FireDetection.objects.bulk_create([
+            FireDetection(
+                latitude=latitude, longitude=128.5, bright_ti4=330, scan=0.4, track=0.4,
+                acq_date=date(2025, 4, day), acq_time=acq_time, satellite='N20', instrument='VIIRS',
+                confidence='n', version='2.0NRT', bright_ti5=290, frp=10.0, daynight='D',
+            )
+            # 같은 날짜/시각 행이 여럿이라 id 로 순서가 갈리는 경우를 포함
+            for latitude, day, acq_time in [
+                (36.1, 1, '0418'), (36.2, 1, '0418'), (36.3, 1, '1630'), (36.4, 2, '0418'),
+                (36.5, 2, '0418'), (36.6, 2, '0418'), (37.9, 3, '0418'),
+            ]
+        ])
+
+    def get(self, **params):
+        return self.client.get('/api/fire-data/', {'fused': '0', **params})
+
+    def test_bbox_filter(self):
+        fires = self.get(bbox='128,36.15,129,36.55').json()
+
+        self.assertEqual(sorted(f['latitude'] for f in fires), [36.2, 36.3, 36.4, 36.5])
+        self.assertEqual(self.get(bbox='129,36,128,37').status_code, 400)
+        self.assertEqual(self.get(bbox='128,36').status_code, 400)
+
+    def test_cursor_pages_cover_all_rows_in_order(self):
+        expected = [f['id'] for f in self.get().json()]
+        pages, cursor = [], None
+        while True:
+            response = self.get(limit=3, **({'cursor': cursor} if cursor else {}))
+            pages.append([f['id'] for f in response.json()])
+            cursor = response.headers.get('X-Next-Cursor')
+            if not cursor:
+                break
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), expected)
+
+    def test_stream_is_same_under_wsgi_and_asgi(self):
+        """WSGI 는 동기 제너레이터, ASGI 는 비동기 제너레이터로 같은 본문을 내보내야 함"""
+        async def asgi_body(params):
+            response = await self.async_client.get('/api/fire-data/', {'fused': '0', **params})
+            self.assertTrue(response.is_async)
+            return b''.join([chunk async for chunk in response.streaming_content])
+
+        expected = self.get().json()
+        for params in ({'stream': '1'}, {'format': 'ndjson'}):
+            response = self.get(**params)
+            self.assertFalse(response.is_async)
+            wsgi_body = b''.join(response.streaming_content)
+
+            self.assertEqual(async_to_sync(asgi_body)(params), wsgi_body)
+            if 'stream' in params:
+                self.assertEqual(json.loads(wsgi_body), expected)
+            else:
+                self.assertEqual([json.loads(line) for line in wsgi_body.splitlines()], expected)
+
+    def test_invalid_cursor_and_limit(self):
+        self.assertEqual(self.get(limit=3, cursor='not-a-cursor').status_code, 400)
+        self.assertEqual(self.get(limit=0).status_code, 400)
+        self.assertEqual(self.get(limit='abc').status_code, 400)
+
+
+class FireResponseCacheTests(TestCase):
+    """데이터 버전이 바뀌기 전까지 캐시된 응답과 304 를 돌려주는지 확인"""
+
+    PARAMS = {'start_date': '2025-04-01', 'end_date': '2025-04-01', 'fused': '0'}
+
+    def setUp(self):
+        cache.clear()
+        self.fire = FireDetection.objects.create(
+            latitude=36.5, longitude=128.5, bright_ti4=330, scan=0.4, track=0.4,
+            acq_date=date(2025, 4, 1), acq_time='0418', satellite='N20', instrument='VIIRS',
+            confidence='n', version='2.0NRT', bright_ti5=290, frp=10.0, daynight='D',
+        )
+
+    def test_etag_and_cache_follow_data_version(self):
+        first = self.client.get('/api/fire-data/', self.PARAMS)
+        etag = first['ETag']
+
+        not_modified = self.client.get('/api/fire-data/', self.PARAMS, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+
+        # 버전을 올리지 않은 변경은 캐시된 응답에 보이지 않음
+        FireDetection.objects.filter(id=self.fire.id).update(frp=42.0)
+        self.assertEqual(self.client.get('/api/fire-data/', self.PARAMS).json()[0]['frp'], 10.0)
+
+        bump_data_version()
+        changed = self.client.get('/api/fire-data/', self.PARAMS, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+        self.assertEqual(changed.json()[0]['frp'], 42.0)
+
+    def test_etag_differs_per_query(self):
+        other = self.client.get('/api/fire-data/', {**self.PARAMS, 'min_frp': '5'})
+
+        self.assertNotEqual(self.client.get('/api/fire-data/', self.PARAMS)['ETag'], other['ETag'])
+
+
+class IngestJobQueueTests(TestCase):
+    """겹치는 수집 요청은 합치고, 재시작으로 남은 작업은 다시 넣거나 실패로 표시하는지 확인"""
+
+    def setUp(self):
+        self.executor = mock.Mock()
+        for name, value in (('_executor', self.executor), ('_requeued', False)):
+            patcher = mock.patch.object(jobs, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def enqueue(self, start_day, end_day, sources=('VIIRS_NOAA20_NRT',)):
+        return jobs.enqueue_ingest(date(2025, 4, start_day), date(2025, 4, end_day), list(sources))
+
+    def test_overlapping_requests_are_deduplicated_and_trimmed(self):
+        job, created = self.enqueue(1, 10)
+        self.assertTrue(created)
+
+        self.assertEqual(self.enqueue(3, 5), (job, False))
+        trimmed, created = self.enqueue(8, 15)
+        self.assertTrue(created)
+        self.assertEqual((trimmed.start_date, trimmed.end_date), (date(2025, 4, 11), date(2025, 4, 15)))
+        # 두 작업이 함께 덮는 범위는 새 작업 없이 마지막으로 겹친 작업을 돌려줌
+        self.assertEqual(self.enqueue(2, 14), (trimmed, False))
+        self.assertTrue(self.enqueue(1, 10, sources=['VIIRS_SNPP_NRT'])[1])
+
+    def test_fetch_save_rejects_non_object_body(self):
+        for body in ('[]', '"2025-04-01"', 'null'):
+            response = self.client.post('/api/fetch-save/', body, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+        self.assertFalse(IngestJob.objects.exists())
+
+    def test_stale_queued_job_is_failed_and_not_reused(self):
+        job, _ = self.enqueue(1, 10)
+        IngestJob.objects.filter(id=job.id).update(
+            updated_at=job.updated_at - jobs.STALE_AFTER - timedelta(minutes=1)
+        )
+
+        new_job, created = self.enqueue(1, 10)
+        job.refresh_from_db()
+
+        self.assertTrue(created)
+        self.assertNotEqual(new_job, job)
+        self.assertEqual((job.status, job.error), (IngestJob.FAILED, jobs.STALE_ERROR))
+        self.assertEqual(self.client.get(f'/api/jobs/{job.id}/').json()['status'], IngestJob.FAILED)
+
+    def test_queued_jobs_are_requeued_once_per_process(self):
+        job = IngestJob.objects.create(
+            start_date=date(2025, 4, 1), end_date=date(2025, 4, 10), sources='VIIRS_NOAA20_NRT'
+        )
+
+        self.client.get(f'/api/jobs/{job.id}/')
+        self.client.get(f'/api/jobs/{job.id}/')
+
+        self.executor.submit.assert_called_once_with(jobs._run_in_thread, job.id)
+
+
+class RegionIndexTests(SimpleTestCase):
+    """격자 색인으로 찾은 구역이 모든 변과 직접 비교한 결과와 같은지 확인"""
+
+    # 구멍이 있는 사각형, 그 동쪽에 변을 맞댄 삼각형, 떨어진 두 조각의 MultiPolygon
+    SQUARE = {'type': 'Polygon', 'coordinates': [
+        [[128, 36], [129, 36], [129, 37], [128, 37], [128, 36]],
+        [[128.4, 36.4], [128.6, 36.4], [128.6, 36.6], [128.4, 36.6], [128.4, 36.4]],
+    ]}
+    TRIANGLE = {'type': 'Polygon', 'coordinates': [[[129, 36], [130, 36], [129, 37], [129, 36]]]}
+    ISLANDS = {'type': 'MultiPolygon', 'coordinates': [
+        [[[126.1, 33.1], [126.4, 33.1], [126.4, 33.4], [126.1, 33.1]]],
+        [[[126.6, 33.5], [126.9, 33.5], [126.9, 33.8], [126.6, 33.8], [126.6, 33.5]]],
+    ]}
+
+    def setUp(self):
+        self.regions = [(1, self.SQUARE), (2, self.TRIANGLE), (3, self.ISLANDS)]
+        self.index = RegionIndex(self.regions)
+
+    def test_lookup_matches_exact_point_in_polygon(self):
+        rng = np.random.default_rng(0)
+        lons = rng.uniform(126, 130.5, 20_000)
+        lats = rng.uniform(33, 37.5, 20_000)
+
+        expected = np.zeros(len(lons), dtype='int64')
+        for region_id, geometry in self.regions:
+            inside = points_in_polygon(lons, lats, _edges(_rings(geometry)))
+            expected[(expected == 0) & inside] = region_id
+
+        np.testing.assert_array_equal(self.index.lookup(lons, lats), expected)
+
+    def test_holes_shared_edges_and_multipolygons(self):
+        lons = [128.2, 128.5, 129.0, 129.05, 129.9, 126.3, 126.8, 126.5, 131.0]
+        lats = [36.2, 36.5, 36.5, 36.9, 36.9, 33.15, 33.6, 33.45, 36.5]
+
+        # 구멍 안, 삼각형 빗변 바깥, 두 조각 사이, 모든 구역 밖은 0
+        # 맞댄 변 위의 점은 어느 한 구역에만 속함
+        self.assertEqual(self.index.lookup(lons, lats).tolist(), [1, 0, 2, 2, 0, 3, 3, 0, 0])
+        self.assertEqual(RegionIndex([]).lookup([128.5], [36.5]).tolist(), [0])
+
+
+class HeatTileTests(TestCase):
+    """타일이 화재 위치에 그려지고, 기간 안 날짜에 수집이 있을 때만 디스크 캐시가 무효가 되는지 확인"""
+
+    PARAMS = {'start_date': '2025-04-01', 'end_date': '2025-04-02'}
+
+    def ingest(self, latitude, acq_date, frp=20.0):
+        upsert_fire_detections(pd.DataFrame(
+            [[latitude, 128.5, 330.0, 0.4, 0.4, acq_date, '0418',
+              'N20', 'VIIRS', 'n', '2.0NRT', 290.0, frp, 'D']],
+            columns=FIRE_COLUMNS,
+        ))
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache_dir = Path(directory.name)
+        settings = override_settings(
+            TILE_CACHE_DIR=self.cache_dir / 'tiles', FIRE_ARCHIVE_DIR=self.cache_dir / 'archive',
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.ingest(36.5, date(2025, 4, 1))
+        px, py = tiles._world_pixels([128.5], [36.5], 8)
+        self.tile = (8, int(px[0] // tiles.TILE_SIZE), int(py[0] // tiles.TILE_SIZE))
+
+    def get(self, z, x, y, **params):
+        return self.client.get(f'/tiles/{z}/{x}/{y}.png', {**self.PARAMS, **params})
+
+    def test_tile_is_drawn_and_cached_on_disk(self):
+        response = self.get(*self.tile)
+        z, x, y = self.tile
+
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertTrue(response.content.startswith(b'\x89PNG'))
+        self.assertNotEqual(response.content, tiles.EMPTY_TILE)
+        self.assertEqual(self.get(z, x + 2, y).content, tiles.EMPTY_TILE)
+        self.assertEqual(len(list((self.cache_dir / 'tiles').glob('*/*.png'))), 2)
+
+        with mock.patch.object(tiles, 'render_heat_tile', side_effect=AssertionError):
+            self.assertEqual(self.get(*self.tile).content, response.content)
+
+    def test_ingest_invalidates_only_tiles_covering_that_date(self):
+        before = self.get(*self.tile).content
+        key = tiles.tile_cache_key(*self.tile, self.PARAMS)
+
+        self.ingest(36.5, date(2025, 4, 5))
+        self.assertEqual(tiles.tile_cache_key(*self.tile, self.PARAMS), key)
+
+        self.ingest(36.51, date(2025, 4, 2), frp=80.0)
+        self.assertNotEqual(tiles.tile_cache_key(*self.tile, self.PARAMS), key)
+        self.assertNotEqual(self.get(*self.tile).content, before)
+
+    def test_invalid_tile_requests(self):
+        self.assertEqual(self.get(tiles.MAX_TILE_ZOOM + 1, 0, 0).status_code, 400)
+        self.assertEqual(self.get(2, 4, 0).status_code, 400)
+        self.assertEqual(self.client.get('/tiles/8/0/0.png').status_code, 400)
+        self.assertEqual(self.get(8, 0, 0, end_date='2026-04-02').status_code, 400)
+
+
+class FireFusionTests(TestCase):
+    """다른 위성의 같은 화재 관측이 하나의 이벤트로 묶이는지 확인"""
+
+    def detection(self, latitude, longitude, acq_time, satellite, frp=10.0, confidence='n'):
+        return FireDetection(
+            latitude=latitude, longitude=longitude, bright_ti4=330, scan=0.4, track=0.4,
+            acq_date=date(2025, 4, 1), acq_time=acq_time, satellite=satellite,
+            instrument='VIIRS', confidence=confidence, version='2.0NRT', bright_ti5=290,
+            frp=frp, daynight='D',
+        )
+
+    def setUp(self):
+        cache.clear()
+        FireDetection.objects.bulk_create([
+            # NOAA-20 과 SNPP 가 50분 차이로 같은 화재를 관측
+            self.detection(36.5000, 128.5000, '0418', 'N20', frp=20.0, confidence='h'),
+            self.detection(36.5030, 128.5020, '0508', 'N'),
+            # 같은 위성의 이웃 화소는 따로 유지
+            self.detection(36.4950, 128.5080, '0418', 'N20'),
+            # 같은 위치라도 시간 차가 크면 다른 이벤트
+            self.detection(36.5000, 128.5000, '1636', 'N'),
+            # 멀리 떨어진 다른 화재
+            self.detection(35.1000, 129.0000, '0418', 'N20'),
+        ])
+        refresh_fused_events([date(2025, 4, 1)])
+
+    def test_cross_satellite_detections_are_fused(self):
+        self.assertEqual(FusedDetection.objects.count(), 4)
+
+        event = FusedDetection.objects.get(member_count=2)
+        self.assertEqual(event.satellite, 'N,N20')
+        self.assertEqual(event.acq_time, '0418')
+        self.assertEqual(event.confidence, 'h')
+        self.assertEqual(event.frp, 20.0)
+        self.assertEqual(
+            set(event.members.values_list('satellite', flat=True)), {'N', 'N20'}
+        )
+        self.assertFalse(FireDetection.objects.filter(fused__isnull=True).exists())
+
+    def test_refresh_is_idempotent(self):
+        refresh_fused_events([date(2025, 4, 1)])
+
+        self.assertEqual(FusedDetection.objects.count(), 4)
+        self.assertEqual(FusedDetection.objects.get(member_count=2).members.count(), 2)
+
+    def test_new_member_keeps_event_ids(self):
+        before = dict(FusedDetection.objects.values_list('id', 'member_count'))
+        far = FusedDetection.objects.get(latitude=35.1)
+        FireDetection.objects.bulk_create([self.detection(35.1010, 129.0000, '0500', 'N')])
+        refresh_fused_events([date(2025, 4, 1)])
+
+        after = dict(FusedDetection.objects.values_list('id', 'member_count'))
+        self.assertEqual(after, {**before, far.id: 2})
+        self.assertFalse(FireDetection.objects.filter(fused__isnull=True).exists())
+
+    def test_bridging_detection_merges_into_older_event(self):
+        pair = FusedDetection.objects.get(member_count=2)
+        # 두 NOAA-20 관측 모두에서 1km 안인 SNPP 관측이 두 이벤트를 이음
+        FireDetection.objects.bulk_create([self.detection(36.4955, 128.5075, '0430', 'N')])
+        refresh_fused_events([date(2025, 4, 1)])
+
+        self.assertEqual(FusedDetection.objects.count(), 3)
+        self.assertEqual(FusedDetection.objects.get(id=pair.id).member_count, 4)
+        self.assertEqual(FireDetection.objects.filter(fused=pair.id).count(), 4)
+
+    def test_unchanged_day_is_not_rewritten(self):
+        with CaptureQueriesContext(connection) as queries:
+            refresh_fused_events([date(2025, 4, 1)])
+
+        writes = [q['sql'] for q in queries if q['sql'].split()[0] in ('INSERT', 'UPDATE', 'DELETE')]
+        self.assertEqual(writes, [])
+
+    def test_fire_data_api_serves_fused_events_by_default(self):
+        params = {'start_date': '2025-04-01', 'end_date': '2025-04-01'}
+
+        self.assertEqual(len(self.client.get('/api/fire-data/', params).json()), 4)
+        self.assertEqual(len(self.client.get('/api/fire-data/', {**params, 'fused': '0'}).json()), 5)
+        # 위성 필터는 구성 관측 중 하나라도 해당하면 이벤트를 포함
+        self.assertEqual(len(self.client.get('/api/fire-data/', {**params, 'satellite': 'N'}).json()), 2)
+
+    def test_cluster_ids_match_fire_data_ids(self):
+        params = {'start_date': '2025-04-01', 'end_date': '2025-04-01', 'radius': '1'}
+
+        for fused in ('1', '0'):
+            fire_ids = {f['id'] for f in self.client.get('/api/fire-data/', {**params, 'fused': fused}).json()}
+            clusters = self.client.get('/api/fire-clusters/', {**params, 'fused': fused}).json()
+            self.assertEqual({i for c in clusters for i in c['fire_ids']}, fire_ids)
+        # fused 를 주지 않으면 fire_data_api 와 같이 이벤트 기준
+        clusters = self.client.get('/api/fire-clusters/', params).json()
+        self.assertEqual(sum(c['count'] for c in clusters), FusedDetection.objects.count())
+        self.assertEqual(self.client.get('/api/fire-clusters/', {**params, 'fused': '2'}).status_code, 400)
+
+
+class BinaryFormatTests(TestCase):
+    """format=columnar / arrow 를 디코딩한 값이 JSON 응답과 같고, 압축 방식이 협상되는지 확인"""
+
+    def setUp(self):
+        cache.clear()
+        FireDetection.objects.bulk_create([
+            FireDetection(
+                # 32비트를 넘는 id (뒤의 행은 이어서 자동 증가) 와 128가지를 넘는 위성 값
+                id=2 ** 33 + i if i < 3 else None,
+                latitude=36.5 + i * 0.001, longitude=128.5, bright_ti4=330.25, scan=0.4, track=0.4,
+                acq_date=date(2025, 4, 1 + i % 2), acq_time=f'{i % 24:02d}18', satellite=f'S{i:03d}',
+                instrument='VIIRS', confidence='lnh'[i % 3], version='2.0NRT', bright_ti5=290,
+                frp=10.5 + i, daynight='D',
+            )
+            for i in range(200)
+        ])
+
+    def get(self, encoding='', **params):
+        params = {'fused': '0', 'start_date': '2025-04-01', **params}
+        return self.client.get('/api/fire-data/', params, HTTP_ACCEPT_ENCODING=encoding)
+
+    def assertMatchesJson(self, decoded):
+        expected = self.get().json()
+        self.assertEqual(len(decoded), len(expected))
+        for fire, row in zip(expected, decoded):
+            for name in ('latitude', 'longitude', 'frp', 'bright_ti4'):
+                # 좌표와 값은 float32 로 보냄
+                self.assertAlmostEqual(row.pop(name), fire.pop(name), places=4)
+            self.assertEqual(row, fire)
+
+    def test_columnar_round_trip(self):
+        body = self.get(format='columnar').content
+        (length,) = struct.unpack_from('<I', body)
+        header = json.loads(body[4:4 + length])
+
+        columns = {}
+        for column in header['columns']:
+            self.assertEqual(column['offset'] % 8, 0)
+            self.assertGreaterEqual(column['offset'], 4 + length)
+            columns[column['name']] = np.frombuffer(
+                body, dtype=column['type'], count=header['count'], offset=column['offset'],
+            )
+        self.assertEqual(header['count'], 200)
+        self.assertGreater(int(columns['id'].min()), 2 ** 32)
+
+        decoded = [
+            {
+                'id': int(columns['id'][i]),
+                'latitude': float(columns['latitude'][i]),
+                'longitude': float(columns['longitude'][i]),
+                'frp': float(columns['frp'][i]),
+                'bright_ti4': float(columns['bright_ti4'][i]),
+                'acq_date': str(date(1970, 1, 1) + timedelta(days=int(columns['acq_date'][i]))),
+                'acq_time': str(columns['acq_time'][i]).zfill(4),
+                'satellite': header['dictionaries']['satellite'][columns['satellite'][i]],
+                'confidence': header['dictionaries']['confidence'][columns['confidence'][i]],
+            }
+            for i in range(header['count'])
+        ]
+        self.assertMatchesJson(decoded)
+
+    def test_arrow_round_trip(self):
+        import pyarrow as pa
+
+        table = pa.ipc.open_stream(self.get(format='arrow').content).read_all()
+        self.assertEqual(table.schema.field('satellite').type.index_type, pa.int32())
+
+        decoded = [
+            {**row, 'acq_date': str(row['acq_date']), 'acq_time': str(row['acq_time']).zfill(4)}
+            for row in table.to_pylist()
+        ]
+        self.assertMatchesJson(decoded)
+
+    def test_compression_is_negotiated(self):
+        plain = self.get(format='columnar')
+        self.assertNotIn('Content-Encoding', plain.headers)
+        self.assertEqual(plain['Vary'], 'Accept-Encoding')
+
+        gzipped = self.get('gzip', format='columnar')
+        self.assertEqual(gzipped['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(gzipped.content), plain.content)
+
+        import brotli
+        compressed = self.get('gzip, br', format='columnar')
+        self.assertEqual(compressed['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(compressed.content), plain.content)
+
+
+class MetricsTests(TestCase):
+    """요청마다 처리 시간과 DB 쿼리 수가 /metrics 지표로 남는지 확인"""
+
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def query_histogram(self, view):
+        buckets, total, count = metrics._histograms[('http_request_queries', (('view', view),))]
+        return total, count
+
+    def test_async_view_queries_are_counted(self):
+        params = {'fused': '0', 'start_date': '2025-04-01'}
+        async_to_sync(self.async_client.get)('/api/fire-data/', params)
+        async_total, count = self.query_histogram('fire_data_api')
+        self.assertEqual(count, 1)
+        self.assertGreater(async_total, 0)
+
+        # 캐시된 응답을 쓰지 않도록 비운 뒤 같은 요청을 동기 클라이언트로 보내면 쿼리 수가 같아야 함
+        cache.clear()
+        self.client.get('/api/fire-data/', params)
+        self.assertEqual(self.query_histogram('fire_data_api'), (async_total * 2, 2))
+
+    def test_metrics_exposition(self):
+        metrics.inc('ingest_rows_total', 3, result='inserted')
+        self.client.get('/api/fire-data/', {'fused': '0', 'start_date': '2025-04-01'})
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        lines = response.content.decode().splitlines()
+
+        self.assertIn('# TYPE ingest_rows_total counter', lines)
+        self.assertIn('ingest_rows_total{result="inserted"} 3', lines)
+        self.assertIn('# TYPE http_request_seconds histogram', lines)
+        labels = 'method="GET",status="200",view="fire_data_api"'
+        self.assertIn(f'http_request_seconds_bucket{{{labels},le="+Inf"}} 1', lines)
+        self.assertIn(f'http_request_seconds_count{{{labels}}} 1', lines)
+        self.assertTrue(any(line.startswith(f'http_request_seconds_sum{{{labels}}} ') for line in lines))
+        # 구간 값은 누적이므로 le 가 커질수록 줄지 않음
+        buckets = [
+            int(line.rsplit(' ', 1)[1]) for line in lines
+            if line.startswith('http_request_queries_bucket{view="fire_data_api",')
+        ]
+        self.assertEqual(len(buckets), len(metrics.BUCKETS) + 1)
+        self.assertEqual(buckets, sorted(buckets))
+        self.assertEqual(buckets[-1], 1)
+
+
+class FireStatsApiTests(TestCase):
+    """일별 집계 API 의 group_by 묶음과 필터가 원본 관측으로 계산한 값과 맞는지 확인"""
+
+    def setUp(self):
+        cache.clear()
+        geometry = {'type': 'Polygon', 'coordinates': []}
+        bounds = {'min_lon': 124, 'min_lat': 33, 'max_lon': 130, 'max_lat': 38.5}
+        gyeongbuk = Region.objects.create(code='47', name='경상북도', level=Region.SIDO, geometry=geometry, **bounds)
+        pohang = Region.objects.create(
+            code='47110', name='포항시', level=Region.SIGUNGU, parent=gyeongbuk, geometry=geometry, **bounds,
+        )
+        gyeongnam = Region.objects.create(code='48', name='경상남도', level=Region.SIDO, geometry=geometry, **bounds)
+
+        FireDetection.objects.bulk_create([
+            FireDetection(
+                latitude=latitude, longitude=longitude, bright_ti4=330, scan=0.4, track=0.4,
+                acq_date=acq_date, acq_time=acq_time, satellite=satellite, instrument='VIIRS',
+                confidence=confidence, version='2.0NRT', bright_ti5=290, frp=frp, daynight=daynight,
+                region=region,
+            )
+            for latitude, longitude, acq_date, acq_time, satellite, confidence, frp, daynight, region in [
+                # 같은 격자 칸 (365, 1285)
+                (36.55, 128.55, date(2025, 4, 1), '0418', 'N20', 'h', 10.0, 'D', pohang),
+                (36.56, 128.56, date(2025, 4, 1), '1630', 'N', 'n', 30.0, 'N', pohang),
+                # 칸 (351, 1290)
+                (35.15, 129.05, date(2025, 4, 2), '0418', 'N20', 'l', 20.0, 'D', gyeongnam),
+            ]
+        ])
+        refresh_daily_stats([date(2025, 4, 1), date(2025, 4, 2)])
+
+    def get(self, **params):
+        return self.client.get('/api/fire-stats/', params)
+
+    def total(self, **params):
+        return self.get(**params).json()['total']['count']
+
+    def test_group_by_date(self):
+        body = self.get().json()
+
+        self.assertEqual(body['total'], {
+            'count': 3, 'frp_sum': 60.0, 'frp_max': 30.0, 'low': 1, 'nominal': 1, 'high': 1,
+            'day': 2, 'night': 1, 'mean_frp': 20.0,
+        })
+        self.assertEqual([(r['date'], r['count'], r['frp_max']) for r in body['rows']],
+                         [('2025-04-01', 2, 30.0), ('2025-04-02', 1, 20.0)])
+        self.assertEqual(body['rows'][0]['mean_frp'], 20.0)
+
+    def test_group_by_satellite_cell_and_region(self):
+        rows = self.get(group_by='satellite').json()['rows']
+        self.assertEqual([(r['satellite'], r['count']) for r in rows], [('N', 1), ('N20', 2)])
+
+        rows = self.get(group_by='cell').json()['rows']
+        self.assertEqual([r['count'] for r in rows], [1, 2])
+        self.assertAlmostEqual(rows[0]['center_lat'], 35.15)
+        self.assertAlmostEqual(rows[1]['center_lng'], 128.55)
+
+        rows = self.get(group_by='region').json()['rows']
+        self.assertEqual([(r['region'], r['region_name'], r['count']) for r in rows],
+                         [('47110', '포항시', 2), ('48', '경상남도', 1)])
+
+    def test_filters(self):
+        self.assertEqual(self.total(start_date='2025-04-02'), 1)
+        self.assertEqual(self.total(end_date='2025-04-01'), 2)
+        self.assertEqual(self.total(satellite='N'), 1)
+        self.assertEqual(self.total(satellite='N,N20'), 3)
+        self.assertEqual(self.total(bbox='128,36,129,37'), 2)
+        # 시도 코드는 하위 시군구를 포함
+        self.assertEqual(self.total(region='47'), 2)
+        self.assertEqual(self.total(region='48'), 1)
+        self.assertEqual(self.total(start_date='2025-04-03'), 0)
+
+    def test_invalid_params(self):
+        for params in ({'group_by': 'hour'}, {'region': '99'}, {'bbox': '128,36'}, {'start_date': '2025-13-01'}):
+            self.assertEqual(self.get(**params).status_code, 400, params)
+
+
+def firms_csv(*rows):
+    """(위도, 경도, 날짜, 시각, FRP) 행으로 FIRMS VIIRS CSV 본문을 만듦"""
+    return VIIRS_CSV_HEADER + ''.join(
+        f'{lat},{lon},330.0,0.4,0.4,{acq_date},{acq_time},N20,VIIRS,n,2.0NRT,290.0,{frp},D\n'
+        for lat, lon, acq_date, acq_time, frp in rows
+    )
+
+
+class IngestRunTests(TestCase):
+    """여러 창을 받는 수집에서 집계·이벤트·화재 추적을 창마다가 아니라 끝에 한 번 갱신하는지 확인"""
+
+    BODIES = {
+        date(2025, 4, 1): firms_csv(
+            (36.5, 128.5, '2025-04-01', '0418', 10.0), (36.6, 128.5, '2025-04-02', '0418', 12.0),
+        ),
+        date(2025, 4, 11): firms_csv((36.5, 128.5, '2025-04-11', '0418', 20.0)),
+    }
+
+    def setUp(self):
+        cache.clear()
+
+    def fetch(self, windows, **kwargs):
+        return [firms.FirmsResponse(w, 200, self.BODIES[w.start], None) for w in windows]
+
+    def run_ingest(self, name):
+        """두 창(4/1~4/10, 4/11~4/12)을 수집하면서 api 의 name 함수 호출을 기록"""
+        with mock.patch.object(api, 'fetch_windows', side_effect=self.fetch), \
+                mock.patch.object(api, name, wraps=getattr(api, name)) as spy:
+            stats = api.save_fire_data_by_date_range('2025-04-01', '2025-04-12')
+        return stats, spy
+
+    def test_derived_data_refreshed_once_per_run(self):
+        stats, refresh = self.run_ingest('refresh_derived_data')
+
+        self.assertEqual(stats['inserted'], 3)
+        refresh.assert_called_once_with({date(2025, 4, 1), date(2025, 4, 2), date(2025, 4, 11)})
+        self.assertEqual(FireDailyStat.objects.values('date').distinct().count(), 3)
+        self.assertFalse(FireDetection.objects.filter(fused__isnull=True).exists())
+        self.assertFalse(FireDetection.objects.filter(event__isnull=True).exists())
+
+    def test_daily_stats_refreshed_once_per_run(self):
+        _, refresh = self.run_ingest('refresh_daily_stats')
+
+        refresh.assert_called_once_with([date(2025, 4, 1), date(2025, 4, 2), date(2025, 4, 11)])
+        self.assertEqual(self.client.get('/api/fire-stats/').json()['total']['count'], 3)
+
+    def test_tracking_runs_once_per_run(self):
+        _, track = self.run_ingest('track_new_detections')
+
+        track.assert_called_once_with()
+        # 4/1 과 4/11 관측은 추적 간격(48시간)을 넘어 다른 화재
+        self.assertEqual(FireEvent.objects.count(), 3)
+        self.assertFalse(FireDetection.objects.filter(event__isnull=True).exists())
+
+
+class SyncSourceTests(TestCase):
+    """자동 동기화가 기준 시각(high-water mark) 이후 창만 받고, 저장에 성공했을 때만 기준을 올리는지 확인"""
+
+    SOURCE = 'VIIRS_NOAA20_NRT'
+    TODAY = date(2025, 4, 5)
+
+    def setUp(self):
+        cache.clear()
+        self.requested = []
+        self.bodies = {}
+        patcher = mock.patch.object(sync, 'fetch_windows', side_effect=self.fetch)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fetch(self, windows, refresh=False):
+        self.requested += windows
+        return [
+            firms.FirmsResponse(w, 200, self.bodies[w.start], None) if w.start in self.bodies
+            else firms.FirmsResponse(w, 503, None, 'HTTP 503: busy')
+            for w in windows
+        ]
+
+    def mark(self):
+        state = SyncState.objects.get(source=self.SOURCE)
+        return state.last_acq_date, state.last_acq_time
+
+    def test_mark_advances_to_newest_written_detection(self):
+        self.bodies[date(2025, 3, 30)] = firms_csv(
+            (36.5, 128.5, '2025-04-03', '1630', 10.0), (36.6, 128.5, '2025-04-04', '0418', 12.0),
+        )
+        result = sync.sync_source(self.SOURCE, today=self.TODAY)
+
+        self.assertEqual(self.requested, [firms.FirmsWindow(self.SOURCE, date(2025, 3, 30), 7)])
+        self.assertEqual(self.mark(), (date(2025, 4, 4), '0418'))
+        self.assertEqual(result['high_water_mark'], '2025-04-04 0418')
+        self.assertEqual(FireDetection.objects.count(), 2)
+
+    def test_rerun_fetches_only_from_mark(self):
+        SyncState.objects.create(source=self.SOURCE, last_acq_date=date(2025, 4, 4), last_acq_time='0418')
+        self.bodies[date(2025, 4, 4)] = firms_csv(
+            (36.6, 128.5, '2025-04-04', '0418', 12.0), (36.7, 128.5, '2025-04-05', '0400', 15.0),
+        )
+        result = sync.sync_source(self.SOURCE, today=self.TODAY)
+
+        self.assertEqual(self.requested, [firms.FirmsWindow(self.SOURCE, date(2025, 4, 4), 2)])
+        self.assertEqual((result['inserted'], result['start_date']), (2, '2025-04-04'))
+        self.assertEqual(self.mark(), (date(2025, 4, 5), '0400'))
+
+    def test_failed_window_keeps_mark(self):
+        SyncState.objects.create(source=self.SOURCE, last_acq_date=date(2025, 3, 1), last_acq_time='0418')
+        # 3/1~3/10 창은 받았지만 3/11~3/20 창이 실패
+        self.bodies[date(2025, 3, 1)] = firms_csv((36.5, 128.5, '2025-03-05', '0418', 10.0))
+        self.bodies[date(2025, 3, 21)] = firms_csv((36.5, 128.5, '2025-03-25', '0418', 10.0))
+        self.bodies[date(2025, 3, 31)] = VIIRS_CSV_HEADER
+        result = sync.sync_source(self.SOURCE, today=self.TODAY)
+
+        self.assertEqual(result['failed'], 1)
+        self.assertEqual(self.mark(), (date(2025, 3, 1), '0418'))
+        self.assertEqual(SyncState.objects.get(source=self.SOURCE).last_error, '1개 요청 실패')
+        # 받은 창은 저장되고, 다음 주기에 같은 기준부터 다시 요청
+        self.assertEqual(FireDetection.objects.count(), 2)
+
+    def test_failed_write_keeps_mark(self):
+        SyncState.objects.create(source=self.SOURCE, last_acq_date=date(2025, 4, 4), last_acq_time='0418')
+        self.bodies[date(2025, 4, 4)] = firms_csv((36.7, 128.5, '2025-04-05', '0400', 15.0))
+
+        with mock.patch.object(api, 'write_fire_detections', side_effect=RuntimeError('disk full')):
+            with self.assertRaises(RuntimeError):
+                sync.sync_source(self.SOURCE, today=self.TODAY)
+
+        self.assertEqual(self.mark(), (date(2025, 4, 4), '0418'))
+
+
+class UpsertFireDetectionsTests(TestCase):
+    """PostgreSQL 에서는 COPY 경로, 그 밖에서는 bulk_create 경로가 같은 결과를 내는지 확인"""
+
+    def frame(self, frp=10.0):
+        rows = [
+            [36.5 + i * 0.01, 128.5, 330.0, 0.4, 0.4, date(2025, 4, 1), '0418',
+             'N20', 'VIIRS', 'n', '2.0NRT', 290.0, frp if i == 0 else 5.0, 'D']
+            for i in range(3)
+        ]
+        return pd.DataFrame(rows, columns=FIRE_COLUMNS)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_upsert_counts_and_skips_unchanged_rows(self):
+        self.assertEqual(
+            upsert_fire_detections(self.frame()),
+            {'inserted': 3, 'updated': 0, 'unchanged': 0},
+        )
+        self.assertEqual(
+            upsert_fire_detections(self.frame()),
+            {'inserted': 0, 'updated': 0, 'unchanged': 3},
+        )
+        self.assertEqual(
+            upsert_fire_detections(self.frame(frp=42.0)),
+            {'inserted': 0, 'updated': 1, 'unchanged': 2},
+        )
+        self.assertEqual(FireDetection.objects.get(frp=42.0).latitude, 36.5)
+        self.assertEqual(FusedDetection.objects.count(), 3)
+
+
+class FireArchiveTests(TestCase):
+    """오래된 날짜를 Parquet 으로 옮겨도 API 결과가 같고, 다시 수집하면 DB 로 돌아오는지 확인"""
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(FIRE_ARCHIVE_DIR=directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        rows = [
+            [36.5 + i * 0.01, 128.5, 330.0, 0.4, 0.4, date(2025, 4, 1 + i), '0418',
+             'N20', 'VIIRS', 'n', '2.0NRT', 290.0, 10.0 + i, 'D']
+            for i in range(3)
+        ]
+        upsert_fire_detections(pd.DataFrame(rows, columns=FIRE_COLUMNS))
+
+    def test_archived_days_are_served_from_parquet(self):
+        params = {'start_date': '2025-04-02', 'end_date': '2025-04-03', 'fused': '0'}
+        before = self.client.get('/api/fire-data/', params).json()
+
+        self.assertEqual(archive.archive_old_detections(hot_days=1, today=date(2025, 4, 4)), (2, 2))
+        self.assertEqual(archive.archived_dates(), [date(2025, 4, 1), date(2025, 4, 2)])
+        self.assertEqual(FireDetection.objects.count(), 1)
+        self.assertEqual(self.client.get('/api/fire-data/', params).json(), before)
+
+    def test_reingest_restores_archived_day(self):
+        archive.archive_old_detections(hot_days=0, today=date(2025, 4, 4))
+        frame = pd.DataFrame(
+            [[36.5, 128.5, 330.0, 0.4, 0.4, date(2025, 4, 1), '0418',
+              'N20', 'VIIRS', 'n', '2.0NRT', 290.0, 42.0, 'D']],
+            columns=FIRE_COLUMNS,
+        )
+
+        self.assertEqual(upsert_fire_detections(frame), {'inserted': 0, 'updated': 1, 'unchanged': 0})
+        self.assertEqual(archive.archived_dates(), [date(2025, 4, 2), date(2025, 4, 3)])
+        self.assertEqual(FireDetection.objects.get().frp, 42.0)
+        self.assertEqual(FusedDetection.objects.count(), 1)
+
+    def test_archived_dates_cache_follows_partition_changes(self):
+        archive.archive_old_detections(hot_days=1, today=date(2025, 4, 4))
+        month = archive._day_path('detections', date(2025, 4, 1)).parent
+        # 방금 바뀐 디렉터리는 캐시하지 않으므로 수정 시각을 과거로 돌림
+        os.utime(month, ns=(0, 0))
+        expected = [date(2025, 4, 1), date(2025, 4, 2)]
+        self.assertEqual(archive.archived_dates(), expected)
+
+        with mock.patch.object(Path, 'glob', side_effect=AssertionError('glob again')):
+            self.assertEqual(archive.archived_dates(), expected)
+
+        # 다른 프로세스가 파일을 지운 경우 - 디렉터리 수정 시각이 바뀌어 다시 읽음
+        archive._day_path('detections', date(2025, 4, 2)).unlink()
+        self.assertEqual(archive.archived_dates(), [date(2025, 4, 1)])
+
+    def test_rebuild_stats_keeps_archived_days(self):
+        archive.archive_old_detections(hot_days=1, today=date(2025, 4, 4))
+        # 원본이 DB 에도 아카이브에도 없는 날짜의 집계는 지워야 함
+        FireDailyStat.objects.create(
+            date=date(2025, 3, 1), satellite='N20', cell_lat=365, cell_lng=1285,
+            count=1, frp_sum=10.0, frp_max=10.0,
+        )
+
+        self.assertEqual(rebuild_daily_stats(), (1, 1))
+        self.assertEqual(
+            sorted(FireDailyStat.objects.values_list('date', flat=True).distinct()),
+            [date(2025, 4, 1), date(2025, 4, 2), date(2025, 4, 3)],
+        )
+
+
+class FireTrackingTests(TestCase):
+    """수집할 때마다 새 관측만 기존 화재에 이어 붙이는지 확인"""
+
+    def ingest(self, *detections):
+        rows = [
+            [latitude, longitude, 330.0, 0.4, 0.4, acq_date, acq_time,
+             'N20', 'VIIRS', 'n', '2.0NRT', 290.0, frp, 'D']
+            for latitude, longitude, acq_date, acq_time, frp in detections
+        ]
+        upsert_fire_detections(pd.DataFrame(rows, columns=FIRE_COLUMNS))
+
+    def setUp(self):
+        cache.clear()
+        self.ingest(
+            (36.5000, 128.5000, date(2025, 4, 1), '0418', 10.0),
+            (36.5050, 128.5000, date(2025, 4, 1), '0418', 12.0),
+            # 멀리 떨어진 다른 화재
+            (35.1000, 129.0000, date(2025, 4, 1), '0418', 5.0),
+        )
+
+    def test_later_passes_extend_existing_event(self):
+        event = FireDetection.objects.get(latitude=36.5).event
+        area = event.area_km2
+
+        self.ingest(
+            (36.5150, 128.5100, date(2025, 4, 1), '1630', 20.0),
+            (36.5300, 128.5200, date(2025, 4, 2), '0400', 40.0),
+        )
+        event.refresh_from_db()
+
+        self.assertEqual(FireEvent.objects.count(), 2)
+        self.assertEqual(event.detection_count, 4)
+        self.assertEqual(event.max_frp, 40.0)
+        self.assertEqual(event.passes.count(), 3)
+        self.assertGreater(event.area_km2, area)
+        self.assertGreater(event.spread_rate_kmh, 0)
+        self.assertGreater(event.frp_trend, 0)
+        self.assertFalse(FireDetection.objects.filter(event__isnull=True).exists())
+
+    def test_bridging_detection_merges_events(self):
+        self.ingest((36.5300, 128.5000, date(2025, 4, 1), '1630', 8.0))
+        first = FireDetection.objects.get(latitude=36.5).event
+        second = FireDetection.objects.get(latitude=36.53).event
+        self.assertNotEqual(first, second)
+
+        self.ingest((36.5180, 128.5000, date(2025, 4, 2), '0400', 8.0))
+        second.refresh_from_db()
+
+        self.assertEqual(second.merged_into, first)
+        self.assertEqual(FireDetection.objects.filter(event=first).count(), 4)
+        params = {'bbox': '128,36,129,37'}
+        self.assertEqual([e['id'] for e in self.client.get('/api/fire-events/', params).json()], [first.id])
+        self.assertEqual(self.client.get(f'/api/fire-events/{second.id}/').json()['detection_count'], 4)
+
+
+class FirmsFileTransferTests(TestCase):
+    """export_firms 로 내보낸 파일을 import_firms 로 다시 가져오면 같은 행이 되는지 확인"""
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        settings = override_settings(FIRE_ARCHIVE_DIR=self.directory / 'archive')
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        rows = [
+            [36.5 + i * 0.01, 128.5, 330.0, 0.4, 0.4, date(2025, 4, 1 + i % 3), '0418',
+             'N20', 'VIIRS', 'n', '2.0NRT', 290.0, 10.0 + i, 'D']
+            for i in range(20)
+        ]
+        upsert_fire_detections(pd.DataFrame(rows, columns=FIRE_COLUMNS))
+        self.saved = sorted(FireDetection.objects.values_list(*FIRE_COLUMNS))
+
+    def reimport(self, name, **kwargs):
+        path = self.directory / name
+        self.assertEqual(bulkio.export_firms_file(path, days_per_chunk=2), 20)
+        FireDetection.objects.all().delete()
+        FireEvent.objects.all().delete()
+
+        stats = bulkio.import_firms_file(path, workers=1, **kwargs)
+        self.assertFalse(path.with_name(f'{name}.checkpoint.json').exists())
+        return stats
+
+    def test_csv_round_trip_in_small_chunks(self):
+        stats = self.reimport('fires.csv.gz', chunk_bytes=256)
+
+        self.assertEqual(stats['read'], 20)
+        self.assertEqual(stats['inserted'], 20)
+        self.assertEqual(sorted(FireDetection.objects.values_list(*FIRE_COLUMNS)), self.saved)
+        self.assertEqual(FireEvent.objects.filter(merged_into__isnull=True).count(), 1)
+
+    def test_parquet_round_trip_with_bbox(self):
+        stats = self.reimport('fires.parquet', bbox='128,36,129,36.55')
+
+        self.assertEqual(stats['read'], 20)
+        self.assertEqual(stats['inserted'], 6)
+        self.assertEqual(sorted(FireDetection.objects.values_list(*FIRE_COLUMNS)), self.saved[:6])
+
+
+class WorkerStartupTests(SimpleTestCase):
+    """
+    웹 워커가 시작할 때 수집용 무거운 모듈을 읽지 않는지 확인
+
+    시작 시간과 메모리는 기계마다 달라 manage.py bench 의 startup 항목에서 봅니다.
+    """
+
+    def test_startup_does_not_import_heavy_modules(self):
+        script = (
+            'import sys, HWMS.asgi, HWMS.urls; '
+            f'print(" ".join(m for m in {bench.STARTUP_FORBIDDEN!r} if m in sys.modules))'
+        )
+        # DJANGO_SETTINGS_MODULE 은 manage.py 가 정한 값을 그대로 물려받음
+        proc = subprocess.run(
+            [sys.executable, '-c', script],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        )
+
+        self.assertEqual(proc.stdout.split(), [])
+
+    def test_bench_startup_without_proc(self):
+        # /proc 가 없는 Windows 개발 환경처럼 최대 RSS 없이 시작 시간만 측정
+        script = bench.STARTUP_SCRIPT.replace('/proc/self/status', '/nonexistent/status')
+        with mock.patch.object(bench, 'STARTUP_SCRIPT', script):
+            result = bench.bench_startup()
+
+        self.assertIsNone(result['max_rss_mb'])
+        self.assertNotIn('max_rss_mb', result['over_budget'])
+        self.assertGreater(result['import_s'], 0)
@@ -0,0 +1,226 @@
+# main/tiles.py
+import hashlib
+import math
+import os
+import struct
+import threading
+import zlib
+from datetime import timedelta
+from pathlib import Path
+from urllib.parse import urlencode
+
+import numpy as np
+from django.conf import settings
+
+from . import archive
+from .caching import get_day_versions
+from .queries import _parse_date, filter_fires
+
+TILE_SIZE = 256
+MAX_TILE_ZOOM = 12
+MAX_TILE_DAYS = 366
+# 열 지도 번짐 반경 (px). 타일 경계에서 끊기지 않도록 이만큼 바깥 화재도 함께 읽음
+HEAT_RADIUS = 6
+# 번진 뒤 픽셀 값(FRP 합, MW)이 이 정도면 색이 절반 정도 진해짐
+HEAT_SCALE = 8.0
+TILE_CACHE_MAX_BYTES = 200 * 1024 * 1024
+# 타일 요청에서 결과에 영향을 주는 파라미터
+TILE_PARAMS = ('start_date', 'end_date', 'satellite', 'min_confidence', 'region')
+
+
+def _colormap():
+    """세기 0~255 를 RGBA 로 바꾸는 표 (투명 -> 노랑 -> 주황 -> 빨강)"""
+    t = np.linspace(0, 1, 256)
+    stops = np.array([0, 0.35, 0.7, 1.0])
+    colors = np.array([
+        [255, 237, 160, 0],
+        [254, 178, 76, 170],
+        [240, 59, 32, 210],
+        [189, 0, 38, 240],
+    ])
+    lut = np.stack([np.interp(t, stops, colors[:, i]) for i in range(4)], axis=1)
+    return lut.round().astype('uint8')
+
+
+COLORMAP = _colormap()
+
+
+def encode_png(rgba):
+    """(높이, 너비, 4) uint8 배열을 PNG 로 인코딩 (표준 라이브러리 zlib 만 사용)"""
+    height, width, _ = rgba.shape
+    # 각 줄 앞에 필터 종류 0 (None) 바이트를 붙임
+    raw = np.concatenate([np.zeros((height, 1), dtype='uint8'), rgba.reshape(height, -1)], axis=1)
+
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)
+    return b''.join([
+        b'\x89PNG\r\n\x1a\n',
+        chunk(b'IHDR', header),
+        chunk(b'IDAT', zlib.compress(raw.tobytes(), 6)),
+        chunk(b'IEND', b''),
+    ])
+
+
+EMPTY_TILE = encode_png(np.zeros((TILE_SIZE, TILE_SIZE, 4), dtype='uint8'))
+
+
+def _world_pixels(lons, lats, zoom):
+    """경도/위도를 해당 줌의 Web Mercator 전체 픽셀 좌표로 변환"""
+    scale = TILE_SIZE * 2 ** zoom
+    x = (np.asarray(lons) + 180) / 360 * scale
+    sin = np.sin(np.radians(np.clip(lats, -85.0511, 85.0511)))
+    y = (0.5 - np.log((1 + sin) / (1 - sin)) / (4 * math.pi)) * scale
+    return x, y
+
+
+def _pixel_to_lonlat(px, py, zoom):
+    scale = TILE_SIZE * 2 ** zoom
+    lon = px / scale * 360 - 180
+    lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * py / scale))))
+    return lon, lat
+
+
+def tile_bbox(z, x, y, margin=HEAT_RADIUS * 2):
+    """타일과 번짐 여백을 덮는 (min_lon, min_lat, max_lon, max_lat)"""
+    min_lon, max_lat = _pixel_to_lonlat(x * TILE_SIZE - margin, y * TILE_SIZE - margin, z)
+    max_lon, min_lat = _pixel_to_lonlat((x + 1) * TILE_SIZE + margin, (y + 1) * TILE_SIZE + margin, z)
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def _blur(grid, radius=HEAT_RADIUS):
+    """가우시안 커널로 가로, 세로 한 번씩 번지게 함"""
+    offsets = np.arange(-radius, radius + 1)
+    kernel = np.exp(-(offsets ** 2) / (2 * (radius / 2) ** 2))
+    kernel /= kernel.sum()
+    grid = np.apply_along_axis(np.convolve, 0, grid, kernel, mode='same')
+    return np.apply_along_axis(np.convolve, 1, grid, kernel, mode='same')
+
+
+def render_heat_tile(z, x, y, params):
+    """
+    타일 범위 화재의 FRP 가중 밀도를 PNG 로 그림
+
+    NumPy histogram2d 로 픽셀마다 FRP 를 더한 뒤 번지게 하고 색을 입힙니다.
+    모든 타일에 같은 세기 기준(HEAT_SCALE)을 쓰므로 타일 사이에 이음매가 없습니다.
+
+    Raises:
+        ValueError: 필터 파라미터가 잘못된 경우
+    """
+    min_lon, min_lat, max_lon, max_lat = tile_bbox(z, x, y)
+    fires = filter_fires(params).filter(
+        latitude__range=(min_lat, max_lat),
+        longitude__range=(min_lon, max_lon),
+    )
+    rows = list(fires.order_by().values_list('longitude', 'latitude', 'frp'))
+    if archive.overlaps(params):
+        bbox = f'{min_lon},{min_lat},{max_lon},{max_lat}'
+        filters = {key: params.get(key) for key in TILE_PARAMS if params.get(key)}
+        rows += archive.query_archive({**filters, 'bbox': bbox}, columns=('longitude', 'latitude', 'frp'))
+    if not rows:
+        return EMPTY_TILE
+
+    lons, lats, frp = (np.array(column, dtype='float64') for column in zip(*rows))
+    px, py = _world_pixels(lons, lats, z)
+
+    # 번짐 여백까지 포함한 격자에 더한 뒤 가운데 타일 부분만 잘라냄
+    pad = HEAT_RADIUS * 2
+    size = TILE_SIZE + 2 * pad
+    origin_x, origin_y = x * TILE_SIZE - pad, y * TILE_SIZE - pad
+    grid, _, _ = np.histogram2d(
+        py - origin_y, px - origin_x,
+        bins=size, range=[[0, size], [0, size]], weights=frp,
+    )
+    heat = _blur(grid)[pad:pad + TILE_SIZE, pad:pad + TILE_SIZE]
+
+    intensity = 1 - np.exp(-heat / HEAT_SCALE * math.log(2))
+    return encode_png(COLORMAP[(intensity * 255).astype('uint8')])
+
+
+def _tile_cache_dir():
+    return Path(getattr(settings, 'TILE_CACHE_DIR', Path(settings.BASE_DIR) / 'tile_cache'))
+
+
+def tile_cache_key(z, x, y, params):
+    """
+    타일 좌표 + 필터 + 기간 안 날짜별 데이터 버전으로 만든 키
+
+    어떤 날짜에 새 화재가 들어오면 그 날짜를 포함하는 기간의 타일만 새 키가 됩니다.
+    """
+    start = _parse_date(params['start_date'], 'start_date')
+    end = _parse_date(params['end_date'], 'end_date')
+    if start > end or (end - start).days >= MAX_TILE_DAYS:
+        raise ValueError(f'타일 기간은 1일 이상 {MAX_TILE_DAYS}일 이하여야 합니다.')
+
+    dates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    versions = get_day_versions(dates)
+    filters = urlencode(sorted((k, params[k]) for k in TILE_PARAMS if params.get(k)))
+    raw = f'{z}/{x}/{y}?{filters}|' + ','.join(str(versions[d]) for d in dates)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+_evict_lock = threading.Lock()
+_writes = 0
+# 타일을 이만큼 저장할 때마다 한 번씩 용량을 확인
+EVICT_EVERY = 200
+
+
+def _evict(max_bytes):
+    """타일 캐시가 max_bytes 를 넘으면 오래된 파일부터 삭제"""
+    if not _evict_lock.acquire(blocking=False):
+        return
+    try:
+        files = []
+        for path in _tile_cache_dir().glob('*/*.png'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            total -= size
+    finally:
+        _evict_lock.release()
+
+
+def get_heat_tile(z, x, y, params):
+    """
+    디스크 캐시에 있으면 그대로, 없으면 그려서 저장한 PNG 타일
+
+    Raises:
+        ValueError: 타일 좌표나 필터 파라미터가 잘못된 경우
+    """
+    global _writes
+
+    if not 0 <= z <= MAX_TILE_ZOOM or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise ValueError('타일 좌표가 범위를 벗어났습니다.')
+    if not params.get('start_date') or not params.get('end_date'):
+        raise ValueError('start_date와 end_date가 필요합니다.')
+
+    key = tile_cache_key(z, x, y, params)
+    path = _tile_cache_dir() / key[:2] / f'{key}.png'
+    try:
+        return path.read_bytes()
+    except OSError:
+        pass
+
+    png = render_heat_tile(z, x, y, params)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+    tmp_path.write_bytes(png)
+    os.replace(tmp_path, path)
+
+    _writes += 1
+    if _writes % EVICT_EVERY == 0:
+        _evict(getattr(settings, 'TILE_CACHE_MAX_BYTES', TILE_CACHE_MAX_BYTES))
+    return png
@@ -0,0 +1,363 @@
+# main/tracking.py
+import math
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .bulkload import update_rows
+from .caching import bump_data_version
+from .fusion import KM_PER_DEG_LAT, _minutes, close_pairs, connected_components
+from .models import FireDetection, FireEvent, FireEventPass
+from .queries import _parse_date, _parse_limit, parse_bbox
+from .regions import region_ids_for
+
+# 같은 화재로 이을 관측 사이의 최대 거리와 시간 차
+# (구름 등으로 한두 번 통과를 놓쳐도 이어지도록 시간 차는 넉넉하게 잡음)
+TRACK_DISTANCE_KM = 2.0
+TRACK_GAP_HOURS = 48
+# VIIRS I 밴드 화소 반 폭 (km) - 관측 하나도 이 반경의 면적을 가진 것으로 봄
+PIXEL_RADIUS_KM = 0.1875
+# FRP 추세 기울기를 계산할 최근 통과 회차 수
+TREND_PASSES = 6
+
+# 추적에 필요한 관측 컬럼 (values_list 순서)
+_DETECTION_COLUMNS = (
+    'id', 'acq_date', 'acq_time', 'latitude', 'longitude', 'frp', 'region_id', 'event_id',
+)
+
+
+def _track_settings():
+    return (
+        getattr(settings, 'FIRE_TRACK_DISTANCE_KM', TRACK_DISTANCE_KM),
+        getattr(settings, 'FIRE_TRACK_GAP_HOURS', TRACK_GAP_HOURS),
+    )
+
+
+def _to_datetime(minute):
+    """date.toordinal() * 1440 + 자정부터의 분을 UTC datetime 으로 변환"""
+    minute = int(minute)
+    day = datetime.combine(date.fromordinal(minute // 1440), time(), tzinfo=dt_timezone.utc)
+    return day + timedelta(minutes=minute % 1440)
+
+
+def _to_minutes(value):
+    value = value.astimezone(dt_timezone.utc)
+    return value.date().toordinal() * 1440 + value.hour * 60 + value.minute
+
+
+def convex_hull(points):
+    """(경도, 위도) 점들의 볼록 껍질 꼭짓점 (반시계 방향, Andrew 단조 연쇄 알고리즘)"""
+    points = sorted({(float(lon), float(lat)) for lon, lat in points})
+    if len(points) <= 2:
+        return [list(p) for p in points]
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower, upper = [], []
+    for p in points:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    for p in reversed(points):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    return [list(p) for p in lower[:-1] + upper[:-1]]
+
+
+def hull_metrics(hull):
+    """
+    볼록 껍질을 화소 반 폭(PIXEL_RADIUS_KM)만큼 넓힌 도형의 면적(km²)과 둘레(km)
+
+    볼록 다각형을 반지름 r 원으로 넓힌 면적은 A + P·r + π·r² 입니다
+    (점 하나면 원, 두 점이면 캡슐 모양).
+    """
+    r = PIXEL_RADIUS_KM
+    if not hull:
+        return 0.0, 0.0
+
+    # 화재 하나 크기에서는 중심 위도 기준 등장방형 투영으로 충분
+    # (꼭짓점이 수십 개 이하라 NumPy 보다 파이썬 반복이 빠름)
+    kx = KM_PER_DEG_LAT * math.cos(math.radians(sum(lat for _, lat in hull) / len(hull)))
+    points = [(lon * kx, lat * KM_PER_DEG_LAT) for lon, lat in hull]
+    area = perimeter = 0.0
+    for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+        perimeter += math.hypot(x2 - x1, y2 - y1)
+        area += x1 * y2 - x2 * y1
+    return abs(area) / 2 + perimeter * r + math.pi * r * r, perimeter + 2 * math.pi * r
+
+
+def _growth(passes):
+    """
+    통과 회차 목록으로 확산 속도(km/시간)와 FRP 추세(MW/시간) 계산
+
+    확산 속도는 면적과 같은 원의 반지름이 첫 회차에서 마지막 회차까지 늘어난 평균 속도이고,
+    FRP 추세는 최근 TREND_PASSES 회차 FRP 합의 최소제곱 기울기입니다.
+    """
+    keys = sorted(passes)
+    if len(keys) < 2:
+        return 0.0, 0.0
+
+    hours = (np.array(keys, dtype='float64') - keys[0]) / 60
+    # 늦게 들어온 관측 때문에 앞 회차 면적이 더 클 수 있으므로 누적 최댓값 사용
+    areas = np.maximum.accumulate([passes[k][2] for k in keys])
+    radius = np.sqrt(areas / math.pi)
+    spread = (radius[-1] - radius[0]) / hours[-1]
+
+    frp = np.array([passes[k][1] for k in keys], dtype='float64')
+    recent = slice(-TREND_PASSES, None)
+    trend = np.polyfit(hours[recent], frp[recent], 1)[0]
+    return float(spread), float(trend)
+
+
+def _apply(event, absorbed, new, passes):
+    """
+    event 에 합칠 이벤트(absorbed)와 새 관측(new)을 누적
+
+    Args:
+        event: 갱신할 FireEvent (새 이벤트면 값이 비어 있는 인스턴스)
+        absorbed: event 로 합칠 다른 FireEvent 목록
+        new: (분, 위도, 경도, FRP, 구역 id) 튜플 목록
+        passes: {회차 분: [관측 수, FRP 합, 면적]} - event 와 absorbed 의 기존 회차를 합친 것
+    """
+    previous = [e for e in [event] + absorbed if e.detection_count]
+    count = sum(e.detection_count for e in previous) + len(new)
+    event.latitude = (
+        sum(e.latitude * e.detection_count for e in previous) + sum(p[1] for p in new)
+    ) / count
+    event.longitude = (
+        sum(e.longitude * e.detection_count for e in previous) + sum(p[2] for p in new)
+    ) / count
+    event.detection_count = count
+    event.frp_total = sum(e.frp_total for e in previous) + sum(p[3] for p in new)
+
+    # 구역은 가장 강한 관측을 따름
+    event.max_frp, event.region_id = max(
+        [(e.max_frp, e.region_id) for e in previous] + [(p[3], p[4]) for p in new],
+        key=lambda candidate: candidate[0],
+    )
+
+    seen = [_to_minutes(e.first_seen) for e in previous] + [_to_minutes(e.last_seen) for e in previous]
+    seen += [p[0] for p in new]
+    event.first_seen, event.last_seen = _to_datetime(min(seen)), _to_datetime(max(seen))
+
+    # 회차마다 그때까지의 껍질을 넓혀 가며 면적을 기록
+    hull = convex_hull([vertex for e in previous for vertex in e.hull])
+    by_pass = defaultdict(list)
+    for p in new:
+        by_pass[p[0] // 60 * 60].append(p)
+    for key in sorted(by_pass):
+        points = by_pass[key]
+        hull = convex_hull(hull + [(p[2], p[1]) for p in points])
+        row = passes.setdefault(key, [0, 0.0, 0.0])
+        row[0] += len(points)
+        row[1] += sum(p[3] for p in points)
+        row[2] = max(row[2], hull_metrics(hull)[0])
+
+    event.hull = hull
+    event.area_km2, event.perimeter_km = hull_metrics(hull)
+    event.spread_rate_kmh, event.frp_trend = _growth(passes)
+
+
+def _track_day(day, distance_km, gap_hours):
+    """
+    하루치 새 관측을 앞뒤 gap_hours 안의 이미 추적한 관측과 이어 이벤트에 반영
+
+    Returns:
+        dict: tracked / created / merged 개수
+    """
+    span = timedelta(days=math.ceil(gap_hours / 24))
+    rows = [
+        row for row in FireDetection.objects.filter(acq_date__range=(day - span, day + span))
+        .order_by().values_list(*_DETECTION_COLUMNS)
+        # 다른 날짜의 아직 추적하지 않은 관측은 그 날짜 차례에 처리
+        if row[7] is not None or row[1] == day
+    ]
+    ids, dates, times, lats, lons, frps, regions, event_ids = zip(*rows)
+    lats = np.array(lats, dtype='float64')
+    lons = np.array(lons, dtype='float64')
+    minutes = np.array([d.toordinal() for d in dates], dtype='int64') * 1440 + _minutes(times)
+    is_new = np.array([event_id is None for event_id in event_ids])
+
+    first, second = close_pairs(lats, lons, distance_km)
+    linked = (is_new[first] | is_new[second]) & (np.abs(minutes[first] - minutes[second]) <= gap_hours * 60)
+    first, second = list(first[linked]), list(second[linked])
+    # 같은 이벤트의 기존 관측끼리도 이어 두어야 이벤트 하나가 여러 요소로 갈라지지 않음
+    anchors = {}
+    for i in np.flatnonzero(~is_new):
+        anchor = anchors.setdefault(event_ids[i], i)
+        if anchor != i:
+            first.append(anchor)
+            second.append(i)
+    labels = connected_components(len(rows), np.array(first, dtype='int64'), np.array(second, dtype='int64'))
+
+    groups = defaultdict(lambda: ([], set()))
+    for i in np.flatnonzero(is_new):
+        groups[labels[i]][0].append(i)
+    for i in np.flatnonzero(~is_new):
+        if labels[i] in groups:
+            groups[labels[i]][1].add(event_ids[i])
+
+    existing = FireEvent.objects.in_bulk({e for _, events in groups.values() for e in events})
+    passes = defaultdict(dict)
+    for row in FireEventPass.objects.filter(event__in=existing.values()):
+        passes[row.event_id][_to_minutes(row.observed_at)] = [row.detection_count, row.frp_sum, row.area_km2]
+
+    results, created, updated, merged = [], [], [], []
+    for members, events in groups.values():
+        # 여러 이벤트가 이어지면 먼저 시작한 이벤트로 합침
+        events = sorted((existing[e] for e in events), key=lambda e: (e.first_seen, e.id))
+        event = events[0] if events else FireEvent(detection_count=0, frp_total=0.0, hull=[])
+        event_passes = {}
+        for e in events:
+            for key, (count, frp_sum, area) in passes[e.id].items():
+                row = event_passes.setdefault(key, [0, 0.0, 0.0])
+                row[0] += count
+                row[1] += frp_sum
+                row[2] = max(row[2], area)
+
+        new = [(int(minutes[i]), float(lats[i]), float(lons[i]), float(frps[i]), regions[i]) for i in members]
+        _apply(event, events[1:], new, event_passes)
+        results.append((event, events[1:], [ids[i] for i in members], event_passes))
+        (updated if events else created).append(event)
+        merged += events[1:]
+
+    FireEvent.objects.bulk_create(created, batch_size=1000)
+    update_rows(FireEvent, updated, [
+        'first_seen', 'last_seen', 'latitude', 'longitude', 'detection_count', 'frp_total', 'max_frp',
+        'hull', 'area_km2', 'perimeter_km', 'spread_rate_kmh', 'frp_trend', 'region',
+    ])
+
+    FireEventPass.objects.filter(event__in=updated + merged).delete()
+    detections, pass_rows = [], []
+    for event, absorbed, member_ids, event_passes in results:
+        if absorbed:
+            # 아카이브로 옮긴 관측은 예전 id 를 그대로 가지므로 합쳐진 이벤트는 지우지 않고 가리키게 둠
+            FireDetection.objects.filter(event__in=absorbed).update(event=event)
+            FireEvent.objects.filter(merged_into__in=absorbed).update(merged_into=event)
+            FireEvent.objects.filter(id__in=[e.id for e in absorbed]).update(merged_into=event)
+        detections += [FireDetection(id=detection_id, event_id=event.id) for detection_id in member_ids]
+        pass_rows += [
+            FireEventPass(event=event, observed_at=_to_datetime(key), detection_count=count, frp_sum=frp_sum, area_km2=area)
+            for key, (count, frp_sum, area) in event_passes.items()
+        ]
+    update_rows(FireDetection, detections, ['event'])
+    FireEventPass.objects.bulk_create(pass_rows, batch_size=1000)
+
+    return {'tracked': len(detections), 'created': len(created), 'merged': len(merged)}
+
+
+def track_new_detections():
+    """
+    아직 이벤트에 연결되지 않은 관측을 날짜 순으로 기존 화재에 잇거나 새 화재로 만듦
+
+    이미 추적한 관측은 다시 묶지 않고, 새 관측 근처(거리 FIRE_TRACK_DISTANCE_KM,
+    시간 FIRE_TRACK_GAP_HOURS 안)의 기존 관측만 읽어 이어지는 화재를 찾습니다.
+    화재의 위치, 껍질, 면적, FRP 는 저장해 둔 값에 새 관측을 더해 갱신하므로
+    수집 때마다 전체 이력을 다시 계산하지 않습니다.
+
+    Returns:
+        dict: tracked(연결한 관측) / created(새 화재) / merged(합쳐진 화재) 개수
+    """
+    distance_km, gap_hours = _track_settings()
+    days = sorted(
+        FireDetection.objects.filter(event__isnull=True)
+        .order_by().values_list('acq_date', flat=True).distinct()
+    )
+
+    totals = {'tracked': 0, 'created': 0, 'merged': 0}
+    for day in days:
+        with transaction.atomic():
+            for key, value in _track_day(day, distance_km, gap_hours).items():
+                totals[key] += value
+    return totals
+
+
+def rebuild_fire_events():
+    """
+    fire_detection 에 남아 있는 관측으로 화재 추적을 처음부터 다시 함 (추적 기준을 바꾼 뒤 실행)
+
+    아카이브로 옮긴 날짜의 관측은 포함되지 않습니다.
+    """
+    with transaction.atomic():
+        FireDetection.objects.filter(event__isnull=False).update(event=None)
+        FireEvent.objects.all().delete()
+    totals = track_new_detections()
+    bump_data_version()
+    return totals
+
+
+def filter_events(params):
+    """
+    요청 파라미터로 추적한 화재 필터링 (start_date, end_date, bbox, region, active, min_area)
+
+    기간은 화재가 관측된 기간(first_seen ~ last_seen, UTC)이 겹치면 포함하고,
+    active=1 이면 지금부터 FIRE_TRACK_GAP_HOURS 안에 관측된 화재만 남깁니다.
+
+    Raises:
+        ValueError: 파라미터 값이 잘못된 경우
+    """
+    events = FireEvent.objects.filter(merged_into__isnull=True)
+
+    if params.get('start_date'):
+        start = _parse_date(params['start_date'], 'start_date')
+        events = events.filter(last_seen__gte=datetime.combine(start, time(), tzinfo=dt_timezone.utc))
+    if params.get('end_date'):
+        end = _parse_date(params['end_date'], 'end_date') + timedelta(days=1)
+        events = events.filter(first_seen__lt=datetime.combine(end, time(), tzinfo=dt_timezone.utc))
+
+    if params.get('bbox'):
+        min_lon, min_lat, max_lon, max_lat = parse_bbox(params['bbox'])
+        events = events.filter(latitude__range=(min_lat, max_lat), longitude__range=(min_lon, max_lon))
+
+    if params.get('region'):
+        events = events.filter(region_id__in=region_ids_for([r for r in params['region'].split(',') if r]))
+
+    if params.get('active') == '1':
+        events = events.filter(last_seen__gte=timezone.now() - timedelta(hours=_track_settings()[1]))
+
+    if params.get('min_area'):
+        try:
+            events = events.filter(area_km2__gte=float(params['min_area']))
+        except ValueError:
+            raise ValueError('min_area는 숫자여야 합니다.')
+
+    events = events.order_by('-last_seen', '-id')
+    if params.get('limit'):
+        events = events[:_parse_limit(params['limit'])]
+    return events
+
+
+def event_to_dict(event, passes=None):
+    data = {
+        'id': event.id,
+        'first_seen': event.first_seen.isoformat(),
+        'last_seen': event.last_seen.isoformat(),
+        'latitude': event.latitude,
+        'longitude': event.longitude,
+        'detection_count': event.detection_count,
+        'frp_total': event.frp_total,
+        'max_frp': event.max_frp,
+        'area_km2': event.area_km2,
+        'perimeter_km': event.perimeter_km,
+        'spread_rate_kmh': event.spread_rate_kmh,
+        'frp_trend': event.frp_trend,
+        'region': event.region.code if event.region else None,
+        'hull': event.hull,
+    }
+    if passes is not None:
+        data['passes'] = [
+            {
+                'observed_at': p.observed_at.isoformat(),
+                'detection_count': p.detection_count,
+                'frp_sum': p.frp_sum,
+                'area_km2': p.area_km2,
+            }
+            for p in passes
+        ]
+    return data
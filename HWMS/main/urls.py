@@ -6,6 +6,14 @@ urlpatterns = [
     path('', views.fire_map_view, name='fire_map'),
     path('fire-map/', views.fire_map_view, name='fire_map_alt'),  # 대체 경로
     path('api/fire-data/', views.fire_data_api, name='fire_data_api'),
+    path('api/fire-clusters/', views.fire_clusters_api, name='fire_clusters_api'),
+    path('api/fire-stats/', views.fire_stats_api, name='fire_stats_api'),
+    path('api/fire-events/', views.fire_events_api, name='fire_events_api'),
+    path('api/fire-events/<int:event_id>/', views.fire_event_api, name='fire_event_api'),
+    path('api/regions/', views.regions_api, name='regions_api'),
+    path('tiles/<int:z>/<int:x>/<int:y>.png', views.heat_tile_view, name='heat_tile'),
     path('api/fetch-save/', views.fetch_and_save_fire_data, name='fetch_save'),
+    path('api/jobs/<int:job_id>/', views.job_status_api, name='job_status'),
     path('refresh-data/', views.load_and_save_fire_data, name='refresh_data'),
+    path('metrics', views.metrics_view, name='metrics'),
 ]
\ No newline at end of file
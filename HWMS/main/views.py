@@ -1,84 +1,305 @@
 # main/views.py
+import logging
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
-from .models import FireDetection
-from .api import save_fire_data_by_date_range
+from .models import FireDetection, FireEvent, FusedDetection, IngestJob, Region
+from .firms import FIRMS_SOURCES
+from .jobs import enqueue_ingest, job_to_dict, recover_jobs
+from .caching import cached_fire_response
+from . import archive, metrics
+from .clustering import cluster_fires
+from .stats import filter_stats, summarize_stats
+from .tracking import event_to_dict, filter_events
+from .tiles import get_heat_tile
+from .encoders import (
+    stream_json_array, stream_ndjson, astream_json_array, astream_ndjson,
+    encode_columnar, encode_arrow, compress,
+)
+from .queries import (
+    FIRE_FIELDS, FIRE_ORDERING, GRID_ZOOM_THRESHOLD,
+    filter_fires, apaginate, paginate_rows, grid_cells, grid_cells_from_rows, row_sort_key,
+)
 from datetime import datetime, timedelta
 import json
-import traceback
+
+logger = logging.getLogger(__name__)
+
+BINARY_FORMATS = {
+    'columnar': (encode_columnar, 'application/octet-stream'),
+    'arrow': (encode_arrow, 'application/vnd.apache.arrow.stream'),
+}
+# 스트리밍 형식별 (동기 제너레이터, 비동기 제너레이터, Content-Type)
+STREAM_FORMATS = {
+    'ndjson': (stream_ndjson, astream_ndjson, 'application/x-ndjson'),
+    'json': (stream_json_array, astream_json_array, 'application/json'),
+}
+CLUSTER_RADIUS_KM = 10
 
 def fire_map_view(request):
     """화재 지도 페이지"""
     try:
-        if FireDetection.objects.count() == 0:
+        if not FireDetection.objects.exists():
             today = datetime.now().date()
-            week_ago = today - timedelta(days=7)
-            count = save_fire_data_by_date_range(
-                start_date=week_ago.strftime('%Y-%m-%d'),
-                end_date=today.strftime('%Y-%m-%d')
-            )
-            print(f"✅ 초기 데이터 자동 저장 완료: {count}개")
-    except Exception as e:
-        print(f"❌ 데이터 저장 중 오류: {e}")
+            job, created = enqueue_ingest(today - timedelta(days=7), today, ['VIIRS_NOAA20_NRT'])
+            if created:
+                logger.info("초기 데이터 수집 작업 등록 %s", job)
+    except Exception:
+        logger.exception("초기 데이터 수집 작업 등록 실패")
     
     return render(request, 'fire_map.html')
 
-def fire_data_api(request):
-    """화재 데이터를 JSON으로 반환"""
+def _parse_fused(params):
+    """fused 파라미터 (기본값 1: 위성 간 중복을 묶은 이벤트, 0: 위성별 원본 관측)"""
+    fused = params.get('fused', '1')
+    if fused not in ('0', '1'):
+        raise ValueError('fused는 0 또는 1이어야 합니다.')
+    return fused == '1'
+
+def _with_archive(fires, params, fused):
+    """DB 결과와 아카이브 결과를 합쳐 FIRE_ORDERING 순서의 행 목록(FIRE_FIELDS 순서 튜플)으로"""
+    rows = list(fires.values_list(*FIRE_FIELDS)) + archive.query_archive(params, fused=fused)
+    rows.sort(key=row_sort_key, reverse=True)
+    return rows
+
+def _stream_response(request, fires, output_format):
+    """
+    서버 종류에 맞는 제너레이터로 스트리밍 응답을 만듦
+
+    WSGI(runserver 등)는 비동기 이터레이터를 끝까지 모아 메모리에 올린 뒤에야 보내므로
+    ASGI 요청에만 비동기 제너레이터를 쓰고, 그 밖에는 동기 제너레이터를 씁니다.
+    """
+    stream, astream, content_type = STREAM_FORMATS[output_format]
+    generator = astream if isinstance(request, ASGIRequest) else stream
+    return StreamingHttpResponse(generator(fires), content_type=content_type)
+
+def _encode_binary(encode, fires, accept_encoding):
+    """바이너리 인코딩 + 압축 (비동기 뷰에서는 스레드에서 실행)"""
+    return compress(encode(fires), accept_encoding)
+
+@cached_fire_response
+async def fire_data_api(request):
+    """
+    화재 데이터를 JSON으로 반환
+
+    기본으로 위성 간 중복 관측을 묶은 이벤트(fused_detection)를 반환하고,
+    fused=0 이면 위성별 원본 관측을 반환합니다. 두 경우 모두 응답 필드는 같습니다.
+    start_date, end_date, bbox, min_confidence, min_frp, satellite, region 으로 필터링하고,
+    limit 을 주면 한 페이지만 반환하며 다음 페이지 커서는 X-Next-Cursor 헤더로 알려줍니다.
+    zoom 이 GRID_ZOOM_THRESHOLD 미만이면 개별 화재 대신 격자 집계를 반환합니다.
+    format=ndjson 또는 stream=1 이면 결과를 모아두지 않고 조각 단위로 스트리밍합니다.
+    format=columnar / arrow 는 지도용 컬럼형 바이너리를 압축해 반환합니다 (limit 미적용).
+    요청 기간에 아카이브(Parquet)로 옮겨진 날짜가 있으면 그 결과도 합쳐서 반환합니다.
+
+    비동기 뷰라서 DB 를 기다리는 동안 워커가 다른 요청을 처리합니다. 행 단위 조회는
+    비동기 ORM 으로, 집계와 바이너리 인코딩처럼 한 번에 끝나는 작업은 스레드에서 실행합니다.
+    """
     try:
-        start_date = request.GET.get('start_date')
-        end_date = request.GET.get('end_date')
+        fused = _parse_fused(request.GET)
+        # region 필터는 구역 코드를 id 로 바꾸는 조회가 있어 스레드에서 만듦
+        fires = await sync_to_async(filter_fires)(
+            request.GET, FusedDetection.objects.all() if fused else None
+        )
+        
+        # 아카이브를 함께 읽어야 하면 이후 단계는 쿼리셋 대신 합친 행 목록으로 처리
+        if await sync_to_async(archive.overlaps)(request.GET):
+            fires = await sync_to_async(_with_archive)(fires, request.GET, fused)
         
-        fires = FireDetection.objects.all()
+        zoom = request.GET.get('zoom')
+        if zoom:
+            if not zoom.isdigit():
+                raise ValueError('zoom은 0 이상의 정수여야 합니다.')
+            if int(zoom) < GRID_ZOOM_THRESHOLD:
+                if isinstance(fires, list):
+                    cells = grid_cells_from_rows(fires, int(zoom))
+                else:
+                    cells = await sync_to_async(grid_cells)(fires, int(zoom))
+                return JsonResponse(cells, safe=False)
         
-        if start_date:
-            fires = fires.filter(acq_date__gte=start_date)
-        if end_date:
-            fires = fires.filter(acq_date__lte=end_date)
+        if not isinstance(fires, list):
+            fires = fires.order_by(*FIRE_ORDERING)
         
-        fires = fires.values(
-            'id',
-            'latitude', 
-            'longitude', 
-            'frp', 
-            'bright_ti4',
-            'acq_date',
-            'acq_time',
-            'satellite',
-            'confidence'
-        ).order_by('-acq_date', '-acq_time')
+        output_format = request.GET.get('format', 'json')
+        if output_format not in BINARY_FORMATS and output_format not in ('json', 'ndjson'):
+            raise ValueError('format은 json, ndjson, columnar, arrow 중 하나여야 합니다.')
+        
+        if output_format in BINARY_FORMATS:
+            encode, content_type = BINARY_FORMATS[output_format]
+            body, encoding = await sync_to_async(_encode_binary)(
+                encode, fires, request.headers.get('Accept-Encoding', '')
+            )
+            response = HttpResponse(body, content_type=content_type)
+            if encoding:
+                response['Content-Encoding'] = encoding
+            response['Vary'] = 'Accept-Encoding'
+            return response
+        if output_format == 'ndjson' or request.GET.get('stream') == '1':
+            return _stream_response(request, fires, output_format)
+        
+        next_cursor = None
+        limit = request.GET.get('limit')
+        if isinstance(fires, list):
+            if limit:
+                fire_list, next_cursor = paginate_rows(fires, limit, request.GET.get('cursor'))
+            else:
+                fire_list = [dict(zip(FIRE_FIELDS, row)) for row in fires]
+        elif limit:
+            fire_list, next_cursor = await apaginate(
+                fires.values(*FIRE_FIELDS), limit, request.GET.get('cursor')
+            )
+        else:
+            fire_list = [fire async for fire in fires.values(*FIRE_FIELDS)]
         
-        fire_list = list(fires)
         for fire in fire_list:
             fire['acq_date'] = str(fire['acq_date'])
         
-        return JsonResponse(fire_list, safe=False)
+        response = JsonResponse(fire_list, safe=False)
+        if next_cursor:
+            response['X-Next-Cursor'] = next_cursor
+        return response
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        logger.exception("fire_data_api 오류")
+        return JsonResponse({'error': str(e)}, status=500)
+
+@cached_fire_response
+def fire_clusters_api(request):
+    """
+    화재 클러스터를 서버에서 계산해 JSON으로 반환
+
+    필터 파라미터와 fused 기본값은 fire_data_api 와 같으므로, 같은 파라미터로 받은
+    fire_data_api 결과의 id 로 클러스터 구성원(fire_ids)을 찾을 수 있습니다.
+    """
+    try:
+        radius = float(request.GET.get('radius', CLUSTER_RADIUS_KM))
+        if not 0 < radius <= 100:
+            return JsonResponse({'error': 'radius는 0 초과 100 이하(km)여야 합니다.'}, status=400)
+    except ValueError:
+        return JsonResponse({'error': 'radius는 숫자여야 합니다.'}, status=400)
+    
+    try:
+        fused = _parse_fused(request.GET)
+        fires = filter_fires(request.GET, FusedDetection.objects.all() if fused else None)
+        if archive.overlaps(request.GET):
+            fire_list = [dict(zip(FIRE_FIELDS, row)) for row in _with_archive(fires, request.GET, fused)]
+        else:
+            fire_list = list(fires.values(*FIRE_FIELDS).order_by(*FIRE_ORDERING))
+        clusters = cluster_fires(fire_list, radius_km=radius)
+        
+        return JsonResponse(clusters, safe=False)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        logger.exception("fire_clusters_api 오류")
+        return JsonResponse({'error': str(e)}, status=500)
+
+@cached_fire_response
+def fire_stats_api(request):
+    """
+    일별 집계 테이블로 화재 통계 반환
+
+    필터는 start_date, end_date, bbox, satellite, region 을 받고, group_by (date / satellite / cell / region)
+    기준으로 묶은 행과 전체 합계를 돌려줍니다. 원본 화재 행은 읽지 않습니다.
+    집계는 위성별 원본 관측 기준이라 개수가 fused=0 인 fire_data_api 결과와 같은 단위입니다.
+    """
+    try:
+        stats = filter_stats(request.GET)
+        return JsonResponse(summarize_stats(stats, request.GET.get('group_by', 'date')))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except Exception as e:
+        logger.exception("fire_stats_api 오류")
+        return JsonResponse({'error': str(e)}, status=500)
+
+@cached_fire_response
+def fire_events_api(request):
+    """
+    여러 통과에 걸쳐 추적한 화재 목록 (최근 관측순)
+
+    필터는 start_date, end_date, bbox, region, active=1, min_area, limit 을 받고,
+    화재마다 껍질 좌표, 면적, 확산 속도, FRP 추세를 돌려줍니다.
+    """
+    try:
+        events = filter_events(request.GET).select_related('region')
+        return JsonResponse([event_to_dict(event) for event in events], safe=False)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
     except Exception as e:
-        print(f"❌ API 오류: {e}")
-        traceback.print_exc()
+        logger.exception("fire_events_api 오류")
         return JsonResponse({'error': str(e)}, status=500)
 
+@cached_fire_response
+def fire_event_api(request, event_id):
+    """추적한 화재 하나와 통과 회차별 성장 기록 (합쳐진 화재는 합친 화재를 돌려줌)"""
+    try:
+        event = FireEvent.objects.select_related('region').get(id=event_id)
+    except FireEvent.DoesNotExist:
+        return JsonResponse({'error': '화재를 찾을 수 없습니다.'}, status=404)
+    if event.merged_into_id:
+        event = FireEvent.objects.select_related('region').get(id=event.merged_into_id)
+    return JsonResponse(event_to_dict(event, passes=event.passes.order_by('observed_at')))
+
+def heat_tile_view(request, z, x, y):
+    """
+    FRP 가중 화재 밀도 타일 (/tiles/{z}/{x}/{y}.png)
+
+    start_date, end_date 는 필수이고 satellite, min_confidence, region 필터를 받습니다.
+    """
+    try:
+        png = get_heat_tile(z, x, y, request.GET)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    response = HttpResponse(png, content_type='image/png')
+    # 같은 URL 이라도 새 수집 뒤에는 내용이 바뀌므로 브라우저에는 짧게만 캐시
+    response['Cache-Control'] = 'public, max-age=300'
+    return response
+
+def regions_api(request):
+    """행정구역 목록 (region= 필터에 쓰는 코드와 이름, 경계 제외)"""
+    regions = Region.objects.order_by('code').values('code', 'name', 'level', 'parent__code')
+    return JsonResponse([
+        {'code': r['code'], 'name': r['name'], 'level': r['level'], 'parent': r['parent__code']}
+        for r in regions
+    ], safe=False)
+
+def _stats_message(stats):
+    """수집 결과 개수를 사용자에게 보여줄 문장으로 변환"""
+    return (
+        f"신규 {stats['inserted']}개, 변경 {stats['updated']}개 저장 "
+        f"(변경 없음 {stats['unchanged']}개)"
+    )
+
+def _job_response(job, created):
+    """작업 등록 결과를 202 응답으로 변환 (진행 상황은 /api/jobs/<id>/ 로 확인)"""
+    return JsonResponse({
+        **job_to_dict(job),
+        'deduplicated': not created,
+        'message': (
+            '수집 작업이 등록되었습니다.' if created
+            else '같은 기간의 수집 작업이 이미 진행 중입니다.'
+        ),
+    }, status=202)
+
 @csrf_exempt
 @require_http_methods(["POST"])
-def fetch_and_save_fire_data(request):
-    """특정 날짜 범위의 FIRMS 데이터를 가져와서 DB에 저장"""
+async def fetch_and_save_fire_data(request):
+    """특정 날짜 범위의 FIRMS 데이터 수집 작업을 등록하고 바로 응답"""
     try:
-        print(f"\n{'='*60}")
-        print(f"📥 fetch_and_save_fire_data 호출됨")
-        print(f"   Method: {request.method}")
-        print(f"   Content-Type: {request.content_type}")
-        print(f"{'='*60}\n")
-        
-        body = request.body.decode('utf-8')
-        print(f"📄 요청 본문: {body}")
-        
-        data = json.loads(body)
+        data = json.loads(request.body.decode('utf-8'))
+        if not isinstance(data, dict):
+            return JsonResponse({
+                'status': 'error',
+                'message': '요청 데이터는 JSON 객체여야 합니다.'
+            }, status=400)
         start_date = data.get('start_date')
         end_date = data.get('end_date')
-        
-        print(f"📅 날짜: {start_date} ~ {end_date}")
+        satellite = data.get('satellite', 'VIIRS_NOAA20_NRT')
         
         if not start_date or not end_date:
             return JsonResponse({
@@ -108,52 +329,67 @@ def fetch_and_save_fire_data(request):
                 'message': f'날짜 형식이 올바르지 않습니다: {str(e)}'
             }, status=400)
         
-        print(f"🚀 save_fire_data_by_date_range 호출 시작...")
-        count = save_fire_data_by_date_range(start_date, end_date)
-        print(f"✅ save_fire_data_by_date_range 완료: {count}개")
+        satellites = [satellite] if isinstance(satellite, str) else satellite
+        if not satellites or any(s not in FIRMS_SOURCES for s in satellites):
+            return JsonResponse({
+                'status': 'error',
+                'message': f'지원하지 않는 위성입니다: {satellite}'
+            }, status=400)
         
-        return JsonResponse({
-            'status': 'success',
-            'message': f'{count}개 데이터 저장 완료',
-            'count': count,
-            'start_date': start_date,
-            'end_date': end_date
-        })
+        job, created = await sync_to_async(enqueue_ingest)(start, end, satellites)
+        logger.info("수집 작업 %s %s", '등록' if created else '재사용', job)
+        
+        return _job_response(job, created)
         
     except json.JSONDecodeError as e:
-        print(f"❌ JSON 파싱 오류: {e}")
-        traceback.print_exc()
+        logger.warning("fetch_and_save_fire_data 요청 JSON 오류: %s", e)
         return JsonResponse({
             'status': 'error',
             'message': f'요청 데이터 형식 오류: {str(e)}'
         }, status=400)
     except Exception as e:
-        print(f"❌ 서버 오류: {e}")
-        traceback.print_exc()
+        logger.exception("fetch_and_save_fire_data 오류")
         return JsonResponse({
             'status': 'error',
             'message': f'서버 오류: {str(e)}'
         }, status=500)
 
-def load_and_save_fire_data(request):
-    """수동으로 최근 데이터 새로고침"""
+async def load_and_save_fire_data(request):
+    """수동으로 최근 데이터 새로고침 (수집 작업 등록)"""
     try:
         today = datetime.now().date()
-        week_ago = today - timedelta(days=7)
-        
-        count = save_fire_data_by_date_range(
-            start_date=week_ago.strftime('%Y-%m-%d'),
-            end_date=today.strftime('%Y-%m-%d')
-        )
-        
-        return JsonResponse({
-            'status': 'success',
-            'message': f'{count}개 데이터 저장 완료'
-        })
+        job, created = await sync_to_async(enqueue_ingest)(today - timedelta(days=7), today, ['VIIRS_NOAA20_NRT'])
+        return _job_response(job, created)
     except Exception as e:
-        print(f"❌ 새로고침 오류: {e}")
-        traceback.print_exc()
+        logger.exception("새로고침 작업 등록 오류")
         return JsonResponse({
             'status': 'error',
             'message': str(e)
-        })
\ No newline at end of file
+        })
+
+async def job_status_api(request, job_id):
+    """수집 작업 진행 상황 조회"""
+    # 재시작으로 남은 작업을 정리해야 화면이 멈춘 작업을 계속 기다리지 않음
+    await sync_to_async(recover_jobs)()
+    try:
+        job = await IngestJob.objects.aget(id=job_id)
+    except IngestJob.DoesNotExist:
+        return JsonResponse({
+            'status': 'error',
+            'message': f'작업을 찾을 수 없습니다: {job_id}'
+        }, status=404)
+
+    data = job_to_dict(job)
+    if job.status == IngestJob.SUCCEEDED and job.result:
+        data['message'] = _stats_message(job.result)
+    return JsonResponse(data)
+
+def metrics_view(request):
+    """
+    수집/요청 지표 (Prometheus 텍스트 형식)
+
+    값은 이 요청을 받은 프로세스 하나의 것입니다. gunicorn 워커가 여럿이면 긁을 때마다
+    다른 워커의 값이 보일 수 있으므로, 전체 합계가 필요하면 워커를 하나로 두거나
+    워커마다 따로 긁어야 합니다.
+    """
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')